@@ -35,12 +35,18 @@ celery_app.conf.update(
     task_reject_on_worker_lost=True,  # Requeue if worker crashes
     
     # Performance
-    worker_prefetch_multiplier=4,  # How many tasks to prefetch
+    # How many tasks to prefetch; document workers run with 1 so a cold
+    # worker doesn't reserve several heavy uploads before it's warm
+    worker_prefetch_multiplier=int(os.getenv('CELERY_PREFETCH_MULTIPLIER', '4')),
     worker_max_tasks_per_child=1000,  # Restart worker after N tasks (prevents memory leaks)
+    # Children build their services and load local embedding models in
+    # worker_process_init; the 4s default would kill them mid warm-up
+    worker_proc_alive_timeout=float(os.getenv('CELERY_PROC_ALIVE_TIMEOUT', '60')),
     
     # Task routing (priority queues)
     task_routes={
         'academe.update_memory': {'queue': 'memory'},
+        'academe.flush_user_memory_batch': {'queue': 'memory'},
         'academe.process_document': {'queue': 'documents'},
         'academe.update_progress': {'queue': 'memory'},
         'academe.index_document': {'queue': 'documents'},
@@ -8,15 +8,77 @@ LLM Routing Strategy:
 """
 
 import logging
-from typing import TYPE_CHECKING
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
+    import httpx
+    import openai
     from langchain_core.language_models import BaseChatModel
 
 from .settings import get_settings
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive connection pool for OpenAI traffic (chat + embeddings)
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+HTTP_TIMEOUT_SECONDS = 30.0
+
+_http_lock = threading.Lock()
+_http_client: Optional["httpx.Client"] = None
+_openai_client: Optional["openai.OpenAI"] = None
+_client_pid: Optional[int] = None
+
+
+def get_http_client() -> "httpx.Client":
+    """
+    Process-wide pooled HTTP client (HTTP/2 when ``h2`` is installed).
+
+    Reusing one client keeps TLS connections alive across calls instead
+    of handshaking per request.  Rebuilt after a fork so prefork workers
+    never share sockets with the parent.
+    """
+    global _http_client, _openai_client, _client_pid
+    pid = os.getpid()
+    if _http_client is None or _client_pid != pid:
+        with _http_lock:
+            if _http_client is None or _client_pid != pid:
+                import httpx
+                _http_client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    ),
+                    timeout=HTTP_TIMEOUT_SECONDS,
+                )
+                _openai_client = None
+                _client_pid = pid
+    return _http_client
+
+
+def get_openai_client() -> "openai.OpenAI":
+    """Process-wide OpenAI SDK client on the shared connection pool."""
+    global _openai_client
+    http_client = get_http_client()
+    if _openai_client is None:
+        with _http_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(
+                    api_key=get_settings().openai_api_key,
+                    http_client=http_client,
+                )
+    return _openai_client
+
 
 def get_llm(temperature: float = 0.7) -> "BaseChatModel":
     """
@@ -57,6 +119,7 @@ def get_llm(temperature: float = 0.7) -> "BaseChatModel":
             model="gpt-4o",
             temperature=temperature,
             api_key=settings.openai_api_key,
+            http_client=get_http_client(),
         )
 
     else:
@@ -69,6 +132,9 @@ def get_llm(temperature: float = 0.7) -> "BaseChatModel":
 def get_openai_llm(
     model: str = "gpt-4o-mini",
     temperature: float = 0.0,
+    prompt_cache_key: Optional[str] = None,
+    include_response_headers: bool = False,
+    max_retries: Optional[int] = None,
 ) -> "BaseChatModel":
     """
     Get OpenAI LLM for infrastructure/evaluation tasks.
@@ -81,6 +147,12 @@ def get_openai_llm(
     Args:
         model: OpenAI model name (default: gpt-4o-mini for speed/cost)
         temperature: Sampling temperature (default: 0.0 for determinism)
+        prompt_cache_key: Routes requests sharing a static prompt prefix to
+            the same OpenAI prompt cache (ignored by the fallback LLM)
+        include_response_headers: Expose HTTP headers (rate limits) in
+            ``response_metadata["headers"]``
+        max_retries: Client-side retries (default: the SDK's); pass 0 when
+            the caller retries itself
 
     Returns:
         Configured LLM instance
@@ -89,10 +161,16 @@ def get_openai_llm(
 
     if settings.openai_api_key:
         from langchain_openai import ChatOpenAI
+        model_kwargs = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
+        client_kwargs = {"max_retries": max_retries} if max_retries is not None else {}
         return ChatOpenAI(
             model=model,
             temperature=temperature,
             api_key=settings.openai_api_key,
+            model_kwargs=model_kwargs,
+            http_client=get_http_client(),
+            include_response_headers=include_response_headers,
+            **client_kwargs,
         )
 
     logger.warning("OpenAI API key not set, falling back to primary LLM")
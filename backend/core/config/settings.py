@@ -39,6 +39,10 @@ class Settings(BaseSettings):
     embedding_provider: str | None = None  # gemini, sentence-transformers, openai (auto-detect if None)
     embedding_model: str | None = None  # Auto-detected from provider if None
     embedding_dim: int = 768  # Gemini supports Matryoshka: 256, 768, 1536, 3072
+    embedding_backend: str = "torch"  # sentence-transformers runtime: torch, onnx, openvino
+    embedding_quantize: bool = False  # int8 dynamic quantization of the torch model
+    embedding_torch_threads: int | None = None  # torch intra-op threads (None = cores / WEB_CONCURRENCY)
+    embedding_cache_path: str | None = None  # SQLite file persisting embeddings (disabled if None)
 
     # Pinecone Configuration (Optional - uses mock if not provided)
     pinecone_api_key: str | None = None
@@ -73,6 +77,12 @@ class Settings(BaseSettings):
 
     # Reranker: min score to keep chunks (BGE scores ~-10 to 10; try 0.0 or 0.3 to filter noise)
     reranker_min_score: float | None = None  # None = no filter
+    reranker_backend: str = "torch"  # Cross-encoder runtime: torch, onnx, openvino
+    reranker_onnx_file: str | None = None  # e.g. onnx/model_qint8_avx512_vnni.onnx
+    reranker_amp: bool = True  # bf16/fp16 autocast for the torch reranker where supported
+
+    # Hybrid search: directory for per-user BM25 indexes shared across workers (None = memory only)
+    bm25_cache_dir: str | None = None
 
     model_config = ConfigDict(
         env_file=str(ENV_FILE),
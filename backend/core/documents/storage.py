@@ -5,7 +5,7 @@ import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from bson import ObjectId
 
@@ -177,6 +177,29 @@ class DocumentRepository:
             logger.error(f"Failed to get document: {e}")
             return None
 
+    def get_documents(self, document_ids: Iterable[str]) -> Dict[str, Document]:
+        """
+        Get several documents in one query.
+
+        Args:
+            document_ids: Document IDs (invalid IDs are skipped)
+
+        Returns:
+            Mapping of document ID to Document for the IDs that exist
+        """
+        object_ids = [ObjectId(d) for d in set(document_ids) if ObjectId.is_valid(d)]
+        if not object_ids:
+            return {}
+
+        try:
+            collection = self.db.get_database()["documents"]
+            cursor = collection.find({"_id": {"$in": object_ids}})
+            return {str(d["_id"]): Document.from_mongo_dict(d) for d in cursor}
+
+        except Exception as e:
+            logger.error(f"Failed to get documents: {e}")
+            return {}
+
     def get_user_documents(
         self,
         user_id: str,
@@ -366,6 +389,55 @@ class ChunkRepository:
             logger.error(f"Failed to get document chunks: {e}")
             return []
 
+    def iter_document_chunks(
+        self,
+        document_id: str,
+        page_size: int = 500
+    ) -> Iterator[List[DocumentChunk]]:
+        """
+        Stream a document's chunks in pages, ordered by index.
+
+        Uses keyset pagination on ``chunk_index`` so each page is a fresh
+        indexed range query and only one page is held in memory.
+
+        Args:
+            document_id: Document ID
+            page_size: Chunks per page
+
+        Yields:
+            Lists of up to ``page_size`` chunks
+        """
+        collection = self.db.get_database()["chunks"]
+        last_index = -1
+        while True:
+            cursor = collection.find(
+                {"document_id": document_id, "chunk_index": {"$gt": last_index}}
+            ).sort("chunk_index", 1).limit(page_size)
+            page = [DocumentChunk.from_mongo_dict(d) for d in cursor]
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            last_index = page[-1].chunk_index
+
+    def _user_chunks_query(self, user_id: str, include_deleted_docs: bool) -> Dict[str, Any]:
+        """Mongo filter for a user's chunks, optionally excluding deleted documents."""
+        query: Dict[str, Any] = {"user_id": user_id}
+        if not include_deleted_docs:
+            # Exclude chunks from deleted documents
+            docs_collection = self.db.get_database()["documents"]
+            deleted_doc_ids = [
+                str(doc["_id"])
+                for doc in docs_collection.find(
+                    {"user_id": user_id, "processing_status": "deleted"},
+                    {"_id": 1}
+                )
+            ]
+            if deleted_doc_ids:
+                query["document_id"] = {"$nin": deleted_doc_ids}
+        return query
+
     def get_user_chunks(
         self,
         user_id: str,
@@ -383,24 +455,9 @@ class ChunkRepository:
         """
         try:
             collection = self.db.get_database()["chunks"]
-            query = {"user_id": user_id}
-
-            if not include_deleted_docs:
-                # Exclude chunks from deleted documents
-                docs_collection = self.db.get_database()["documents"]
-                deleted_doc_ids = [
-                    str(doc["_id"])
-                    for doc in docs_collection.find(
-                        {"user_id": user_id, "processing_status": "deleted"},
-                        {"_id": 1}
-                    )
-                ]
-                if deleted_doc_ids:
-                    query["document_id"] = {"$nin": deleted_doc_ids}
-
-            cursor = collection.find(query).sort(
-                [("document_id", 1), ("chunk_index", 1)]
-            )
+            cursor = collection.find(
+                self._user_chunks_query(user_id, include_deleted_docs)
+            ).sort([("document_id", 1), ("chunk_index", 1)])
 
             return [DocumentChunk.from_mongo_dict(c) for c in cursor]
 
@@ -408,6 +465,37 @@ class ChunkRepository:
             logger.error(f"Failed to get user chunks: {e}")
             return []
 
+    def get_user_chunk_keys(
+        self,
+        user_id: str,
+        include_deleted_docs: bool = False
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Get ``(chunk_id, document_id, chunk_index)`` for all of a user's chunks.
+
+        Same selection and order as ``get_user_chunks``, but without chunk
+        content, for cheaply checking whether a cached index is current.
+
+        Args:
+            user_id: User ID
+            include_deleted_docs: If False, exclude chunks from deleted documents
+
+        Returns:
+            Key tuples ordered by document then index
+        """
+        try:
+            collection = self.db.get_database()["chunks"]
+            cursor = collection.find(
+                self._user_chunks_query(user_id, include_deleted_docs),
+                {"_id": 1, "document_id": 1, "chunk_index": 1},
+            ).sort([("document_id", 1), ("chunk_index", 1)])
+
+            return [(str(c["_id"]), c["document_id"], c["chunk_index"]) for c in cursor]
+
+        except Exception as e:
+            logger.error(f"Failed to get user chunk keys: {e}")
+            return []
+
     def get_adjacent_chunks(
         self,
         document_id: str,
@@ -5,8 +5,10 @@ Measures retrieval quality without LLM: P@k, R@k, MRR.
 Fast feedback loop for testing hybrid search, reranking, chunking improvements.
 """
 
+import functools
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Set, Tuple
 
 from core.vectors import SemanticSearchService, HybridSearchService
@@ -20,12 +22,18 @@ def _chunk_id(doc_id: str, chunk_index: int) -> str:
     return f"{doc_id}_{chunk_index}"
 
 
+@functools.lru_cache(maxsize=4096)
+def _word_set(text: str) -> frozenset:
+    """Lowercased words, memoized: each ground truth is scored against every result."""
+    return frozenset(text.lower().split())
+
+
 def _content_overlap_score(chunk_content: str, ground_truth: str) -> float:
     """Jaccard-like overlap: |intersection| / |ground_truth|."""
     if not ground_truth or not chunk_content:
         return 0.0
-    gt_words = set(ground_truth.lower().split())
-    chunk_words = set(chunk_content.lower().split())
+    gt_words = _word_set(ground_truth)
+    chunk_words = _word_set(chunk_content)
     if not gt_words:
         return 0.0
     overlap = len(gt_words & chunk_words) / len(gt_words)
@@ -134,6 +142,53 @@ class RetrievalEvaluator:
 
         return metrics
 
+    def _run_query(
+        self,
+        q: Dict[str, Any],
+        user_id: str,
+        k_values: List[int],
+        use_reranking: bool,
+    ) -> Tuple[Dict[str, Any], float]:
+        """Search one test query and score it; returns (metrics, latency in seconds)."""
+        question = q.get("question", "")
+        ground_truth = q.get("ground_truth", "")
+        relevant_ids = self._get_relevant_ids(q)
+
+        start = time.perf_counter()
+        if isinstance(self.search_service, HybridSearchService):
+            if use_reranking:
+                results = self.search_service.hybrid_search_with_reranking(
+                    query=question,
+                    user_id=user_id,
+                    top_k=max(k_values),
+                )
+            else:
+                results = self.search_service.hybrid_search(
+                    query=question,
+                    user_id=user_id,
+                    top_k=max(k_values),
+                )
+        elif use_reranking:
+            results = self.search_service.search_with_reranking(
+                query=question,
+                user_id=user_id,
+                top_k=max(k_values) * 2,
+                rerank_top_k=max(k_values),
+            )
+        else:
+            results = self.search_service.search(
+                query=question,
+                user_id=user_id,
+                top_k=max(k_values),
+            )
+        latency = time.perf_counter() - start
+
+        m = self._evaluate_query(
+            question, user_id, results, ground_truth, relevant_ids, k_values
+        )
+        m["query"] = question[:50]
+        return m, latency
+
     def evaluate(
         self,
         user_id: str,
@@ -141,6 +196,7 @@ class RetrievalEvaluator:
         limit: Optional[int] = None,
         k_values: List[int] = [5, 10],
         use_reranking: bool = True,
+        max_workers: int = 1,
     ) -> Dict[str, Any]:
         """
         Run retrieval evaluation.
@@ -151,6 +207,8 @@ class RetrievalEvaluator:
             limit: Max queries to evaluate
             k_values: K for P@k and R@k
             use_reranking: Use reranking when available
+            max_workers: Queries searched concurrently (searches are I/O-bound);
+                         per-query latencies then include contention
 
         Returns:
             Aggregated metrics and per-query details
@@ -159,48 +217,17 @@ class RetrievalEvaluator:
         if limit:
             queries = queries[:limit]
 
-        all_metrics = []
-        latencies = []
-
-        for i, q in enumerate(queries):
-            question = q.get("question", "")
-            ground_truth = q.get("ground_truth", "")
-            relevant_ids = self._get_relevant_ids(q)
-
-            start = time.perf_counter()
-            if isinstance(self.search_service, HybridSearchService):
-                if use_reranking:
-                    results = self.search_service.hybrid_search_with_reranking(
-                        query=question,
-                        user_id=user_id,
-                        top_k=max(k_values),
-                    )
-                else:
-                    results = self.search_service.hybrid_search(
-                        query=question,
-                        user_id=user_id,
-                        top_k=max(k_values),
-                    )
-            elif use_reranking:
-                results = self.search_service.search_with_reranking(
-                    query=question,
-                    user_id=user_id,
-                    top_k=max(k_values) * 2,
-                    rerank_top_k=max(k_values),
-                )
-            else:
-                results = self.search_service.search(
-                    query=question,
-                    user_id=user_id,
-                    top_k=max(k_values),
-                )
-            latencies.append(time.perf_counter() - start)
+        def run(q: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+            return self._run_query(q, user_id, k_values, use_reranking)
 
-            m = self._evaluate_query(
-                question, user_id, results, ground_truth, relevant_ids, k_values
-            )
-            m["query"] = question[:50]
-            all_metrics.append(m)
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                runs = list(executor.map(run, queries))
+        else:
+            runs = [run(q) for q in queries]
+
+        all_metrics = [m for m, _ in runs]
+        latencies = [latency for _, latency in runs]
 
         # Aggregate
         n = len(all_metrics)
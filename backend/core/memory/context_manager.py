@@ -145,6 +145,30 @@ class ContextManager:
             conversation_id: Conversation ID
             interaction: Interaction details (query, response, agent_used, etc.)
 
+        Returns:
+            Success status
+        """
+        return self.update_context_batch(user_id, conversation_id, [interaction])
+
+    def update_context_batch(
+        self,
+        user_id: str,
+        conversation_id: str,
+        interactions: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Apply several interactions to one conversation's context.
+
+        The memory context is loaded once, every interaction is applied
+        in order, and the result is saved with a single write.  Concept
+        progress is tracked only after the save succeeds, so a False
+        return means nothing was written and the batch can be retried.
+
+        Args:
+            user_id: User ID
+            conversation_id: Conversation ID
+            interactions: Interaction details, oldest first
+
         Returns:
             Success status
         """
@@ -157,48 +181,68 @@ class ContextManager:
                     conversation_id=conversation_id
                 )
 
-            # Update based on interaction type
-            if "query" in interaction:
-                # Add to question sequence
-                memory_ctx.question_sequence.append(interaction["query"])
-                # Keep only last 20 questions
-                memory_ctx.question_sequence = memory_ctx.question_sequence[-20:]
-
-            if "concepts" in interaction:
-                # Add new concepts
-                for concept in interaction["concepts"]:
-                    memory_ctx.add_concept(concept)
-
-                    # Track in learning progress
-                    self.progress_repo.track_concept_interaction(
-                        user_id=user_id,
-                        concept=concept,
-                        interaction_type=interaction.get("type", "view"),
-                        details=interaction.get("details")
-                    )
-
-            if "documents" in interaction:
-                # Add accessed documents
-                for doc_id in interaction["documents"]:
-                    memory_ctx.add_document(doc_id)
-
-            if "current_topic" in interaction:
-                memory_ctx.current_topic = interaction["current_topic"]
-
-            if "requires_followup" in interaction:
-                memory_ctx.requires_followup = interaction["requires_followup"]
+            for interaction in interactions:
+                self._apply_interaction(memory_ctx, interaction)
 
             # Save updated context
-            return self.progress_repo.update_memory_context(
+            if not self.progress_repo.update_memory_context(
                 user_id=user_id,
                 conversation_id=conversation_id,
                 updates=memory_ctx.dict()
-            )
+            ):
+                return False
 
         except Exception as e:
             logger.error(f"Error updating context: {e}")
             return False
 
+        for interaction in interactions:
+            self._track_concepts(user_id, interaction)
+        return True
+
+    def _apply_interaction(
+        self,
+        memory_ctx: MemoryContext,
+        interaction: Dict[str, Any]
+    ) -> None:
+        """Fold a single interaction into an in-memory context."""
+        # Update based on interaction type
+        if "query" in interaction:
+            # Add to question sequence
+            memory_ctx.question_sequence.append(interaction["query"])
+            # Keep only last 20 questions
+            memory_ctx.question_sequence = memory_ctx.question_sequence[-20:]
+
+        if "concepts" in interaction:
+            # Add new concepts
+            for concept in interaction["concepts"]:
+                memory_ctx.add_concept(concept)
+
+        if "documents" in interaction:
+            # Add accessed documents
+            for doc_id in interaction["documents"]:
+                memory_ctx.add_document(doc_id)
+
+        if "current_topic" in interaction:
+            memory_ctx.current_topic = interaction["current_topic"]
+
+        if "requires_followup" in interaction:
+            memory_ctx.requires_followup = interaction["requires_followup"]
+
+    def _track_concepts(self, user_id: str, interaction: Dict[str, Any]) -> None:
+        """Record an interaction's concepts in learning progress."""
+        for concept in interaction.get("concepts", ()):
+            try:
+                self.progress_repo.track_concept_interaction(
+                    user_id=user_id,
+                    concept=concept,
+                    interaction_type=interaction.get("type", "view"),
+                    details=interaction.get("details")
+                )
+            except Exception as e:
+                # The context is already saved; retrying would apply it twice
+                logger.error(f"Error tracking concept {concept} for user {user_id}: {e}")
+
     def get_relevant_history(
         self,
         user_id: str,
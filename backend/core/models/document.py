@@ -64,6 +64,7 @@ class Document(BaseModel):
     vector_namespace: Optional[str] = None  # Pinecone namespace
     vector_ids: List[str] = Field(default_factory=list)
     embedding_model: Optional[str] = None
+    chunks_indexed: int = 0  # Advanced per upserted batch during indexing
 
     # Organization
     tags: List[str] = Field(default_factory=list)
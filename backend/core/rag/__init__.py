@@ -4,7 +4,7 @@ from .pipeline import RAGPipeline
 from .adaptive_retrieval import AdaptiveRetriever, classify_query, QueryType
 from .query_rewriter import QueryRewriter, HyDE
 from .response_cache import SemanticResponseCache, RedisResponseCache, get_cache_metrics
-from .self_rag import SelfRAGController, RetrievalVerifier
+from .self_rag import SelfRAGController, RetrievalVerifier, VerifierCache
 from .query_decomposer import QueryDecomposer
 from .feedback import RetrievalFeedback
 from .analytics import RAGAnalytics
@@ -37,6 +37,7 @@ __all__ = [
     "get_cache_metrics",
     "SelfRAGController",
     "RetrievalVerifier",
+    "VerifierCache",
     "QueryDecomposer",
     "RetrievalFeedback",
     "RAGAnalytics",
@@ -13,7 +13,7 @@ from core.config import get_llm
 from core.rag.query_rewriter import QueryRewriter, HyDE
 from core.rag.adaptive_retrieval import AdaptiveRetriever, classify_query, QueryType
 from core.rag.response_cache import SemanticResponseCache
-from core.rag.self_rag import SelfRAGController
+from core.rag.self_rag import SelfRAGController, RetrievalVerifier, VerifierCache
 from core.rag.query_decomposer import QueryDecomposer, retrieve_with_decomposition
 from core.rag.feedback import RetrievalFeedback
 from core.rag.proposition_indexer import (
@@ -44,6 +44,7 @@ class RAGPipeline:
         use_response_cache: bool = True,
         use_propositions: bool = True,
         use_knowledge_graph: bool = True,
+        self_rag_fan_out: int = 0,
     ):
         """
         Initialize RAG pipeline.
@@ -61,6 +62,8 @@ class RAGPipeline:
             use_response_cache: Cache answers by semantic similarity
             use_propositions: Extract and index atomic propositions from chunks
             use_knowledge_graph: Extract entity-relationship triples for multi-hop
+            self_rag_fan_out: Opt-in; search this many judge-proposed
+                reformulations concurrently instead of retrying serially
         """
         base_search = search_service or SemanticSearchService()
         if use_hybrid_search and not isinstance(base_search, HybridSearchService):
@@ -80,7 +83,23 @@ class RAGPipeline:
         self.query_rewriter = QueryRewriter() if use_query_rewriting else None
         self.use_multi_query = use_multi_query
         self.hyde = HyDE() if use_hyde else None
-        self.self_rag = SelfRAGController() if use_self_rag else None
+        if use_self_rag:
+            # Near-duplicate questions over the same chunks reuse a verdict.
+            # Hybrid and HyDE fusion normalize scores per query, so the
+            # score pre-filter only runs on plain vector search.
+            absolute_scores = (
+                not isinstance(self.search_service, HybridSearchService)
+                and self.hyde is None
+            )
+            self.self_rag = SelfRAGController(
+                verifier=RetrievalVerifier(
+                    cache=VerifierCache(embed_fn=self._embed_query),
+                    absolute_scores=absolute_scores,
+                ),
+                fan_out=self_rag_fan_out,
+            )
+        else:
+            self.self_rag = None
         self.decomposer = QueryDecomposer() if use_query_decomposition else None
         self.response_cache = SemanticResponseCache() if use_response_cache else None
         self.feedback = RetrievalFeedback()
@@ -252,7 +271,10 @@ class RAGPipeline:
                 embedding_service = self._get_embedding_service()
                 if embedding_service:
                     q_embedding = embedding_service.generate_embedding(query)
-                    cached = self.response_cache.get(user.id, query, q_embedding)
+                    cached = self.response_cache.get(
+                        user.id, query, q_embedding,
+                        model_id=getattr(embedding_service, "model_name", None),
+                    )
                     if cached:
                         metrics.record_cache(hit=True, elapsed_ms=(time.time() - cache_start) * 1000)
                         metrics.log_summary()
@@ -307,12 +329,14 @@ class RAGPipeline:
         # Cache the result (reuse q_embedding from cache lookup to avoid double embedding)
         if self.response_cache:
             try:
-                if q_embedding is None:
-                    embedding_service = self._get_embedding_service()
-                    if embedding_service:
-                        q_embedding = embedding_service.generate_embedding(query)
+                embedding_service = self._get_embedding_service()
+                if q_embedding is None and embedding_service:
+                    q_embedding = embedding_service.generate_embedding(query)
                 if q_embedding is not None:
-                    self.response_cache.put(user.id, query, q_embedding, answer, search_results)
+                    self.response_cache.put(
+                        user.id, query, q_embedding, answer, search_results,
+                        model_id=getattr(embedding_service, "model_name", None),
+                    )
             except Exception as e:
                 logger.debug(f"Cache put failed: {e}")
 
@@ -328,6 +352,13 @@ class RAGPipeline:
             return self.search_service.vector_search.embedding_service
         return getattr(self.search_service, "embedding_service", None)
 
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query with the search stack's embedding service."""
+        embedding_service = self._get_embedding_service()
+        if embedding_service is None:
+            raise RuntimeError("No embedding service available")
+        return embedding_service.generate_embedding(query)
+
     def _get_kg_context(
         self, query: str, search_results: List[DocumentSearchResult]
     ) -> str:
@@ -658,8 +689,6 @@ class RAGPipeline:
         from both embeddings. Composes with adaptive behaviors: CODE filter,
         COMPARISON diversification.
         """
-        from core.models.document import DocumentChunk
-
         # Get both embeddings (query + hypothesis)
         embedding_service = self._get_embedding_service()
         if not embedding_service:
@@ -761,26 +790,14 @@ class RAGPipeline:
             result = all_results.get(vec_id)
             if not result or result.get("score", 0) < 0.2:
                 continue
-            parts = vec_id.split("_")
-            if len(parts) < 2:
+            document_id, sep, index = vec_id.rpartition("_")
+            if not sep:
                 continue
-            document_id = "_".join(parts[:-1])
-            chunk_index = int(parts[-1])
+            chunk_index = int(index)
             document = vs.doc_repo.get_document(document_id)
             if not document:
                 continue
-            chunk = DocumentChunk(
-                document_id=document_id,
-                user_id=user_id,
-                chunk_index=chunk_index,
-                content=result["metadata"].get("content", ""),
-                page_number=result["metadata"].get("page_number"),
-                section_title=result["metadata"].get("section_title"),
-                char_count=len(result["metadata"].get("content", "")),
-                word_count=len(result["metadata"].get("content", "").split()),
-                has_code=result["metadata"].get("has_code", False),
-                has_equations=result["metadata"].get("has_equations", False),
-            )
+            chunk = vs.chunk_from_match(result, document_id, chunk_index, user_id)
             search_results.append(
                 DocumentSearchResult(
                     chunk=chunk,
@@ -819,8 +836,6 @@ class RAGPipeline:
         **search_kwargs,
     ) -> List[DocumentSearchResult]:
         """Fallback: use only hypothesis embedding (Option A from paper)."""
-        from core.models.document import DocumentChunk
-
         hyde_embedding = self.hyde.get_hypothesis_embedding(query)
 
         if isinstance(self.search_service, HybridSearchService):
@@ -839,26 +854,14 @@ class RAGPipeline:
             if result.get("score", 0) < 0.2:
                 continue
             vec_id = result["id"]
-            parts = vec_id.split("_")
-            if len(parts) < 2:
+            document_id, sep, index = vec_id.rpartition("_")
+            if not sep:
                 continue
-            document_id = "_".join(parts[:-1])
-            chunk_index = int(parts[-1])
+            chunk_index = int(index)
             document = vs.doc_repo.get_document(document_id)
             if not document:
                 continue
-            chunk = DocumentChunk(
-                document_id=document_id,
-                user_id=user_id,
-                chunk_index=chunk_index,
-                content=result["metadata"].get("content", ""),
-                page_number=result["metadata"].get("page_number"),
-                section_title=result["metadata"].get("section_title"),
-                char_count=len(result["metadata"].get("content", "")),
-                word_count=len(result["metadata"].get("content", "").split()),
-                has_code=result["metadata"].get("has_code", False),
-                has_equations=result["metadata"].get("has_equations", False),
-            )
+            chunk = vs.chunk_from_match(result, document_id, chunk_index, user_id)
             search_results.append(
                 DocumentSearchResult(chunk=chunk, document=document, score=result["score"], rank=i + 1)
             )
@@ -16,12 +16,17 @@ Based on: "Dense X Retrieval: What Retrieval Granularity Should We Use?"
 
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 
 from core.config.llm_config import get_openai_llm
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; both run per output line / per chunk on ingestion.
+_NUM_PREFIX_RE = re.compile(r"^\d+[\.\)\-]\s*")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 class Proposition:
     """An atomic factual statement extracted from a chunk."""
@@ -138,7 +143,7 @@ class PropositionExtractor:
             line = line.strip()
             if not line:
                 continue
-            cleaned = re.sub(r"^\d+[\.\)\-]\s*", "", line).strip()
+            cleaned = _NUM_PREFIX_RE.sub("", line).strip()
             if len(cleaned) > 10:
                 propositions.append(cleaned)
             if len(propositions) >= self.max_propositions:
@@ -151,7 +156,7 @@ class PropositionExtractor:
 
         Splits on sentence boundaries and filters out trivial sentences.
         """
-        sentences = re.split(r"(?<=[.!?])\s+", chunk_text.strip())
+        sentences = _SENT_SPLIT_RE.split(chunk_text.strip())
         propositions = []
         for sent in sentences:
             sent = sent.strip()
@@ -207,53 +212,124 @@ class PropositionExtractor:
 
 
 class PropositionRepository:
-    """MongoDB storage for propositions."""
+    """
+    MongoDB storage for propositions.
 
-    COLLECTION_NAME = "propositions"
+    Propositions are derived data (they can be regenerated from chunks),
+    so ingestion favours throughput: unordered inserts, sub-batches written
+    in parallel, and optionally unacknowledged (w=0) writes.
+
+    The source chunk text is not stored per proposition; rows reference
+    their chunk by ``(document_id, source_chunk_index)`` and the text is
+    joined back from the chunks collection in one query when ``Proposition``
+    objects are loaded.
+
+    Parameters:
+        db: Database wrapper (defaults to the shared connection).
+        unacknowledged_writes: Use w=0 for inserts (fire-and-forget).
+    """
 
-    def __init__(self, db=None):
+    COLLECTION_NAME = "propositions"
+    CHUNKS_COLLECTION_NAME = "chunks"
+    INSERT_BATCH_SIZE = 1000
+    INSERT_WORKERS = 4
+    # Exclude Mongo's _id so documents map straight onto Proposition fields
+    _PROJECTION = {"_id": 0}
+    _BATCH_SIZE = 500
+
+    def __init__(self, db=None, unacknowledged_writes: bool = False):
         if db is None:
             from core.database import get_database
             db = get_database()
         self.db = db
+        self.unacknowledged_writes = unacknowledged_writes
 
     def _collection(self):
         return self.db.get_database()[self.COLLECTION_NAME]
 
+    def _chunks_collection(self):
+        return self.db.get_database()[self.CHUNKS_COLLECTION_NAME]
+
+    def _write_collection(self):
+        collection = self._collection()
+        if self.unacknowledged_writes:
+            from pymongo import WriteConcern
+            collection = collection.with_options(write_concern=WriteConcern(w=0))
+        return collection
+
     def store_propositions(self, propositions: List[Proposition]) -> int:
         """Batch-insert propositions. Returns count inserted."""
         if not propositions:
             return 0
-        docs = [p.to_dict() for p in propositions]
-        result = self._collection().insert_many(docs)
-        return len(result.inserted_ids)
+        docs = [self._to_storage_dict(p) for p in propositions]
+        collection = self._write_collection()
+        # pymongo rejects bypass_document_validation on unacknowledged writes
+        options = {"ordered": False}
+        if not self.unacknowledged_writes:
+            options["bypass_document_validation"] = True
+
+        def insert(batch: List[Dict[str, Any]]) -> int:
+            result = collection.insert_many(batch, **options)
+            return len(result.inserted_ids)
+
+        size = self.INSERT_BATCH_SIZE
+        if len(docs) <= size:
+            return insert(docs)
+
+        batches = [docs[i:i + size] for i in range(0, len(docs), size)]
+        with ThreadPoolExecutor(max_workers=self.INSERT_WORKERS) as executor:
+            return sum(executor.map(insert, batches))
+
+    def get_document_proposition_dicts(
+        self, document_id: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream raw proposition documents for a document, ordered by index.
+
+        Use this instead of ``get_document_propositions`` when only the
+        fields are needed (serialization, re-indexing) to avoid building
+        a ``Proposition`` per row.  Rows carry no ``source_chunk_content``.
+        """
+        cursor = self._collection().find(
+            {"document_id": document_id}, self._PROJECTION
+        ).sort("proposition_index", 1).batch_size(self._BATCH_SIZE)
+        yield from cursor
 
     def get_document_propositions(
         self, document_id: str
     ) -> List[Proposition]:
         """Get all propositions for a document, ordered by index."""
-        cursor = self._collection().find(
-            {"document_id": document_id}
-        ).sort("proposition_index", 1)
-        return [Proposition.from_dict(d) for d in cursor]
+        return self._build_propositions(
+            list(self.get_document_proposition_dicts(document_id))
+        )
 
     def get_chunk_propositions(
         self, document_id: str, chunk_index: int
     ) -> List[Proposition]:
         """Get propositions originating from a specific chunk."""
         cursor = self._collection().find(
-            {"document_id": document_id, "source_chunk_index": chunk_index}
+            {"document_id": document_id, "source_chunk_index": chunk_index},
+            self._PROJECTION,
         ).sort("proposition_index", 1)
-        return [Proposition.from_dict(d) for d in cursor]
+        return self._build_propositions(list(cursor))
+
+    def search_proposition_dicts(
+        self, user_id: str, query: str, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Simple regex text search across propositions, returning raw dicts."""
+        cursor = self._collection().find(
+            {"user_id": user_id, "text": {"$regex": query, "$options": "i"}},
+            self._PROJECTION,
+        ).limit(limit)
+        return list(cursor)
 
     def search_propositions(
         self, user_id: str, query: str, limit: int = 20
     ) -> List[Proposition]:
         """Simple regex text search across propositions."""
-        cursor = self._collection().find(
-            {"user_id": user_id, "text": {"$regex": query, "$options": "i"}}
-        ).limit(limit)
-        return [Proposition.from_dict(d) for d in cursor]
+        return self._build_propositions(
+            self.search_proposition_dicts(user_id, query, limit)
+        )
 
     def delete_document_propositions(self, document_id: str) -> int:
         """Delete all propositions for a document."""
@@ -268,3 +344,44 @@ class PropositionRepository:
     def count(self, document_id: Optional[str] = None) -> int:
         query = {"document_id": document_id} if document_id else {}
         return self._collection().count_documents(query)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_storage_dict(proposition: Proposition) -> Dict[str, Any]:
+        """Serialize for Mongo, dropping the denormalized chunk text."""
+        doc = proposition.to_dict()
+        del doc["source_chunk_content"]
+        return doc
+
+    def _build_propositions(
+        self, docs: List[Dict[str, Any]]
+    ) -> List[Proposition]:
+        """Join chunk text onto stored rows (one query) and build objects."""
+        missing: Dict[str, Set[int]] = {}
+        for d in docs:
+            if "source_chunk_content" not in d:
+                missing.setdefault(d["document_id"], set()).add(d["source_chunk_index"])
+
+        contents: Dict[Tuple[str, int], str] = {}
+        if missing:
+            cursor = self._chunks_collection().find(
+                {"$or": [
+                    {"document_id": doc_id, "chunk_index": {"$in": sorted(indices)}}
+                    for doc_id, indices in missing.items()
+                ]},
+                {"_id": 0, "document_id": 1, "chunk_index": 1, "content": 1},
+            )
+            for c in cursor:
+                contents[(c["document_id"], c["chunk_index"])] = c["content"]
+
+        propositions = []
+        for d in docs:
+            if "source_chunk_content" not in d:
+                d["source_chunk_content"] = contents.get(
+                    (d["document_id"], d["source_chunk_index"]), ""
+                )
+            propositions.append(Proposition.from_dict(d))
+        return propositions
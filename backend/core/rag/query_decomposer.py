@@ -12,8 +12,12 @@ Example:
      "When to use PCA vs t-SNE?"]
 """
 
+import hashlib
+import heapq
 import logging
-from typing import Callable, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 
 from core.config import get_openai_llm
 from core.models.document import DocumentSearchResult
@@ -26,11 +30,19 @@ class QueryDecomposer:
     Decompose complex queries into simpler sub-queries.
 
     Uses a fast LLM to decide whether decomposition is needed and
-    to generate sub-queries.
+    to generate sub-queries.  LLM decisions (simple or decomposed) are
+    memoized per normalized query text.
+
+    Parameters:
+        llm: Optional LLM override (defaults to gpt-4o-mini).
+        cache_size: Maximum memoized decompositions (LRU). 0 disables.
     """
 
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, cache_size: int = 2048):
         self._llm = llm
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
 
     @property
     def llm(self):
@@ -51,6 +63,12 @@ class QueryDecomposer:
         Returns:
             List of sub-queries (always includes the original).
         """
+        cache_key = self._cache_key(query, max_sub_queries)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            # Keys are case/whitespace-normalized; keep the caller's wording
+            return [query] + cached[1:]
+
         prompt = f"""Analyze this question and decide if it needs to be broken into simpler sub-questions for search.
 
 Question: {query}
@@ -70,6 +88,7 @@ Maximum {max_sub_queries} sub-questions. Each must be self-contained."""
             text = response.content.strip()
 
             if text.upper().startswith("SIMPLE"):
+                self._cache_put(cache_key, [query])
                 return [query]
 
             sub_queries = [query]
@@ -84,12 +103,39 @@ Maximum {max_sub_queries} sub-questions. Each must be self-contained."""
                 logger.info(
                     f"Decomposed '{query[:40]}' into {len(sub_queries)} sub-queries"
                 )
+            self._cache_put(cache_key, sub_queries)
             return sub_queries
 
         except Exception as e:
             logger.warning(f"Query decomposition failed: {e}")
             return [query]
 
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_key(query: str, max_sub_queries: int) -> str:
+        digest = hashlib.md5(query.strip().lower().encode()).hexdigest()
+        return f"{max_sub_queries}:{digest}"
+
+    def _cache_get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            return cached
+
+    def _cache_put(self, key: str, sub_queries: List[str]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = list(sub_queries)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
 
 def retrieve_with_decomposition(
     query: str,
@@ -116,20 +162,21 @@ def retrieve_with_decomposition(
     if len(sub_queries) <= 1:
         return search_fn(query=query, top_k=top_k, **search_kwargs)
 
-    all_results: Dict[str, DocumentSearchResult] = {}
+    all_results: Dict[Tuple[str, int], DocumentSearchResult] = {}
 
     per_query_k = max(3, top_k // len(sub_queries) + 1)
 
     for sq in sub_queries:
         results = search_fn(query=sq, top_k=per_query_k, **search_kwargs)
         for r in results:
-            key = f"{r.chunk.document_id}_{r.chunk.chunk_index}"
-            if key not in all_results or r.score > all_results[key].score:
+            key = (r.chunk.document_id, r.chunk.chunk_index)
+            existing = all_results.get(key)
+            if existing is None or r.score > existing.score:
                 all_results[key] = r
 
-    merged = sorted(all_results.values(), key=lambda r: r.score, reverse=True)
+    merged = heapq.nlargest(top_k, all_results.values(), key=lambda r: r.score)
 
     for i, r in enumerate(merged):
         r.rank = i + 1
 
-    return merged[:top_k]
+    return merged
@@ -13,8 +13,12 @@ import json
 import logging
 import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -43,23 +47,48 @@ try:
 except ImportError:
     _PROM_AVAILABLE = False
 
+# ---------------------------------------------------------------------------
+# Optional Numba-compiled cosine kernel (falls back to NumPy)
+# ---------------------------------------------------------------------------
+
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _cosine_nb(a, b):
+        dot = 0.0
+        norm_a = 0.0
+        norm_b = 0.0
+        for i in range(a.shape[0]):
+            dot += a[i] * b[i]
+            norm_a += a[i] * a[i]
+            norm_b += b[i] * b[i]
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0
+        return dot / (norm_a ** 0.5 * norm_b ** 0.5)
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 
+def _as_vector(embedding: Any) -> np.ndarray:
+    """Convert an embedding to a contiguous float32 vector (no copy if already one)."""
+    return np.ascontiguousarray(embedding, dtype=np.float32)
+
+
+@dataclass(frozen=True, slots=True)
 class CacheEntry:
-    __slots__ = ("query", "embedding", "answer", "sources", "created_at")
+    """
+    A cached answer.  ``embedding`` is a contiguous float32 array
+    (4 bytes/dim) rather than a list of boxed Python floats.
+    """
 
-    def __init__(
-        self,
-        query: str,
-        embedding: List[float],
-        answer: str,
-        sources: List[Any],
-        created_at: float,
-    ):
-        self.query = query
-        self.embedding = embedding
-        self.answer = answer
-        self.sources = sources
-        self.created_at = created_at
+    query: str
+    embedding: np.ndarray
+    answer: str
+    sources: List[Any]
+    created_at: float
 
 
 class SemanticResponseCache:
@@ -72,7 +101,13 @@ class SemanticResponseCache:
     Parameters:
         similarity_threshold: Minimum cosine similarity for a cache hit (0-1).
         ttl_seconds: Time-to-live for cache entries. 0 = no expiry.
-        max_entries: Maximum entries per user. Evicts oldest when exceeded.
+        max_entries: Maximum entries per user. Evicts the least recently
+            used entry when exceeded.
+
+    All entries share one embedding space: the dimension (and model id, when
+    callers supply one) is fixed by the first ``put``.  An embedding from a
+    different space invalidates the whole cache instead of silently scoring
+    zero against every entry.
     """
 
     def __init__(
@@ -85,14 +120,24 @@ class SemanticResponseCache:
         self.ttl_seconds = ttl_seconds
         self.max_entries = max_entries
 
-        # Outer key: user_id, inner key: md5(query)
-        self._entries: Dict[str, Dict[str, CacheEntry]] = {}
+        # Outer key: user_id, inner key: md5(query).  Inner dicts are kept
+        # in LRU order (oldest first) so eviction is O(1).
+        self._entries: Dict[str, "OrderedDict[str, CacheEntry]"] = {}
         self._lock = threading.Lock()
 
+        # Embedding space of the cached entries (set on first put)
+        self._dim: Optional[int] = None
+        self._model_id: Optional[str] = None
+
         # Hit/miss counters for monitoring
         self._hits = 0
         self._misses = 0
 
+        if _NUMBA_AVAILABLE:
+            # Compile (or load from the on-disk cache) before the first lookup
+            warmup = np.ones(4, dtype=np.float32)
+            _cosine_nb(warmup, warmup)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -102,6 +147,7 @@ class SemanticResponseCache:
         user_id: str,
         query: str,
         query_embedding: List[float],
+        model_id: Optional[str] = None,
     ) -> Optional[Tuple[str, List[Any]]]:
         """
         Look up a cached answer by semantic similarity within a user's partition.
@@ -110,29 +156,37 @@ class SemanticResponseCache:
             user_id: User whose cache to search.
             query: The user query (for logging).
             query_embedding: Embedding of the query.
+            model_id: Embedding model that produced ``query_embedding``.
 
         Returns:
             (answer, sources) if cache hit, else None.
         """
         now = time.time()
+        query_vector = _as_vector(query_embedding)
         best_score = -1.0
+        best_key: Optional[str] = None
         best_entry: Optional[CacheEntry] = None
 
         with self._lock:
-            user_entries = self._entries.get(user_id, {})
+            self._check_embedding_space(len(query_vector), model_id)
+            user_entries = self._entries.get(user_id, OrderedDict())
             expired_keys = []
             for key, entry in user_entries.items():
                 if self.ttl_seconds and (now - entry.created_at) > self.ttl_seconds:
                     expired_keys.append(key)
                     continue
-                score = self._cosine_similarity(query_embedding, entry.embedding)
+                score = self._cosine(query_vector, entry.embedding)
                 if score > best_score:
                     best_score = score
+                    best_key = key
                     best_entry = entry
 
             for k in expired_keys:
                 del user_entries[k]
 
+            if best_key is not None and best_score >= self.similarity_threshold:
+                user_entries.move_to_end(best_key)
+
         if best_entry and best_score >= self.similarity_threshold:
             self._hits += 1
             if _PROM_AVAILABLE:
@@ -155,6 +209,7 @@ class SemanticResponseCache:
         query_embedding: List[float],
         answer: str,
         sources: List[Any],
+        model_id: Optional[str] = None,
     ) -> None:
         """
         Store a query/answer pair in the user's cache partition.
@@ -165,21 +220,25 @@ class SemanticResponseCache:
             query_embedding: Embedding of the query.
             answer: Generated answer.
             sources: Source chunks.
+            model_id: Embedding model that produced ``query_embedding``.
         """
         key = hashlib.md5(query.encode()).hexdigest()
         entry = CacheEntry(
             query=query,
-            embedding=query_embedding,
+            embedding=_as_vector(query_embedding),
             answer=answer,
             sources=sources,
             created_at=time.time(),
         )
 
         with self._lock:
+            self._check_embedding_space(len(entry.embedding), model_id)
             if user_id not in self._entries:
-                self._entries[user_id] = {}
-            self._entries[user_id][key] = entry
-            if len(self._entries[user_id]) > self.max_entries:
+                self._entries[user_id] = OrderedDict()
+            user_entries = self._entries[user_id]
+            user_entries[key] = entry
+            user_entries.move_to_end(key)
+            if len(user_entries) > self.max_entries:
                 self._evict_oldest(user_id)
 
         logger.debug(
@@ -207,6 +266,8 @@ class SemanticResponseCache:
             else:
                 count = sum(len(v) for v in self._entries.values())
                 self._entries.clear()
+                self._dim = None
+                self._model_id = None
         logger.info(
             "Cache invalidated (user=%s): %d entries cleared",
             user_id or "ALL", count,
@@ -238,24 +299,62 @@ class SemanticResponseCache:
     # Internals
     # ------------------------------------------------------------------
 
+    def _check_embedding_space(self, dim: int, model_id: Optional[str]) -> None:
+        """
+        Pin the cache to one embedding space; clear it if that space changes.
+
+        Must be called with ``self._lock`` held.  A ``model_id`` of None is
+        treated as unknown and never triggers invalidation on its own.
+        """
+        if self._dim is None:
+            self._dim = dim
+            self._model_id = model_id
+            return
+        model_changed = (
+            model_id is not None
+            and self._model_id is not None
+            and model_id != self._model_id
+        )
+        if dim == self._dim and not model_changed:
+            if self._model_id is None:
+                self._model_id = model_id
+            return
+
+        count = sum(len(v) for v in self._entries.values())
+        logger.warning(
+            "Embedding space changed (dim %s -> %s, model %s -> %s); "
+            "invalidating %d cached entries",
+            self._dim, dim, self._model_id, model_id, count,
+        )
+        self._entries.clear()
+        self._dim = dim
+        self._model_id = model_id
+
     @staticmethod
     def _cosine_similarity(a: List[float], b: List[float]) -> float:
         if len(a) != len(b):
             return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
+        return SemanticResponseCache._cosine(a, b)
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        """Cosine similarity for vectors already known to share a dimension."""
+        a = _as_vector(a)
+        b = _as_vector(b)
+        if _NUMBA_AVAILABLE:
+            return float(_cosine_nb(a, b))
+        norm_a = float(np.linalg.norm(a))
+        norm_b = float(np.linalg.norm(b))
         if norm_a == 0 or norm_b == 0:
             return 0.0
-        return dot / (norm_a * norm_b)
+        return float(np.dot(a, b)) / (norm_a * norm_b)
 
     def _evict_oldest(self, user_id: str) -> None:
-        """Remove the oldest entry (by created_at) for a given user."""
-        user_entries = self._entries.get(user_id, {})
+        """Remove the least recently used entry for a given user."""
+        user_entries = self._entries.get(user_id)
         if not user_entries:
             return
-        oldest_key = min(user_entries, key=lambda k: user_entries[k].created_at)
-        del user_entries[oldest_key]
+        user_entries.popitem(last=False)
 
 
 # ---------------------------------------------------------------------------
@@ -331,9 +430,10 @@ class RedisResponseCache:
         user_id: str,
         query: str,
         query_embedding: List[float],
+        model_id: Optional[str] = None,
     ) -> Optional[Tuple[str, List[Any]]]:
         if self._fallback:
-            return self._fallback.get(user_id, query, query_embedding)
+            return self._fallback.get(user_id, query, query_embedding, model_id)
 
         try:
             emb_key = self._embeddings_key(user_id)
@@ -385,9 +485,12 @@ class RedisResponseCache:
         query_embedding: List[float],
         answer: str,
         sources: List[Any],
+        model_id: Optional[str] = None,
     ) -> None:
         if self._fallback:
-            self._fallback.put(user_id, query, query_embedding, answer, sources)
+            self._fallback.put(
+                user_id, query, query_embedding, answer, sources, model_id
+            )
             return
 
         key = hashlib.md5(query.encode()).hexdigest()
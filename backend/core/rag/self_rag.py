@@ -9,14 +9,453 @@ This catches retrieval failures early instead of letting the generation
 LLM hallucinate from irrelevant context.
 """
 
+import hashlib
+import importlib.util
+import io
+import json
 import logging
-from typing import List, Optional, Callable
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Callable, Sequence, Tuple
+
+import numpy as np
+
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from core.config import get_openai_llm
 from core.models.document import DocumentSearchResult
 
+try:
+    from openai import RateLimitError
+except ImportError:
+    RateLimitError = None
+
+# transformers is heavy to import, so only probe for it here; the
+# summarization pipeline is built on first use.
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+
 logger = logging.getLogger(__name__)
 
+# Judgments per batched prompt; accuracy degrades with larger batches.
+MAX_VERIFY_BATCH = 16
+
+# Judge context preview: at most this many results, this many chars from
+# each, and this many chars in total across them.
+PREVIEW_MAX_RESULTS = 5
+PREVIEW_CHARS_PER_RESULT = 400
+PREVIEW_BUDGET_CHARS = 1000
+
+# Optional preview compression: each previewed chunk is summarized locally
+# (abstractive when transformers is installed, else head + tail extract)
+# before it goes into the judge prompt.
+PREVIEW_SUMMARY_MODEL = "sshleifer/distilbart-cnn-6-6"
+PREVIEW_SUMMARY_INPUT_CHARS = 500
+PREVIEW_SUMMARY_MAX_TOKENS = 40
+PREVIEW_SUMMARY_MIN_TOKENS = 10
+PREVIEW_EXTRACT_CHARS = 80
+
+# Judge rate limiting: pause before a call when the provider reports fewer
+# than this many tokens/requests left in the window; retry 429s with
+# exponential backoff (honouring Retry-After) before giving up.
+RATE_LIMIT_MIN_TOKENS = 5000
+RATE_LIMIT_MIN_REQUESTS = 2
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE = 0.5
+RATE_LIMIT_MAX_SLEEP = 30.0
+
+# Rule-based pre-filter over the top results: accept without a judge call
+# when the best score and query-keyword overlap are both high, reject when
+# both are very low.  Only the ambiguous middle band reaches the LLM.
+PREFILTER_TOP_K = 3
+PREFILTER_ACCEPT_SCORE = 0.85
+PREFILTER_ACCEPT_OVERLAP = 0.4
+PREFILTER_REJECT_SCORE = 0.3
+PREFILTER_REJECT_OVERLAP = 0.1
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+_WORD_RE = re.compile(r"\w+")
+_QUESTION_STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "what", "which", "who",
+    "how", "why", "when", "where", "do", "does", "did", "can", "could",
+    "should", "would", "of", "in", "on", "for", "to", "and", "or", "me",
+    "explain", "describe", "tell", "about", "please",
+})
+
+_JUDGE_GUIDELINES = """Guidelines:
+- Respond SUFFICIENT if the context contains the answer, even if it is
+  implicit, spread across multiple passages, or requires minor inference.
+- Only respond INSUFFICIENT or REFORMULATE if the context is clearly
+  about a different topic or completely missing the key information.
+- When in doubt, respond SUFFICIENT — it is better to generate from
+  partially relevant context than to discard it and retry."""
+
+# The judge instructions go in a fixed system message and the per-call
+# question/context in the user message, so every call shares an identical
+# prompt prefix that the provider can cache.
+JUDGE_PROMPT_CACHE_KEY = "self_rag_judge_v1"
+
+_JUDGE_EXAMPLES = """Examples:
+
+Question: What is the learning rate in gradient descent?
+Retrieved context (truncated):
+Gradient descent updates parameters by stepping against the gradient. The
+step size, called the learning rate, controls how far each update moves.
+Verdict: SUFFICIENT
+
+Question: How does dropout prevent overfitting?
+Retrieved context (truncated):
+Batch normalization normalizes layer inputs using mini-batch statistics.
+Verdict: REFORMULATE: dropout regularization randomly dropping units overfitting
+
+Question: What did the lecture say about the midterm date?
+Retrieved context (truncated):
+Eigenvectors of a symmetric matrix are orthogonal.
+Verdict: INSUFFICIENT: context is about linear algebra, not course logistics
+
+Question: Why does PCA center the data first?
+Retrieved context (truncated):
+PCA finds directions of maximal variance. Variance is measured around the
+mean, so each feature has its mean subtracted before computing the
+covariance matrix.
+Verdict: SUFFICIENT"""
+
+_JUDGE_RUBRIC = f"""You are a retrieval quality judge. Decide whether the retrieved context
+is sufficient to answer the user's question.
+
+Respond with EXACTLY one of these formats:
+SUFFICIENT
+INSUFFICIENT: <brief reason>
+REFORMULATE: <better search query>
+
+{_JUDGE_GUIDELINES}
+
+{_JUDGE_EXAMPLES}"""
+
+_JUDGE_USER_TEMPLATE = """Question: {question}
+
+Retrieved context (truncated):
+{context}"""
+
+_FANOUT_JUDGE_RUBRIC = f"""You are a retrieval quality judge. Decide whether the retrieved context
+is sufficient to answer the user's question. If it is not, propose
+alternative search queries that are likely to retrieve the missing
+information; make them meaningfully different from each other (synonyms,
+expanded acronyms, narrower or broader phrasing).
+
+Respond with ONLY a JSON object:
+{{"sufficient": true | false, "reason": "<brief reason>",
+  "reformulations": ["<search query>", ...]}}
+Leave "reformulations" empty when sufficient; otherwise give exactly the
+number of reformulations requested.
+
+{_JUDGE_GUIDELINES}"""
+
+_FANOUT_USER_TEMPLATE = """Reformulations requested: {n}
+
+Question: {question}
+
+Retrieved context (truncated):
+{context}"""
+
+_BATCH_JUDGE_RUBRIC = f"""You are a retrieval quality judge. For each item, decide whether
+the retrieved context is sufficient to answer that item's question.
+
+Respond with ONLY a JSON array, one object per item:
+[{{"id": <item id>, "verdict": "SUFFICIENT" | "INSUFFICIENT" | "REFORMULATE",
+  "reason": "<brief reason>", "reformulated": "<better search query>"}}]
+
+{_JUDGE_GUIDELINES}"""
+
+
+def _parse_reset_seconds(value: Optional[str]) -> float:
+    """Parse OpenAI reset durations like ``"6m0s"``, ``"1.5s"`` or ``"20ms"``."""
+    if not value:
+        return 0.0
+    return sum(
+        float(amount) * _DURATION_UNITS[unit]
+        for amount, unit in _DURATION_PART_RE.findall(value)
+    )
+
+
+class RateLimitTracker:
+    """
+    Provider rate-limit state shared by every verifier in the process.
+
+    Updated from OpenAI's ``x-ratelimit-*`` response headers; ``wait``
+    sleeps until the window resets when the remaining budget is nearly
+    spent, so calls slow down before they start failing with 429s.
+    """
+
+    def __init__(
+        self,
+        min_tokens: int = RATE_LIMIT_MIN_TOKENS,
+        min_requests: int = RATE_LIMIT_MIN_REQUESTS,
+    ):
+        self.min_tokens = min_tokens
+        self.min_requests = min_requests
+        self._lock = threading.Lock()
+        self._tokens_remaining: Optional[int] = None
+        self._requests_remaining: Optional[int] = None
+        self._resume_at = 0.0
+
+    def record(self, headers: Optional[Dict[str, str]]) -> None:
+        """Fold the rate-limit headers of a response into the shared state."""
+        if not headers:
+            return
+        try:
+            tokens = headers.get("x-ratelimit-remaining-tokens")
+            requests = headers.get("x-ratelimit-remaining-requests")
+            tokens = int(tokens) if tokens is not None else None
+            requests = int(requests) if requests is not None else None
+        except (TypeError, ValueError):
+            return
+
+        pause = 0.0
+        if tokens is not None and tokens < self.min_tokens:
+            pause = max(pause, _parse_reset_seconds(headers.get("x-ratelimit-reset-tokens")))
+        if requests is not None and requests < self.min_requests:
+            pause = max(pause, _parse_reset_seconds(headers.get("x-ratelimit-reset-requests")))
+
+        with self._lock:
+            self._tokens_remaining = tokens
+            self._requests_remaining = requests
+            if pause:
+                self._resume_at = max(
+                    self._resume_at, time.monotonic() + min(pause, RATE_LIMIT_MAX_SLEEP)
+                )
+
+    def defer(self, seconds: float) -> None:
+        """Hold off all callers for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._resume_at = max(
+                self._resume_at, time.monotonic() + min(seconds, RATE_LIMIT_MAX_SLEEP)
+            )
+
+    def wait(self) -> None:
+        """Block until the current rate-limit window allows another call."""
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            logger.info(f"Verifier pausing {delay:.2f}s for provider rate limit")
+            time.sleep(delay)
+
+
+_rate_limiter = RateLimitTracker()
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+    if RateLimitError is not None and isinstance(exc, RateLimitError):
+        return True
+    return getattr(exc, "status_code", None) == 429
+
+
+def _retry_after_seconds(exc: Exception, attempt: int) -> float:
+    """Delay before retrying a 429: Retry-After if sent, else exponential with jitter."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return RATE_LIMIT_BACKOFF_BASE * (2 ** attempt) + random.uniform(0, RATE_LIMIT_BACKOFF_BASE)
+
+
+class VerifierCache:
+    """
+    Cache of judge verdicts keyed by (normalized query, retrieved chunk set).
+
+    The same question over the same retrieved chunks gets the same verdict,
+    so repeat judgments are served without an LLM call.  With ``embed_fn``
+    set, a miss is also checked against earlier queries that retrieved the
+    same chunks: one whose embedding is within ``similarity_threshold``
+    (e.g. "explain derivative" vs "explain derivatives") reuses its verdict.
+
+    Parameters:
+        max_size: Max cached verdicts (LRU eviction).
+        ttl_seconds: Verdict lifetime.
+        embed_fn: Optional query -> embedding function for near-duplicate hits.
+        similarity_threshold: Cosine similarity required for a near-duplicate hit.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl_seconds: float = 86400,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        similarity_threshold: float = 0.97,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        # key -> (verdict, created_at, chunk signature, query embedding)
+        self._entries: "OrderedDict[str, Tuple[VerificationResult, float, str, Optional[np.ndarray]]]" = OrderedDict()
+        # chunk signature -> keys of entries judged over that chunk set
+        self._by_chunks: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def chunk_signature(results: List[DocumentSearchResult]) -> str:
+        """Order-independent identity of the chunks the judge sees."""
+        return ",".join(sorted(
+            f"{r.chunk.document_id}:{r.chunk.chunk_index}"
+            for r in results[:PREVIEW_MAX_RESULTS]
+        ))
+
+    @staticmethod
+    def make_key(query: str, signature: str) -> str:
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(f"{normalized}|{signature}".encode()).hexdigest()
+
+    def get(
+        self, query: str, results: List[DocumentSearchResult]
+    ) -> Optional["VerificationResult"]:
+        signature = self.chunk_signature(results)
+        key = self.make_key(query, signature)
+        now = time.time()
+        with self._lock:
+            verdict = self._lookup(key, now)
+            if verdict is not None:
+                self.hits += 1
+                return verdict
+            candidates = list(self._by_chunks.get(signature, ()))
+
+        if self.embed_fn is not None and candidates:
+            try:
+                q_vec = np.asarray(self.embed_fn(query), dtype=np.float32)
+            except Exception as e:
+                logger.debug(f"Verifier cache embedding failed: {e}")
+                q_vec = None
+            if q_vec is not None:
+                with self._lock:
+                    for cand in candidates:
+                        entry = self._entries.get(cand)
+                        if entry is None or entry[3] is None:
+                            continue
+                        denom = float(np.linalg.norm(q_vec) * np.linalg.norm(entry[3]))
+                        if denom and float(np.dot(q_vec, entry[3])) / denom >= self.similarity_threshold:
+                            verdict = self._lookup(cand, now)
+                            if verdict is not None:
+                                self.hits += 1
+                                return verdict
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        query: str,
+        results: List[DocumentSearchResult],
+        verdict: "VerificationResult",
+    ) -> None:
+        signature = self.chunk_signature(results)
+        key = self.make_key(query, signature)
+        q_vec = None
+        if self.embed_fn is not None:
+            try:
+                q_vec = np.asarray(self.embed_fn(query), dtype=np.float32)
+            except Exception as e:
+                logger.debug(f"Verifier cache embedding failed: {e}")
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (verdict, time.time(), signature, q_vec)
+            self._by_chunks.setdefault(signature, []).append(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_chunks.clear()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str, now: float) -> Optional["VerificationResult"]:
+        """Return a live entry's verdict, refreshing LRU order. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry[1] > self.ttl_seconds:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry and its chunk-set index. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_chunks.get(entry[2])
+        if keys is not None:
+            keys.remove(key)
+            if not keys:
+                del self._by_chunks[entry[2]]
+
+
+_summarizer = None
+_summarizer_failed = False
+_summarizer_lock = threading.Lock()
+
+
+def _get_summarizer():
+    """Process-wide summarization pipeline, or None if unavailable."""
+    global _summarizer, _summarizer_failed
+    if _summarizer is None and not _summarizer_failed and TRANSFORMERS_AVAILABLE:
+        with _summarizer_lock:
+            if _summarizer is None and not _summarizer_failed:
+                try:
+                    from transformers import pipeline
+                    _summarizer = pipeline(
+                        "summarization", model=PREVIEW_SUMMARY_MODEL, device=-1
+                    )
+                except Exception as e:
+                    logger.warning(f"Preview summarizer unavailable, using extracts: {e}")
+                    _summarizer_failed = True
+    return _summarizer
+
+
+def _extract(text: str) -> str:
+    """Cheap fallback summary: the first and last few sentences' worth of a chunk."""
+    if len(text) <= 2 * PREVIEW_EXTRACT_CHARS:
+        return text
+    return f"{text[:PREVIEW_EXTRACT_CHARS]} ... {text[-PREVIEW_EXTRACT_CHARS:]}"
+
+
+def _compress_chunks(texts: List[str]) -> List[str]:
+    """Summarize chunks for the judge preview in one batched forward pass."""
+    summarizer = _get_summarizer()
+    if summarizer is not None:
+        try:
+            outputs = summarizer(
+                [t[:PREVIEW_SUMMARY_INPUT_CHARS] for t in texts],
+                max_length=PREVIEW_SUMMARY_MAX_TOKENS,
+                min_length=PREVIEW_SUMMARY_MIN_TOKENS,
+                truncation=True,
+                batch_size=len(texts),
+            )
+            return [o["summary_text"] for o in outputs]
+        except Exception as e:
+            logger.debug(f"Preview summarization failed, using extracts: {e}")
+    return [_extract(t) for t in texts]
+
 
 class RetrievalVerifier:
     """
@@ -24,17 +463,84 @@ class RetrievalVerifier:
 
     Uses a fast LLM (gpt-4o-mini) to make a binary decision with a
     confidence score, plus an optional reformulated query for retry.
+    Verdicts are memoized in a ``VerifierCache`` unless ``use_cache``
+    is False.
+
+    When ``absolute_scores`` is True, clear-cut cases are settled by a
+    rule-based pre-filter on retrieval scores and keyword overlap;
+    ``prefilter_stats`` counts its accept, reject and pass-through
+    decisions for threshold tuning.  Its fixed thresholds assume an
+    absolute scale (raw cosine similarity or cross-encoder probability),
+    so leave it off for scores normalized per query, such as hybrid search.
+
+    With an ``embedding_service``, a cheap local check runs next: query
+    and previewed chunks are embedded as int8 vectors and, if any chunk is
+    at least ``early_exit_similarity`` similar to the query, the context
+    is accepted without an LLM call.  Best suited to local embedding
+    providers, where embedding the chunks costs less than a judge call.
+
+    ``compress_preview`` summarizes each previewed chunk locally before it
+    is sent, trading a small CPU cost for a much shorter judge prompt.
     """
 
-    def __init__(self, llm=None):
+    def __init__(
+        self,
+        llm=None,
+        cache: Optional[VerifierCache] = None,
+        use_cache: bool = True,
+        embedding_service=None,
+        early_exit_similarity: float = 0.6,
+        compress_preview: bool = False,
+        absolute_scores: bool = False,
+    ):
         self._llm = llm
+        self.compress_preview = compress_preview
+        self.absolute_scores = absolute_scores
+        self.cache = (cache or VerifierCache()) if use_cache else None
+        self.embedding_service = embedding_service
+        self.early_exit_similarity = early_exit_similarity
+        self.prefilter_stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
 
     @property
     def llm(self):
         if self._llm is None:
-            self._llm = get_openai_llm(model="gpt-4o-mini", temperature=0.0)
+            self._llm = get_openai_llm(
+                model="gpt-4o-mini",
+                temperature=0.0,
+                prompt_cache_key=JUDGE_PROMPT_CACHE_KEY,
+                include_response_headers=True,
+                # _invoke retries 429s under the shared limiter; SDK retries
+                # on top would multiply attempts and skip the limiter
+                max_retries=0,
+            )
         return self._llm
 
+    def _invoke(self, messages):
+        """
+        Call the judge LLM under the shared rate limiter.
+
+        Waits out a nearly exhausted rate-limit window, records the
+        response's rate-limit headers, and retries 429s with backoff.
+        Other errors, and 429s that persist past ``RATE_LIMIT_MAX_RETRIES``,
+        propagate to the caller.
+        """
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            _rate_limiter.wait()
+            try:
+                response = self.llm.invoke(messages)
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = _retry_after_seconds(e, attempt)
+                logger.warning(f"Verifier rate limited, retrying in {delay:.2f}s")
+                _rate_limiter.defer(delay)
+                continue
+            metadata = getattr(response, "response_metadata", None)
+            if isinstance(metadata, dict):
+                _rate_limiter.record(metadata.get("headers"))
+            return response
+
     def verify(
         self,
         query: str,
@@ -59,71 +565,375 @@ class RetrievalVerifier:
                 reformulated_query=query,
             )
 
-        context_preview = "\n".join(
-            r.chunk.content[:400] for r in results[:5]
+        prefiltered = self._prefilter(query, results)
+        if prefiltered is not None:
+            return prefiltered
+
+        if self.cache is not None:
+            cached = self.cache.get(query, results)
+            if cached is not None:
+                return cached
+
+        if self._similar_enough(query, results):
+            return VerificationResult(sufficient=True, reason="embedding_similarity")
+
+        return self._judge(query, results)
+
+    def _judge(
+        self, query: str, results: List[DocumentSearchResult]
+    ) -> "VerificationResult":
+        """Ask the LLM judge about one item and cache its verdict."""
+        messages = [
+            SystemMessage(content=_JUDGE_RUBRIC),
+            HumanMessage(content=_JUDGE_USER_TEMPLATE.format(
+                question=query,
+                context=self._context_preview(results, self.compress_preview),
+            )),
+        ]
+
+        try:
+            response = self._invoke(messages)
+            verdict = self._parse_verdict(response.content.strip(), query)
+        except Exception as e:
+            # Not cached: the permissive default isn't a real judgment
+            if _is_rate_limit_error(e):
+                logger.error(f"Retrieval verification rate limited after retries: {e}")
+            else:
+                logger.warning(f"Retrieval verification failed: {e}")
+            return VerificationResult(sufficient=True)
+
+        if self.cache is not None:
+            self.cache.put(query, results, verdict)
+        return verdict
+
+    def verify_with_reformulations(
+        self,
+        query: str,
+        results: List[DocumentSearchResult],
+        n: int = 3,
+        min_results: int = 1,
+    ) -> "VerificationResult":
+        """
+        Judge the context and, if insufficient, propose ``n`` alternative
+        queries in the same LLM call.
+
+        The same local gates as ``verify`` run first (result count,
+        pre-filter, int8 early exit); verdicts they settle carry no
+        reformulations.  Falls back to the single-query verdict format if
+        the response is not valid JSON.  Only sufficient verdicts are
+        served from the cache, since cached insufficient ones may lack
+        reformulations.
+
+        Args:
+            query: User's question.
+            results: Retrieved search results.
+            n: Number of reformulations to request.
+            min_results: Minimum results to consider retrieval valid.
+
+        Returns:
+            VerificationResult whose ``reformulations`` holds the candidates.
+        """
+        if len(results) < min_results:
+            return VerificationResult(
+                sufficient=False,
+                reason="too_few_results",
+                reformulated_query=query,
+            )
+
+        prefiltered = self._prefilter(query, results)
+        if prefiltered is not None:
+            return prefiltered
+
+        if self.cache is not None:
+            cached = self.cache.get(query, results)
+            if cached is not None and (cached.sufficient or cached.reformulations):
+                return cached
+
+        if self._similar_enough(query, results):
+            return VerificationResult(sufficient=True, reason="embedding_similarity")
+
+        messages = [
+            SystemMessage(content=_FANOUT_JUDGE_RUBRIC),
+            HumanMessage(content=_FANOUT_USER_TEMPLATE.format(
+                n=n,
+                question=query,
+                context=self._context_preview(results, self.compress_preview),
+            )),
+        ]
+        try:
+            response = self._invoke(messages)
+            verdict = self._parse_fanout_verdict(response.content.strip(), query, n)
+        except Exception as e:
+            logger.warning(f"Retrieval verification failed: {e}")
+            return VerificationResult(sufficient=True)
+
+        if self.cache is not None:
+            self.cache.put(query, results, verdict)
+        return verdict
+
+    @classmethod
+    def _parse_fanout_verdict(
+        cls, text: str, query: str, n: int
+    ) -> "VerificationResult":
+        """Parse the JSON fan-out verdict, falling back to the plain format."""
+        body = text.strip("`").removeprefix("json").strip() if text.startswith("```") else text
+        try:
+            data: Dict[str, Any] = json.loads(body)
+            sufficient = bool(data["sufficient"])
+        except (ValueError, KeyError, TypeError):
+            verdict = cls._parse_verdict(text, query)
+            if not verdict.sufficient and verdict.reformulated_query != query:
+                return replace(verdict, reformulations=(verdict.reformulated_query,))
+            return verdict
+        if sufficient:
+            return VerificationResult(sufficient=True)
+
+        seen = {query.strip().lower()}
+        reformulations: List[str] = []
+        raw = data.get("reformulations")
+        for candidate in raw if isinstance(raw, list) else []:
+            candidate = str(candidate).strip()
+            if candidate and candidate.lower() not in seen:
+                seen.add(candidate.lower())
+                reformulations.append(candidate)
+        reformulations = reformulations[:n]
+        return VerificationResult(
+            sufficient=False,
+            reason=str(data.get("reason") or "").strip(),
+            reformulated_query=reformulations[0] if reformulations else query,
+            reformulations=tuple(reformulations),
         )
 
-        prompt = f"""You are a retrieval quality judge. Decide whether the retrieved context
-is sufficient to answer the user's question.
+    def verify_batch(
+        self,
+        items: Sequence[Tuple[str, List[DocumentSearchResult]]],
+        min_results: int = 1,
+    ) -> List["VerificationResult"]:
+        """
+        Judge several (query, results) pairs with one LLM call per batch.
 
-Question: {query}
+        The judge instructions are sent once per batch of up to
+        ``MAX_VERIFY_BATCH`` items instead of once per item.  The same
+        local gates as ``verify`` settle items first; items the model's
+        JSON response omits or garbles are re-judged individually.
 
-Retrieved context (truncated):
-{context_preview}
+        Args:
+            items: (query, results) pairs.
+            min_results: Minimum results to consider retrieval valid.
 
-Respond with EXACTLY one of these formats:
-SUFFICIENT
-INSUFFICIENT: <brief reason>
-REFORMULATE: <better search query>
+        Returns:
+            One VerificationResult per item, in input order.
+        """
+        verdicts: List[Optional[VerificationResult]] = [None] * len(items)
+        pending: List[int] = []
+        for i, (query, results) in enumerate(items):
+            if len(results) < min_results:
+                verdicts[i] = VerificationResult(
+                    sufficient=False,
+                    reason="too_few_results",
+                    reformulated_query=query,
+                )
+            elif (prefiltered := self._prefilter(query, results)) is not None:
+                verdicts[i] = prefiltered
+            elif self.cache is not None and (
+                cached := self.cache.get(query, results)
+            ) is not None:
+                verdicts[i] = cached
+            elif self._similar_enough(query, results):
+                verdicts[i] = VerificationResult(
+                    sufficient=True, reason="embedding_similarity"
+                )
+            else:
+                pending.append(i)
 
-Guidelines:
-- Respond SUFFICIENT if the context contains the answer, even if it is
-  implicit, spread across multiple passages, or requires minor inference.
-- Only respond INSUFFICIENT or REFORMULATE if the context is clearly
-  about a different topic or completely missing the key information.
-- When in doubt, respond SUFFICIENT — it is better to generate from
-  partially relevant context than to discard it and retry."""
+        for start in range(0, len(pending), MAX_VERIFY_BATCH):
+            batch = pending[start:start + MAX_VERIFY_BATCH]
+            if len(batch) == 1:
+                i = batch[0]
+                verdicts[i] = self._judge(items[i][0], items[i][1])
+                continue
+            parsed = self._judge_batch([(i, items[i][0], items[i][1]) for i in batch])
+            for i in batch:
+                if i in parsed:
+                    verdicts[i] = parsed[i]
+                    if self.cache is not None:
+                        self.cache.put(items[i][0], items[i][1], parsed[i])
+                else:
+                    verdicts[i] = self._judge(items[i][0], items[i][1])
+
+        return verdicts
 
+    def _judge_batch(
+        self,
+        batch: List[Tuple[int, str, List[DocumentSearchResult]]],
+    ) -> Dict[int, "VerificationResult"]:
+        """Send one batched judge prompt; return {item_id: VerificationResult}."""
+        blocks = "\n".join(
+            f'<item id="{i}">\nQuestion: {query}\n'
+            f"Context:\n{self._context_preview(results, self.compress_preview)}\n</item>"
+            for i, query, results in batch
+        )
+        messages = [
+            SystemMessage(content=_BATCH_JUDGE_RUBRIC),
+            HumanMessage(content=blocks),
+        ]
+
+        queries = {i: query for i, query, _ in batch}
         try:
-            response = self.llm.invoke(prompt)
+            response = self._invoke(messages)
             text = response.content.strip()
+            if text.startswith("```"):
+                text = text.strip("`").removeprefix("json").strip()
+            entries = json.loads(text)
+        except Exception as e:
+            logger.warning(f"Batched retrieval verification failed: {e}")
+            return {}
 
-            if text.startswith("SUFFICIENT"):
-                return VerificationResult(sufficient=True)
-            elif text.startswith("REFORMULATE:"):
-                new_query = text[len("REFORMULATE:"):].strip()
-                return VerificationResult(
+        parsed: Dict[int, VerificationResult] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                i = int(entry["id"])
+                verdict = str(entry["verdict"]).upper()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if i not in queries:
+                continue
+            query = queries[i]
+            if verdict == "SUFFICIENT":
+                parsed[i] = VerificationResult(sufficient=True)
+            elif verdict == "REFORMULATE":
+                new_query = (entry.get("reformulated") or "").strip()
+                parsed[i] = VerificationResult(
                     sufficient=False,
                     reason="reformulate",
-                    reformulated_query=new_query if new_query else query,
+                    reformulated_query=new_query or query,
                 )
-            else:
-                reason = text[len("INSUFFICIENT:"):].strip() if text.startswith("INSUFFICIENT:") else text
-                return VerificationResult(
+            elif verdict == "INSUFFICIENT":
+                parsed[i] = VerificationResult(
                     sufficient=False,
-                    reason=reason,
+                    reason=(entry.get("reason") or "").strip(),
                     reformulated_query=query,
                 )
+        return parsed
+
+    def _prefilter(
+        self, query: str, results: List[DocumentSearchResult]
+    ) -> Optional["VerificationResult"]:
+        """
+        Settle trivially good or bad retrievals without the judge.
+
+        Returns None for the ambiguous band that still needs the LLM, and
+        whenever scores are relative or there are no results to score.
+        """
+        top = results[:PREFILTER_TOP_K]
+        if not self.absolute_scores or not top:
+            return None
+        top_score = max(r.score for r in top)
+        query_tokens = set(_WORD_RE.findall(query.lower()))
+        overlap = max(
+            len(query_tokens & set(_WORD_RE.findall(r.chunk.content.lower())))
+            for r in top
+        ) / max(1, len(query_tokens))
+
+        if top_score > PREFILTER_ACCEPT_SCORE and overlap > PREFILTER_ACCEPT_OVERLAP:
+            decision = "accept"
+            verdict = VerificationResult(sufficient=True, reason="prefilter")
+        elif top_score < PREFILTER_REJECT_SCORE and overlap < PREFILTER_REJECT_OVERLAP:
+            decision = "reject"
+            verdict = VerificationResult(
+                sufficient=False, reason="low_scores", reformulated_query=query
+            )
+        else:
+            decision = "llm"
+            verdict = None
+
+        with self._stats_lock:
+            self.prefilter_stats[decision] += 1
+        logger.debug(
+            f"Verifier pre-filter: {decision} "
+            f"(top_score={top_score:.2f}, overlap={overlap:.2f})"
+        )
+        return verdict
+
+    def _similar_enough(
+        self, query: str, results: List[DocumentSearchResult]
+    ) -> bool:
+        """int8 embedding early exit: True if a previewed chunk clearly matches the query."""
+        if self.embedding_service is None:
+            return False
+        try:
+            vectors, scales = self.embedding_service.embed_int8(
+                [query] + [r.chunk.content for r in results[:PREVIEW_MAX_RESULTS]]
+            )
+            sims = self.embedding_service.int8_similarity(
+                vectors[0], scales[0], vectors[1:], scales[1:]
+            )
         except Exception as e:
-            logger.warning(f"Retrieval verification failed: {e}")
-            return VerificationResult(sufficient=True)
+            logger.debug(f"int8 similarity check failed: {e}")
+            return False
+        return sims.size > 0 and float(sims.max()) >= self.early_exit_similarity
 
+    @staticmethod
+    def _context_preview(
+        results: List[DocumentSearchResult], compress: bool = False
+    ) -> str:
+        """
+        Truncated context for the judge, capped at ``PREVIEW_BUDGET_CHARS``
+        overall.  With ``compress``, each chunk is summarized first.
+        """
+        texts = [r.chunk.content for r in results[:PREVIEW_MAX_RESULTS]]
+        if compress and texts:
+            texts = _compress_chunks(texts)
+        buf = io.StringIO()
+        budget = PREVIEW_BUDGET_CHARS
+        for text in texts:
+            if budget <= 0:
+                break
+            if buf.tell():
+                buf.write("\n")
+            piece = text[:min(PREVIEW_CHARS_PER_RESULT, budget)]
+            buf.write(piece)
+            budget -= len(piece)
+        return buf.getvalue()
+
+    @staticmethod
+    def _parse_verdict(text: str, query: str) -> "VerificationResult":
+        """Map a single-item judge response onto a VerificationResult."""
+        verdict = _parse_verdict_text(text)
+        if not verdict.sufficient and not verdict.reformulated_query:
+            # Retry with the original query unless the judge proposed one
+            return replace(verdict, reformulated_query=query)
+        return verdict
 
+
+@dataclass(frozen=True, slots=True)
 class VerificationResult:
-    __slots__ = ("sufficient", "reason", "reformulated_query")
+    sufficient: bool
+    reason: str = ""
+    reformulated_query: str = ""
+    # Alternative queries from verify_with_reformulations (fan-out mode)
+    reformulations: Tuple[str, ...] = ()
 
-    def __init__(
-        self,
-        sufficient: bool,
-        reason: str = "",
-        reformulated_query: str = "",
-    ):
-        self.sufficient = sufficient
-        self.reason = reason
-        self.reformulated_query = reformulated_query
 
-    def __repr__(self):
-        return f"VerificationResult(sufficient={self.sufficient}, reason='{self.reason}')"
+@lru_cache(maxsize=1024)
+def _parse_verdict_text(text: str) -> VerificationResult:
+    """
+    Query-independent parse of a judge response.
+
+    Memoized: most responses are the bare ``SUFFICIENT`` and results are
+    immutable, so identical outputs share one instance.
+    """
+    if text.startswith("SUFFICIENT"):
+        return VerificationResult(sufficient=True)
+    elif text.startswith("REFORMULATE:"):
+        return VerificationResult(
+            sufficient=False,
+            reason="reformulate",
+            reformulated_query=text[len("REFORMULATE:"):].strip(),
+        )
+    else:
+        reason = text[len("INSUFFICIENT:"):].strip() if text.startswith("INSUFFICIENT:") else text
+        return VerificationResult(sufficient=False, reason=reason)
 
 
 class SelfRAGController:
@@ -137,9 +947,28 @@ class SelfRAGController:
         self,
         verifier: Optional[RetrievalVerifier] = None,
         max_retries: int = 2,
+        speculative: bool = False,
+        fan_out: int = 0,
+        fan_out_timeout: float = 5.0,
     ):
+        """
+        Args:
+            verifier: Retrieval judge (defaults to a gpt-4o-mini verifier).
+            max_retries: Maximum reformulate-and-retry rounds.
+            speculative: While the verifier runs, pre-issue a search for a
+                keyword-only form of the query.  If the verifier's
+                reformulation is close to it, the prefetched results are
+                used and one search round-trip is hidden behind the LLM call.
+            fan_out: If > 0, replace the serial retry loop with a single
+                judge call that proposes this many reformulations, searched
+                concurrently and picked locally without re-verifying.
+            fan_out_timeout: Seconds to wait for the fan-out searches.
+        """
         self.verifier = verifier or RetrievalVerifier()
         self.max_retries = max_retries
+        self.speculative = speculative
+        self.fan_out = fan_out
+        self.fan_out_timeout = fan_out_timeout
 
     def search_with_verification(
         self,
@@ -158,11 +987,36 @@ class SelfRAGController:
         Returns:
             Best search results after verification.
         """
+        if self.fan_out > 0:
+            return self._fan_out_search(query, search_fn, search_kwargs)
+
+        executor = ThreadPoolExecutor(max_workers=1) if self.speculative else None
+
+        try:
+            return self._verification_loop(
+                query, search_fn, search_kwargs, executor,
+            )
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _verification_loop(
+        self,
+        query: str,
+        search_fn: Callable[..., List[DocumentSearchResult]],
+        search_kwargs: dict,
+        executor: Optional[ThreadPoolExecutor],
+    ) -> List[DocumentSearchResult]:
         current_query = query
         best_results: List[DocumentSearchResult] = []
+        prefetched: Optional[Future] = None
 
         for attempt in range(1 + self.max_retries):
-            results = search_fn(query=current_query, **search_kwargs)
+            if prefetched is not None:
+                results = prefetched.result()
+                prefetched = None
+            else:
+                results = search_fn(query=current_query, **search_kwargs)
 
             if not results:
                 logger.info(f"Self-RAG attempt {attempt+1}: no results for '{current_query[:40]}'")
@@ -174,16 +1028,174 @@ class SelfRAGController:
             if not best_results or len(results) > len(best_results):
                 best_results = results
 
+            speculative_query = None
+            speculation: Optional[Future] = None
+            if executor and attempt < self.max_retries:
+                speculative_query = self._keyword_query(current_query)
+                if speculative_query and speculative_query != current_query:
+                    speculation = executor.submit(
+                        search_fn, query=speculative_query, **search_kwargs
+                    )
+
             verdict = self.verifier.verify(current_query, results)
             logger.info(f"Self-RAG attempt {attempt+1}: {verdict}")
 
             if verdict.sufficient:
+                if speculation:
+                    speculation.cancel()
                 return results
 
             if verdict.reformulated_query and verdict.reformulated_query != current_query:
-                current_query = verdict.reformulated_query
+                if speculation and self._similar_queries(
+                    verdict.reformulated_query, speculative_query
+                ):
+                    current_query = speculative_query
+                    prefetched = speculation
+                else:
+                    if speculation:
+                        speculation.cancel()
+                    current_query = verdict.reformulated_query
                 logger.info(f"Self-RAG reformulated: '{current_query[:60]}'")
             else:
+                if speculation:
+                    speculation.cancel()
                 break
 
         return best_results
+
+    def _fan_out_search(
+        self,
+        query: str,
+        search_fn: Callable[..., List[DocumentSearchResult]],
+        search_kwargs: dict,
+    ) -> List[DocumentSearchResult]:
+        """One judge call, then all proposed reformulations searched in parallel."""
+        results = search_fn(query=query, **search_kwargs)
+        if not results:
+            logger.info(f"Self-RAG fan-out: no results for '{query[:40]}'")
+            return results
+
+        verdict = self.verifier.verify_with_reformulations(query, results, n=self.fan_out)
+        logger.info(f"Self-RAG fan-out: {verdict}")
+        if verdict.sufficient or not verdict.reformulations:
+            return results
+
+        candidates: List[List[DocumentSearchResult]] = []
+        executor = ThreadPoolExecutor(max_workers=len(verdict.reformulations))
+        try:
+            futures = [
+                executor.submit(search_fn, query=q, **search_kwargs)
+                for q in verdict.reformulations
+            ]
+            try:
+                for future in as_completed(futures, timeout=self.fan_out_timeout):
+                    try:
+                        candidate = future.result()
+                    except Exception as e:
+                        logger.warning(f"Self-RAG fan-out search failed: {e}")
+                        continue
+                    if candidate:
+                        candidates.append(candidate)
+            except FuturesTimeoutError:
+                logger.warning("Self-RAG fan-out: some searches timed out")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not candidates:
+            return results
+        best = max(candidates, key=self._candidate_score)
+        logger.info(
+            f"Self-RAG fan-out picked 1 of {len(candidates)} reformulated result sets"
+        )
+        return best
+
+    @staticmethod
+    def _candidate_score(results: List[DocumentSearchResult]) -> Tuple[int, float]:
+        """
+        Local ranking of fan-out result sets: distinct chunks first (broader
+        coverage), then mean score of the top three.
+        """
+        distinct = len({(r.chunk.document_id, r.chunk.chunk_index) for r in results})
+        top = [r.score for r in results[:3]]
+        return distinct, sum(top) / len(top)
+
+    @staticmethod
+    def _keyword_query(query: str) -> str:
+        """Cheap local reformulation: the query's content words only."""
+        words = _WORD_RE.findall(query.lower())
+        return " ".join(w for w in words if w not in _QUESTION_STOPWORDS)
+
+    @staticmethod
+    def _similar_queries(a: str, b: str, threshold: float = 0.8) -> bool:
+        """Jaccard overlap of content words; True if not materially different."""
+        words_a = set(_WORD_RE.findall(a.lower())) - _QUESTION_STOPWORDS
+        words_b = set(_WORD_RE.findall(b.lower())) - _QUESTION_STOPWORDS
+        if not words_a or not words_b:
+            return False
+        return len(words_a & words_b) / len(words_a | words_b) >= threshold
+
+    def search_batch_with_verification(
+        self,
+        queries: List[str],
+        search_fn: Callable[..., List[DocumentSearchResult]],
+        max_workers: int = 4,
+        **search_kwargs,
+    ) -> List[List[DocumentSearchResult]]:
+        """
+        Batched variant of ``search_with_verification`` for many queries.
+
+        Each round runs the outstanding searches concurrently, then judges
+        all of them with a single ``verify_batch`` call; insufficient
+        queries with a new reformulation go to the next round.
+
+        Args:
+            queries: User questions.
+            search_fn: The search function to call (accepts query= kwarg).
+            max_workers: Threads used to run searches concurrently.
+            **search_kwargs: Additional arguments passed to search_fn.
+
+        Returns:
+            Best search results per query, in input order.
+        """
+        current = list(queries)
+        best: List[List[DocumentSearchResult]] = [[] for _ in queries]
+        pending = list(range(len(queries)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for attempt in range(1 + self.max_retries):
+                if not pending:
+                    break
+                results = list(executor.map(
+                    lambda i: search_fn(query=current[i], **search_kwargs),
+                    pending,
+                ))
+
+                to_verify = []
+                for i, res in zip(pending, results):
+                    if not res:
+                        continue
+                    if not best[i] or len(res) > len(best[i]):
+                        best[i] = res
+                    to_verify.append((i, res))
+
+                verdicts = self.verifier.verify_batch(
+                    [(current[i], res) for i, res in to_verify]
+                )
+                logger.info(
+                    f"Self-RAG batch attempt {attempt+1}: "
+                    f"{sum(v.sufficient for v in verdicts)}/{len(verdicts)} sufficient"
+                )
+
+                next_pending = []
+                for (i, res), verdict in zip(to_verify, verdicts):
+                    if verdict.sufficient:
+                        best[i] = res
+                    elif (
+                        verdict.reformulated_query
+                        and verdict.reformulated_query != current[i]
+                    ):
+                        current[i] = verdict.reformulated_query
+                        next_pending.append(i)
+                pending = next_pending
+
+        return best
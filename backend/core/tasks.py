@@ -7,17 +7,260 @@ All async operations run through these tasks:
 - Document processing
 """
 
+import itertools
+import json
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from celery.exceptions import MaxRetriesExceededError
+from celery.signals import worker_process_init, worker_ready
 
 from core.celery_config import celery_app
 from core.utils.datetime_utils import get_current_time
 
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# Worker-scoped services
+# ============================================================================
+# Repositories and services are built once per worker process and reused
+# by every task, so tasks don't pay module imports and DB setup on each run.
+# Prefork children prepare in worker_process_init, before they accept work
+# (worker_proc_alive_timeout is raised in celery_config to cover it); pools
+# that don't fork (solo/threads/gevent) prepare on worker_ready.  Only the
+# services used by the queues this worker consumes are built up front; the
+# rest stay lazy.
+
+_services: Dict[str, Any] = {}
+
+
+def _build_context_manager():
+    from core.memory.context_manager import ContextManager
+    return ContextManager()
+
+
+def _build_progress_repo():
+    from core.database.progress_repository import ProgressRepository
+    return ProgressRepository()
+
+
+def _build_doc_manager():
+    from core.documents import DocumentManager
+    return DocumentManager()
+
+
+def _build_doc_repo():
+    from core.documents import DocumentRepository
+    return DocumentRepository()
+
+
+def _build_chunk_repo():
+    from core.documents import ChunkRepository
+    return ChunkRepository()
+
+
+def _build_search_service():
+    from core.vectors import SemanticSearchService
+    # Bulk upserts benefit most from gRPC; falls back to REST without the extra
+    return SemanticSearchService(use_grpc=True)
+
+
+_SERVICE_FACTORIES = {
+    "context_manager": _build_context_manager,
+    "progress_repo": _build_progress_repo,
+    "doc_manager": _build_doc_manager,
+    "doc_repo": _build_doc_repo,
+    "chunk_repo": _build_chunk_repo,
+    "search_service": _build_search_service,
+}
+
+# Services worth building before the first task, per consumed queue
+_QUEUE_SERVICES = {
+    "memory": ("context_manager", "progress_repo"),
+    "documents": ("doc_manager", "doc_repo", "chunk_repo", "search_service"),
+    "default": (),
+}
+
+
+def _service(name: str):
+    """Return the worker's cached service, building it on first use."""
+    svc = _services.get(name)
+    if svc is None:
+        svc = _services[name] = _SERVICE_FACTORIES[name]()
+    return svc
+
+
+def _consumed_queues() -> List[str]:
+    """Names of the queues this worker consumes (``-Q``), else all of them."""
+    try:
+        return list(celery_app.amqp.queues.consume_from)
+    except Exception:
+        return list(_QUEUE_SERVICES)
+
+
+@worker_process_init.connect
+def prepare_worker_process(**kwargs):
+    """Drop state inherited from the parent, then prepare this child."""
+    global _redis_client
+    # Clients must not cross a fork
+    _services.clear()
+    _redis_client = None
+    init_worker_services()
+
+
+@worker_ready.connect
+def warmup_non_forking_worker(sender=None, **kwargs):
+    """Warm services for pools that never fire ``worker_process_init`` (solo/threads)."""
+    pool = getattr(sender, "pool", None)
+    if pool is None or type(pool).__module__.endswith("prefork"):
+        return
+    init_worker_services()
+
+
+def init_worker_services(queues: Optional[List[str]] = None):
+    """
+    Connect the database and build the services the consumed queues use.
+
+    Args:
+        queues: Queue names to prepare for (default: the worker's ``-Q``)
+    """
+    from core.database import init_database
+    init_database()
+    names: List[str] = []
+    for queue in (queues if queues is not None else _consumed_queues()):
+        for name in _QUEUE_SERVICES.get(queue, ()):
+            if name not in names:
+                names.append(name)
+    for name in names:
+        try:
+            _service(name)
+        except Exception as e:
+            # Leave it to be built (and fail loudly) inside the task instead
+            logger.warning(f"Could not pre-build worker service {name}: {e}")
+    if "search_service" in _services:
+        _warmup_worker()
+
+
+def _warmup_worker():
+    """
+    Run one tiny embedding so later tasks don't pay model load.
+
+    Only local models are warmed: a remote provider would bill a request
+    for every (recycled) child.  Skipped when ``ACADEME_SKIP_WARMUP=1``
+    (dev workers, tests).
+    """
+    if os.getenv("ACADEME_SKIP_WARMUP") == "1":
+        return
+    try:
+        from core.vectors.embeddings import REMOTE_PROVIDERS
+        embedding_service = _service("search_service").embedding_service
+        if embedding_service.provider in REMOTE_PROVIDERS:
+            return
+        embedding_service.generate_embedding("warmup")
+        logger.info("Worker warm-up complete")
+    except Exception as e:
+        logger.warning(f"Worker warm-up failed: {e}")
+
+# Per-user memory micro-batching: interactions are queued in Redis and
+# drained by one flush task per window instead of one task each.
+MEMORY_QUEUE_KEY_TPL = "academe:mem_queue:{user_id}"
+MEMORY_FLUSH_LOCK_KEY_TPL = "academe:mem_flush_lock:{user_id}"
+# Items claimed by one flush task; deleted only once they are applied
+MEMORY_PROCESSING_KEY_TPL = "academe:mem_processing:{user_id}:{task_id}"
+MEMORY_PROCESSING_TTL_S = 24 * 3600
+MEMORY_BATCH_MAX = 32
+MEMORY_BATCH_MAX_WAIT_MS = 200
+
+_redis_client = None
+
+# Document indexing: chunks per DB page / texts per embedding request /
+# vectors per Pinecone upsert
+INDEX_FETCH_PAGE_SIZE = 500
+INDEX_EMBED_BATCH_SIZE = 512
+INDEX_UPSERT_BATCH_SIZE = 100
+
+
+def _get_redis():
+    """Lazily create a Redis client for the memory queue."""
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        from core.config import get_settings
+        _redis_client = redis.Redis.from_url(
+            get_settings().redis_url, decode_responses=True
+        )
+    return _redis_client
+
+
+def enqueue_memory_update(
+    user_id: str,
+    conversation_id: str,
+    interaction: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Queue an interaction for the user's next batched memory flush.
+
+    The first interaction in a window takes a short Redis lock and
+    schedules ``flush_user_memory_batch``; later ones in the same window
+    just join the queue.  Falls back to a standalone ``update_memory_task``
+    if the interaction can't be queued, or if scheduling the flush fails
+    and the interaction can be taken back off the queue (otherwise it
+    stays queued for the next flush, so it is never applied twice).
+
+    Returns:
+        Task ID if a task was scheduled, else None (joined a pending flush).
+    """
+    queue_key = MEMORY_QUEUE_KEY_TPL.format(user_id=user_id)
+    item = json.dumps({
+        "conversation_id": conversation_id,
+        "interaction": interaction,
+    }, default=str)
+    try:
+        r = _get_redis()
+        r.rpush(queue_key, item)
+    except Exception as e:
+        logger.warning(f"Memory batch queue unavailable ({e}), using single task")
+        return _update_memory_single(user_id, conversation_id, interaction)
+
+    try:
+        lock_key = MEMORY_FLUSH_LOCK_KEY_TPL.format(user_id=user_id)
+        if not r.set(lock_key, "1", nx=True, px=MEMORY_BATCH_MAX_WAIT_MS):
+            return None
+        result = flush_user_memory_batch.apply_async(
+            args=[user_id], countdown=MEMORY_BATCH_MAX_WAIT_MS / 1000
+        )
+        return result.id
+    except Exception as e:
+        try:
+            # Only fall back if no flush has claimed the item in the meantime
+            reclaimed = r.lrem(queue_key, -1, item)
+        except Exception:
+            reclaimed = 0
+        if not reclaimed:
+            logger.warning(
+                f"Could not schedule memory flush for {user_id} ({e}); "
+                f"interaction left queued for the next flush"
+            )
+            return None
+        logger.warning(f"Could not schedule memory flush ({e}), using single task")
+        return _update_memory_single(user_id, conversation_id, interaction)
+
+
+def _update_memory_single(
+    user_id: str,
+    conversation_id: str,
+    interaction: Dict[str, Any]
+) -> str:
+    """Apply one interaction with its own ``update_memory_task``."""
+    result = update_memory_task.delay(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        interaction=interaction
+    )
+    return result.id
+
 
 @celery_app.task(
     name='academe.update_memory',
@@ -44,12 +287,9 @@ def update_memory_task(
         Result dictionary with status
     """
     try:
-        from core.memory.context_manager import ContextManager
-        
         logger.info(f"Updating memory for user {user_id}")
         
-        # Initialize context manager
-        context_manager = ContextManager()
+        context_manager = _service("context_manager")
         
         # Update context
         success = context_manager.update_context(
@@ -92,6 +332,116 @@ def update_memory_task(
             }
 
 
+@celery_app.task(
+    name='academe.flush_user_memory_batch',
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5
+)
+def flush_user_memory_batch(self, user_id: str) -> Dict[str, Any]:
+    """
+    Drain a user's queued interactions and apply them in one pass.
+
+    Interactions are grouped by conversation so each conversation's
+    memory context is read and written once, with the
+    worker's shared ``ContextManager``.
+
+    Items are moved from the queue into a processing list owned by this
+    task and removed only after they are applied, so a crash or retry
+    (both keep the task ID) resumes from that list instead of losing
+    them.  Groups that fail are kept for the retry; groups that were
+    applied are not, so their progress side effects never run twice.
+
+    Args:
+        self: Task instance (for retry)
+        user_id: User ID
+
+    Returns:
+        Result dictionary with status and counts
+    """
+    queue_key = MEMORY_QUEUE_KEY_TPL.format(user_id=user_id)
+    processing_key = MEMORY_PROCESSING_KEY_TPL.format(
+        user_id=user_id, task_id=self.request.id
+    )
+    r = _get_redis()
+    context_manager = _service("context_manager")
+    applied = 0
+    failed = 0
+
+    while True:
+        # Leftovers from an interrupted or retried run go first
+        raw_items = r.lrange(processing_key, 0, -1)
+        if not raw_items:
+            raw_items = _claim_memory_batch(r, queue_key, processing_key)
+        if not raw_items:
+            break
+
+        by_conversation: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for raw in raw_items:
+            try:
+                item = json.loads(raw)
+                conversation_id, interaction = item["conversation_id"], item["interaction"]
+            except (ValueError, TypeError, KeyError) as e:
+                logger.error(f"Dropping malformed memory item for user {user_id}: {e}")
+                continue
+            by_conversation.setdefault(conversation_id, []).append((raw, interaction))
+
+        retry_items: List[str] = []
+        for conversation_id, entries in by_conversation.items():
+            if context_manager.update_context_batch(
+                user_id, conversation_id, [interaction for _, interaction in entries]
+            ):
+                applied += len(entries)
+            else:
+                retry_items.extend(raw for raw, _ in entries)
+
+        pipe = r.pipeline()
+        pipe.delete(processing_key)
+        if retry_items:
+            pipe.rpush(processing_key, *retry_items)
+            pipe.expire(processing_key, MEMORY_PROCESSING_TTL_S)
+        pipe.execute()
+
+        if retry_items:
+            failed = len(retry_items)
+            break
+
+    if failed:
+        logger.error(f"Memory batch for user {user_id}: {failed} interactions kept for retry")
+        try:
+            raise self.retry(countdown=2 ** self.request.retries)
+        except MaxRetriesExceededError:
+            logger.error(
+                f"Memory batch permanently failed for user {user_id} "
+                f"after {self.max_retries} retries"
+            )
+            r.delete(processing_key)
+            return {
+                "status": "permanently_failed",
+                "user_id": user_id,
+                "applied": applied,
+                "failed": failed,
+            }
+
+    logger.info(f"Memory batch applied for user {user_id}: {applied} interactions")
+    return {
+        "status": "success",
+        "user_id": user_id,
+        "applied": applied,
+        "timestamp": get_current_time().isoformat()
+    }
+
+
+def _claim_memory_batch(r, queue_key: str, processing_key: str) -> List[str]:
+    """Atomically move up to ``MEMORY_BATCH_MAX`` queued items into ``processing_key``."""
+    pipe = r.pipeline()
+    for _ in range(MEMORY_BATCH_MAX):
+        pipe.lmove(queue_key, processing_key, "LEFT", "RIGHT")
+    pipe.expire(processing_key, MEMORY_PROCESSING_TTL_S)
+    *moved, _ = pipe.execute()
+    return [raw for raw in moved if raw is not None]
+
+
 @celery_app.task(
     name='academe.update_progress',
     bind=True,
@@ -118,11 +468,9 @@ def update_progress_task(
         Result dictionary
     """
     try:
-        from core.database.progress_repository import ProgressRepository
-        
         logger.info(f"Updating progress for user {user_id}, concept {concept}")
         
-        progress_repo = ProgressRepository()
+        progress_repo = _service("progress_repo")
         
         # Get or create progress
         progress = progress_repo.get_concept_progress(user_id, concept)
@@ -205,11 +553,9 @@ def process_document_task(
         Processing result
     """
     try:
-        from core.documents import DocumentManager
-        
         logger.info(f"Processing document {document_id} for user {user_id}")
         
-        doc_manager = DocumentManager()
+        doc_manager = _service("doc_manager")
         
         # Process document (parse, chunk, embed)
         result = doc_manager.process_document(
@@ -236,10 +582,8 @@ def process_document_task(
                 f"Document processing permanently failed for {document_id}: {exc}"
             )
             try:
-                from core.documents import DocumentRepository
                 from core.models.document import DocumentStatus
-                doc_repo = DocumentRepository()
-                doc_repo.update_document(document_id, {
+                _service("doc_repo").update_document(document_id, {
                     "processing_status": DocumentStatus.FAILED.value,
                     "processing_error": f"Processing failed after {self.max_retries} retries: {str(exc)[:500]}",
                 })
@@ -274,37 +618,47 @@ def index_document_task(
         Indexing result
     """
     try:
-        # Initialize database connection for this worker
-        from core.database import init_database
-        init_database()
-        
-        from core.documents import DocumentRepository, ChunkRepository
-        from core.vectors import SemanticSearchService
-        
         logger.info(f"Indexing document {document_id} for user {user_id}")
         
         # Get document and chunks
-        doc_repo = DocumentRepository()
-        chunk_repo = ChunkRepository()
+        doc_repo = _service("doc_repo")
+        chunk_repo = _service("chunk_repo")
         
         document = doc_repo.get_document(document_id)
         if not document:
             raise ValueError(f"Document {document_id} not found")
         
-        chunks = chunk_repo.get_document_chunks(document_id)
-        if not chunks:
+        # Stream chunks page by page instead of loading the whole document
+        pages = chunk_repo.iter_document_chunks(
+            document_id, page_size=INDEX_FETCH_PAGE_SIZE
+        )
+        first_page = next(pages, None)
+        if not first_page:
             raise ValueError(f"No chunks found for document {document_id}")
         
+        chunk_total = 0
+        
+        def counted_pages():
+            nonlocal chunk_total
+            for page in itertools.chain([first_page], pages):
+                chunk_total += len(page)
+                yield page
+        
         # Index in vector database
-        search_service = SemanticSearchService()
-        success, message = search_service.index_document(document, chunks)
+        search_service = _service("search_service")
+        success, message = search_service.index_document_pages(
+            document,
+            counted_pages(),
+            embed_batch_size=INDEX_EMBED_BATCH_SIZE,
+            upsert_batch_size=INDEX_UPSERT_BATCH_SIZE,
+        )
         
         if success:
-            logger.info(f"Document {document_id} indexed successfully: {len(chunks)} chunks")
+            logger.info(f"Document {document_id} indexed successfully: {chunk_total} chunks")
             return {
                 "status": "success",
                 "document_id": document_id,
-                "chunks_indexed": len(chunks),
+                "chunks_indexed": chunk_total,
                 "message": message
             }
         else:
@@ -315,11 +669,7 @@ def index_document_task(
         
         # Update document with error info on every attempt
         try:
-            from core.database import init_database
-            from core.documents import DocumentRepository
-            init_database()
-            doc_repo = DocumentRepository()
-            doc_repo.update_document(document_id, {
+            _service("doc_repo").update_document(document_id, {
                 "processing_error": f"Indexing failed: {str(exc)[:500]}"
             })
         except Exception:
@@ -335,7 +685,7 @@ def index_document_task(
             )
             try:
                 from core.models.document import DocumentStatus
-                doc_repo.update_document(document_id, {
+                _service("doc_repo").update_document(document_id, {
                     "processing_status": DocumentStatus.FAILED.value,
                     "processing_error": f"Permanently failed after {self.max_retries} retries: {str(exc)[:500]}",
                 })
@@ -361,11 +711,9 @@ def delete_document_task(
     from the UI immediately.
     """
     try:
-        from core.documents import DocumentManager
-
         logger.info(f"Cleaning up document {document_id} for user {user_id}")
 
-        doc_manager = DocumentManager()
+        doc_manager = _service("doc_manager")
         success, message = doc_manager.cleanup_document_data(
             document_id=document_id,
             user_id=user_id,
@@ -400,6 +748,8 @@ def delete_document_task(
 # Export tasks
 __all__ = [
     'update_memory_task',
+    'enqueue_memory_update',
+    'flush_user_memory_batch',
     'update_progress_task',
     'process_document_task',
     'index_document_task',
@@ -31,17 +31,17 @@ def queue_memory_update(
     try:
         if async_mode:
             # Import here to avoid circular dependency
-            from core.tasks import update_memory_task
+            from core.tasks import enqueue_memory_update
             
-            # Queue task asynchronously
-            result = update_memory_task.delay(
+            # Queue into the user's batched memory flush
+            task_id = enqueue_memory_update(
                 user_id=user_id,
                 conversation_id=conversation_id,
                 interaction=interaction
             )
             
-            logger.info(f"Queued memory update task: {result.id}")
-            return result.id
+            logger.info(f"Queued memory update (flush task: {task_id or 'pending'})")
+            return task_id
         else:
             # Run synchronously (for testing/development)
             from core.memory.context_manager import ContextManager
@@ -1,8 +1,17 @@
 """Hybrid search combining BM25 and vector similarity for Academe."""
 
+import functools
+import hashlib
 import logging
+import os
 import re
-from typing import List, Optional, Dict, Any, Tuple
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Tuple
+
+import numpy as np
 
 from core.vectors.search import SemanticSearchService
 from core.models.document import DocumentSearchResult, DocumentChunk, Document
@@ -10,19 +19,153 @@ from core.documents.storage import ChunkRepository, DocumentRepository
 
 logger = logging.getLogger(__name__)
 
-try:
-    from rank_bm25 import BM25Okapi
-    BM25_AVAILABLE = True
-except ImportError:
-    BM25_AVAILABLE = False
-    BM25Okapi = None
+# Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Bump when the on-disk BM25 layout or scoring changes
+BM25_INDEX_FORMAT = 1
+
+# \w+ already matches maximal word runs; \b...\b only added boundary checks
+_TOKEN_RE = re.compile(r"\w+")
+
+
+# ASCII fast path: lowercase word bytes ([A-Za-z0-9_], what \w matches in
+# ASCII) and map every other byte to a space, so bytes.split() yields the
+# same tokens as the regex
+_ASCII_WORD_TABLE = bytes(
+    ord(chr(c).lower()) if chr(c).isalnum() or chr(c) == "_" else ord(" ")
+    for c in range(256)
+)
 
 
 def _tokenize(text: str) -> List[str]:
     """Simple tokenizer for BM25 - lowercase, split on non-alphanumeric."""
-    text = text.lower().strip()
-    tokens = re.findall(r"\b\w+\b", text)
-    return tokens if tokens else [""]  # BM25Okapi needs non-empty
+    if text.isascii():
+        tokens = text.encode("ascii").translate(_ASCII_WORD_TABLE).decode("ascii").split()
+    else:
+        tokens = _TOKEN_RE.findall(text.lower())
+    return tokens or [""]  # Callers treat [""] as "no tokens"
+
+
+@functools.lru_cache(maxsize=4096)
+def _tokenize_query(query: str) -> Tuple[str, ...]:
+    """Memoized query tokenization; a tuple so cached results can't be mutated."""
+    return tuple(_tokenize(query))
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a tokenized corpus, scored with NumPy.
+
+    Term frequencies are stored column-major (one postings slice of
+    document indices and counts per term), so a query only touches the
+    documents containing its terms and each term is one vectorized update
+    instead of a Python loop over every document.
+    """
+
+    # Numeric arrays persisted (and memory-mapped) by save/load
+    _ARRAYS = ("indices", "data", "indptr", "idf", "doc_len", "len_norm")
+
+    def __init__(
+        self,
+        corpus: List[List[str]],
+        vec_ids: List[str],
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ):
+        self.vec_ids = vec_ids
+        self.positions = {vec_id: i for i, vec_id in enumerate(vec_ids)}
+        self.k1 = k1
+        self.b = b
+
+        self.vocab: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        tfs: List[int] = []
+        for doc_idx, tokens in enumerate(corpus):
+            for token, tf in Counter(tokens).items():
+                rows.append(doc_idx)
+                cols.append(self.vocab.setdefault(token, len(self.vocab)))
+                tfs.append(tf)
+
+        cols_arr = np.asarray(cols, dtype=np.int64)
+        order = np.argsort(cols_arr, kind="stable")
+        self.indices = np.asarray(rows, dtype=np.int64)[order]
+        self.data = np.asarray(tfs, dtype=np.float32)[order]
+        df = np.bincount(cols_arr, minlength=len(self.vocab))
+        self.indptr = np.concatenate(([0], np.cumsum(df)))
+
+        n_docs = len(corpus)
+        self.doc_len = np.asarray([len(tokens) for tokens in corpus], dtype=np.float32)
+        self.avgdl = float(self.doc_len.mean()) if n_docs else 0.0
+        # Length normalization depends only on the corpus, so compute it
+        # once here rather than for every document on every query
+        self.len_norm = (
+            k1 * (1 - b + b * self.doc_len / self.avgdl) if n_docs else self.doc_len
+        ).astype(np.float32)
+        # Lucene-style IDF: always positive, unlike the raw Okapi form
+        self.idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.vec_ids)
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory of ``.npy`` files.
+
+        Written to a temporary sibling and renamed into place, so concurrent
+        workers never see a partial index.
+        """
+        parent = os.path.dirname(path) or "."
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent, prefix=".bm25-")
+        try:
+            for name in self._ARRAYS:
+                np.save(os.path.join(tmp, f"{name}.npy"), getattr(self, name))
+            np.save(os.path.join(tmp, "terms.npy"), np.asarray(list(self.vocab), dtype=str))
+            np.save(os.path.join(tmp, "vec_ids.npy"), np.asarray(self.vec_ids, dtype=str))
+            np.save(
+                os.path.join(tmp, "params.npy"),
+                np.asarray([self.k1, self.b, self.avgdl], dtype=np.float64),
+            )
+            os.replace(tmp, path)
+        except OSError:
+            # Another worker saved the same index first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """
+        Load an index written by ``save``.
+
+        Numeric arrays are memory-mapped read-only, so worker processes
+        loading the same index share its pages.
+        """
+        index = cls.__new__(cls)
+        for name in cls._ARRAYS:
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        terms = np.load(os.path.join(path, "terms.npy")).tolist()
+        index.vocab = {term: col for col, term in enumerate(terms)}
+        index.vec_ids = np.load(os.path.join(path, "vec_ids.npy")).tolist()
+        index.positions = {vec_id: i for i, vec_id in enumerate(index.vec_ids)}
+        index.k1, index.b, index.avgdl = np.load(os.path.join(path, "params.npy")).tolist()
+        return index
+
+    def get_scores(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """BM25 score of every document for the query, shape (n_docs,)."""
+        scores = np.zeros(len(self.vec_ids), dtype=np.float32)
+        for token in query_tokens:
+            col = self.vocab.get(token)
+            if col is None:
+                continue
+            start, end = self.indptr[col], self.indptr[col + 1]
+            docs = self.indices[start:end]
+            tf = self.data[start:end]
+            scores[docs] += self.idf[col] * tf * (self.k1 + 1) / (tf + self.len_norm[docs])
+        return scores
 
 
 class HybridSearchService:
@@ -41,6 +184,7 @@ class HybridSearchService:
         doc_repo: Optional[DocumentRepository] = None,
         weight_bm25: float = 0.1,
         weight_vector: float = 0.9,
+        bm25_cache_dir: Optional[str] = None,
     ):
         self.vector_search = vector_search or SemanticSearchService()
         self.chunk_repo = chunk_repo or ChunkRepository()
@@ -48,8 +192,17 @@ class HybridSearchService:
         self.weight_bm25 = weight_bm25
         self.weight_vector = weight_vector
 
-        # In-memory BM25 index cache: user_id -> (BM25Okapi, vec_id_list)
-        self._bm25_cache: Dict[str, tuple] = {}
+        # In-memory BM25 index cache: user_id -> BM25Index
+        self._bm25_cache: Dict[str, BM25Index] = {}
+
+        # Optional on-disk copy shared by worker processes and restarts
+        if bm25_cache_dir is None:
+            try:
+                from core.config.settings import get_settings
+                bm25_cache_dir = get_settings().bm25_cache_dir
+            except Exception:
+                bm25_cache_dir = None
+        self.bm25_cache_dir = bm25_cache_dir
 
     def index_document(
         self,
@@ -67,52 +220,102 @@ class HybridSearchService:
         if user_id in self._bm25_cache:
             del self._bm25_cache[user_id]
             logger.info(f"Invalidated BM25 index for user {user_id}")
+        if self.bm25_cache_dir and os.path.isdir(self.bm25_cache_dir):
+            # Stale on-disk indexes can never match again (the corpus
+            # signature changed); processes that mapped them keep their copy
+            prefix = f"bm25_{self._safe_user_id(user_id)}_"
+            for name in os.listdir(self.bm25_cache_dir):
+                if name.startswith(prefix):
+                    shutil.rmtree(os.path.join(self.bm25_cache_dir, name), ignore_errors=True)
+
+    @staticmethod
+    def _safe_user_id(user_id: str) -> str:
+        return re.sub(r"\W", "_", user_id)
+
+    def _bm25_index_path(self, user_id: str, keys: Iterable[Tuple[str, str, int]]) -> str:
+        """On-disk location of a user's index, keyed by a signature of the corpus."""
+        sig = hashlib.blake2b(digest_size=16)
+        sig.update(f"{BM25_INDEX_FORMAT}:{BM25_K1}:{BM25_B}".encode())
+        for chunk_id, document_id, chunk_index in keys:
+            sig.update(f"\0{chunk_id}:{document_id}:{chunk_index}".encode())
+        return os.path.join(
+            self.bm25_cache_dir,
+            f"bm25_{self._safe_user_id(user_id)}_{sig.hexdigest()}",
+        )
 
-    def _build_bm25_index(self, user_id: str) -> Optional[tuple]:
-        """Build BM25 index for user's chunks. Returns (bm25, vec_ids) or None."""
-        if not BM25_AVAILABLE:
-            return None
+    def _build_bm25_index(self, user_id: str) -> Optional[BM25Index]:
+        """Build BM25 index for user's chunks, or None if there is nothing to index."""
+        if self.bm25_cache_dir:
+            # The signature only needs chunk keys; content is fetched on a miss
+            keys = self.chunk_repo.get_user_chunk_keys(user_id)
+            if not keys:
+                logger.debug(f"No chunks for user {user_id}, skipping BM25")
+                return None
+            path = self._bm25_index_path(user_id, keys)
+            if os.path.isdir(path):
+                try:
+                    index = BM25Index.load(path)
+                    self._bm25_cache[user_id] = index
+                    logger.info(f"Loaded BM25 index for user {user_id}: {len(index)} chunks")
+                    return index
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable BM25 index at {path}: {e}")
 
         chunks = self.chunk_repo.get_user_chunks(user_id)
         if not chunks:
             logger.debug(f"No chunks for user {user_id}, skipping BM25")
             return None
 
-        corpus = [_tokenize(c.content) for c in chunks]
-        vec_ids = [f"{c.document_id}_{c.chunk_index}" for c in chunks]
-
-        # Filter empty token lists (BM25Okapi fails on empty)
-        valid_indices = [i for i, t in enumerate(corpus) if t and t != [""]]
-        if not valid_indices:
+        # One pass: tokenize, drop chunks without tokens, and build vec_ids.
+        # Kept on this thread: re and str.lower hold the GIL, so a thread
+        # pool would only add scheduling overhead
+        corpus: List[List[str]] = []
+        vec_ids: List[str] = []
+        for c in chunks:
+            tokens = _tokenize(c.content)
+            if tokens != [""]:
+                corpus.append(tokens)
+                vec_ids.append(f"{c.document_id}_{c.chunk_index}")
+        if not corpus:
             return None
 
-        corpus = [corpus[i] for i in valid_indices]
-        vec_ids = [vec_ids[i] for i in valid_indices]
-
-        bm25 = BM25Okapi(corpus)
-        self._bm25_cache[user_id] = (bm25, vec_ids)
+        index = BM25Index(corpus, vec_ids)
+        self._bm25_cache[user_id] = index
+        if self.bm25_cache_dir:
+            # Keyed by the chunks actually indexed, in case they changed since the lookup
+            path = self._bm25_index_path(
+                user_id, ((c.id, c.document_id, c.chunk_index) for c in chunks)
+            )
+            try:
+                index.save(path)
+            except OSError as e:
+                logger.warning(f"Could not persist BM25 index to {path}: {e}")
         logger.info(f"Built BM25 index for user {user_id}: {len(vec_ids)} chunks")
-        return (bm25, vec_ids)
+        return index
 
     def _get_bm25_scores(
         self,
         user_id: str,
         query: str,
-    ) -> Dict[str, float]:
-        """Get BM25 scores for query. Keys are vec_ids."""
-        cached = self._bm25_cache.get(user_id)
-        if cached is None:
-            cached = self._build_bm25_index(user_id)
-        if cached is None:
-            return {}
-
-        bm25, vec_ids = cached
-        query_tokens = _tokenize(query)
-        if not query_tokens or query_tokens == [""]:
-            return {}
-
-        scores = bm25.get_scores(query_tokens)
-        return {vec_ids[i]: float(scores[i]) for i in range(len(vec_ids))}
+    ) -> Optional[Tuple[np.ndarray, Dict[str, int]]]:
+        """
+        Get BM25 scores for query.
+
+        Returns:
+            (scores aligned with the index's vec_ids, vec_id -> position),
+            or None if there is no index or the query has no tokens
+        """
+        index = self._bm25_cache.get(user_id)
+        if index is None:
+            index = self._build_bm25_index(user_id)
+        if index is None:
+            return None
+
+        query_tokens = _tokenize_query(query)
+        if query_tokens == ("",):
+            return None
+
+        return index.get_scores(query_tokens), index.positions
 
     def hybrid_search(
         self,
@@ -139,47 +342,68 @@ class HybridSearchService:
         Returns:
             Fused and re-ranked search results
         """
-        # 1. Vector search (retrieve more for fusion)
-        vector_results = self.vector_search.search(
-            query=query,
-            user_id=user_id,
-            top_k=top_k * retrieval_multiplier,
-            filter_document_id=filter_document_id,
-            filter_has_code=filter_has_code,
-            filter_has_equations=filter_has_equations,
-            score_threshold=score_threshold,
-        )
+        # 1-2. BM25 scores (building the index on first use) are computed on
+        # a worker thread while the vector search waits on Pinecone
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bm25_future = executor.submit(self._get_bm25_scores, user_id, query)
+
+            # 1. Vector search (retrieve more for fusion)
+            vector_results = self.vector_search.search(
+                query=query,
+                user_id=user_id,
+                top_k=top_k * retrieval_multiplier,
+                filter_document_id=filter_document_id,
+                filter_has_code=filter_has_code,
+                filter_has_equations=filter_has_equations,
+                score_threshold=score_threshold,
+            )
+
+            # 2. BM25 scores (if available)
+            bm25 = bm25_future.result()
 
         if not vector_results:
             return []
 
-        # 2. BM25 scores (if available)
-        bm25_scores = self._get_bm25_scores(user_id, query)
-
-        if not bm25_scores:
+        if bm25 is None:
             # Fallback: vector-only, return top_k
             return vector_results[:top_k]
+        bm25_scores, positions = bm25
+
+        # 3. Normalize and fuse as arrays: one gather aligns BM25 scores
+        # with the vector results instead of a dict lookup per result
+        n = len(vector_results)
+        vec_scores = np.fromiter((r.score for r in vector_results), dtype=np.float64, count=n)
+        idxs = np.fromiter(
+            (
+                positions.get(f"{r.chunk.document_id}_{r.chunk.chunk_index}", -1)
+                for r in vector_results
+            ),
+            dtype=np.int64,
+            count=n,
+        )
+        max_vec = float(vec_scores.max()) or 1.0
+        max_bm25 = float(bm25_scores.max()) or 1.0
+        bm25_aligned = np.where(idxs >= 0, bm25_scores[np.maximum(idxs, 0)], 0.0)
+        fused = (
+            self.weight_vector * vec_scores / max_vec
+            + self.weight_bm25 * bm25_aligned / max_bm25
+        )
 
-        # 3. Normalize scores for fusion
-        max_vec = max(r.score for r in vector_results) or 1.0
-        max_bm25 = max(bm25_scores.values()) or 1.0
-
-        for result in vector_results:
-            vec_id = f"{result.chunk.document_id}_{result.chunk.chunk_index}"
-            vec_norm = result.score / max_vec
-            bm25_norm = bm25_scores.get(vec_id, 0) / max_bm25
-            result.score = (
-                self.weight_vector * vec_norm + self.weight_bm25 * bm25_norm
-            )
-
-        # 4. Re-sort by fused score
-        vector_results.sort(key=lambda r: r.score, reverse=True)
-
-        # 5. Update ranks
-        for i, result in enumerate(vector_results[:top_k]):
-            result.rank = i + 1
-
-        return vector_results[:top_k]
+        # 4. Select the top_k by fused score (ties keep vector order)
+        candidates = np.arange(n)
+        if n > top_k:
+            candidates = np.argpartition(-fused, top_k - 1)[:top_k]
+        order = candidates[np.lexsort((candidates, -fused[candidates]))]
+
+        # 5. Update scores and ranks of the returned results
+        fused_results = []
+        for rank, i in enumerate(order.tolist(), start=1):
+            result = vector_results[i]
+            result.score = float(fused[i])
+            result.rank = rank
+            fused_results.append(result)
+
+        return fused_results
 
     def hybrid_search_with_reranking(
         self,
@@ -18,8 +18,19 @@ except (ImportError, Exception) as e:
         pass
     GRPCIndex = Index
 
+try:
+    # Needs the grpc extra: pip install "pinecone-client[grpc]"
+    from pinecone.grpc import PineconeGRPC
+    PINECONE_GRPC_AVAILABLE = True
+except Exception:
+    PINECONE_GRPC_AVAILABLE = False
+    PineconeGRPC = None
+
 logger = logging.getLogger(__name__)
 
+# Worker threads (and pooled keep-alive connections) for Pinecone data-plane calls
+PINECONE_POOL_THREADS = 32
+
 
 class PineconeClient:
     """Client for interacting with Pinecone vector database."""
@@ -30,7 +41,8 @@ class PineconeClient:
         environment: Optional[str] = None,
         index_name: str = "academe",
         dimension: int = 768,
-        metric: str = "cosine"
+        metric: str = "cosine",
+        use_grpc: bool = False
     ):
         """
         Initialize Pinecone client.
@@ -41,6 +53,8 @@ class PineconeClient:
             index_name: Name of the Pinecone index
             dimension: Vector dimension
             metric: Distance metric (cosine, euclidean, dotproduct)
+            use_grpc: Use the gRPC data plane (protobuf vectors, concurrent
+                upsert batches) when the grpc extra is installed
         """
         self.api_key = api_key
         self.environment = environment
@@ -48,6 +62,9 @@ class PineconeClient:
         self.dimension = dimension
         self.metric = metric
         self.index = None
+        self.use_grpc = use_grpc and PINECONE_GRPC_AVAILABLE
+        if use_grpc and not PINECONE_GRPC_AVAILABLE:
+            logger.warning("Pinecone gRPC extra not installed, using REST client")
 
         # Initialize Pinecone
         self._init_pinecone()
@@ -81,7 +98,10 @@ class PineconeClient:
             # Initialize Pinecone (new API - version 3.0+)
             from pinecone import Pinecone, ServerlessSpec
             
-            pc = Pinecone(api_key=self.api_key)
+            if self.use_grpc:
+                pc = PineconeGRPC(api_key=self.api_key)
+            else:
+                pc = Pinecone(api_key=self.api_key, pool_threads=PINECONE_POOL_THREADS)
             
             # List existing indexes
             existing_indexes = [idx['name'] for idx in pc.list_indexes()]
@@ -102,7 +122,10 @@ class PineconeClient:
             self.index = pc.Index(self.index_name)
             self.mock_mode = False
 
-            logger.info(f"Connected to Pinecone index: {self.index_name}")
+            logger.info(
+                f"Connected to Pinecone index: {self.index_name}"
+                f"{' (gRPC)' if self.use_grpc else ''}"
+            )
 
         except Exception as e:
             logger.error(f"Failed to initialize Pinecone: {e}")
@@ -130,6 +153,9 @@ class PineconeClient:
             return self._mock_upsert(vectors, namespace)
 
         try:
+            if self.use_grpc:
+                return self._grpc_upsert(vectors, namespace, batch_size)
+
             total_upserted = 0
 
             # Process in batches
@@ -152,8 +178,7 @@ class PineconeClient:
                     namespace=namespace
                 )
 
-                # Handle both snake_case and camelCase response formats
-                count = response.get("upserted_count") or response.get("upsertedCount", 0)
+                count = self._upserted_count(response)
                 total_upserted += count
                 if count == 0 and len(batch) > 0:
                     logger.warning(f"Pinecone upsert batch returned 0 upserted: {response}")
@@ -166,6 +191,32 @@ class PineconeClient:
             logger.error(f"Failed to upsert vectors: {e}", exc_info=True)
             return {"upserted_count": 0, "error": str(e)}
 
+    def _grpc_upsert(
+        self,
+        vectors: List[Tuple[str, List[float], Dict[str, Any]]],
+        namespace: Optional[str],
+        batch_size: int
+    ) -> Dict[str, int]:
+        """Send every batch as a concurrent gRPC request, then collect the results."""
+        futures = [
+            self.index.upsert(
+                vectors=vectors[i:i + batch_size],
+                namespace=namespace,
+                async_req=True
+            )
+            for i in range(0, len(vectors), batch_size)
+        ]
+        total_upserted = sum(self._upserted_count(f.result()) for f in futures)
+        logger.info(f"Upserted {total_upserted} vectors to namespace {namespace} (gRPC)")
+        return {"upserted_count": total_upserted}
+
+    @staticmethod
+    def _upserted_count(response: Any) -> int:
+        """Read the upsert count from REST dicts (either casing) or gRPC response objects."""
+        if isinstance(response, dict):
+            return response.get("upserted_count") or response.get("upsertedCount", 0)
+        return getattr(response, "upserted_count", 0) or 0
+
     def query(
         self,
         query_vector: List[float],
@@ -402,7 +453,8 @@ class PineconeManager:
         document_id: str,
         user_id: str,
         chunks: List[Dict[str, Any]],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        batch_size: int = 100
     ) -> bool:
         """
         Index document chunks with embeddings.
@@ -412,6 +464,7 @@ class PineconeManager:
             user_id: User ID
             chunks: List of chunk dictionaries
             embeddings: List of embedding vectors
+            batch_size: Vectors per upsert request
 
         Returns:
             True if successful
@@ -442,11 +495,16 @@ class PineconeManager:
                 metadata["page_number"] = chunk.get("page_number")
             if chunk.get("section_title") is not None:
                 metadata["section_title"] = chunk.get("section_title")
+            for key in ("char_count", "word_count"):
+                if chunk.get(key) is not None:
+                    metadata[key] = chunk[key]
 
             vectors.append((vec_id, embedding, metadata))
 
         # Upsert to Pinecone
-        result = self.client.upsert_vectors(vectors, namespace=namespace)
+        result = self.client.upsert_vectors(
+            vectors, namespace=namespace, batch_size=batch_size
+        )
         upserted = result.get("upserted_count", 0)
         if "error" in result:
             logger.error(f"Pinecone upsert error: {result['error']}")
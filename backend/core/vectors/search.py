@@ -1,7 +1,9 @@
 """Semantic search service for Academe."""
 
+import heapq
 import logging
-from typing import List, Dict, Optional, Any, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Any, Tuple
 
 from core.vectors.embeddings import EmbeddingService, create_embedding_service
 from core.vectors.pinecone_client import PineconeClient, PineconeManager
@@ -10,6 +12,18 @@ from core.documents.storage import ChunkRepository, DocumentRepository
 
 logger = logging.getLogger(__name__)
 
+# Cross-encoder pairs scored per forward pass; covers typical 40-100 candidate
+# rerank sets in one or two batches
+DEFAULT_RERANKER_BATCH_SIZE = 64
+
+RERANKER_MODEL = "BAAI/bge-reranker-base"
+RERANKER_MAX_LENGTH = 512
+
+# Passages are truncated to the token window by the reranker's tokenizer;
+# this character cap (~4 chars/token) only bounds tokenizer work on very
+# long chunks without cutting into the window
+RERANKER_MAX_PASSAGE_CHARS = 4 * RERANKER_MAX_LENGTH
+
 try:
     from sentence_transformers import CrossEncoder
     CROSS_ENCODER_AVAILABLE = True
@@ -24,7 +38,11 @@ class SemanticSearchService:
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        pinecone_client: Optional[PineconeClient] = None
+        pinecone_client: Optional[PineconeClient] = None,
+        use_grpc: bool = False,
+        reranker_batch_size: int = DEFAULT_RERANKER_BATCH_SIZE,
+        reranker_backend: Optional[str] = None,
+        reranker_amp: Optional[bool] = None,
     ):
         """
         Initialize semantic search service.
@@ -32,26 +50,103 @@ class SemanticSearchService:
         Args:
             embedding_service: Service for generating embeddings
             pinecone_client: Client for vector database
+            use_grpc: Build the default Pinecone client on the gRPC data plane
+            reranker_batch_size: Query/passage pairs per cross-encoder batch
+            reranker_backend: Cross-encoder runtime (torch, onnx, openvino);
+                              defaults to the RERANKER_BACKEND setting
+            reranker_amp: Run the PyTorch cross-encoder under bf16/fp16 autocast
+                          where the hardware supports it; defaults to the
+                          RERANKER_AMP setting
         """
         self.embedding_service = embedding_service or create_embedding_service()
         # Use embedding dim so Pinecone index matches embedding model
         dim = self.embedding_service.embedding_dim
-        self.pinecone_client = pinecone_client or PineconeClient(dimension=dim)
+        self.pinecone_client = pinecone_client or PineconeClient(
+            dimension=dim, use_grpc=use_grpc
+        )
         self.pinecone_manager = PineconeManager(self.pinecone_client)
         self.chunk_repo = ChunkRepository()
         self.doc_repo = DocumentRepository()
 
         # Cross-encoder for reranking (optional)
+        self.reranker_batch_size = reranker_batch_size
         self._reranker = None
+        self._reranker_autocast = None
         if CROSS_ENCODER_AVAILABLE:
+            self._reranker = self._load_reranker(reranker_backend)
+            if reranker_amp is None:
+                try:
+                    from core.config.settings import get_settings
+                    reranker_amp = get_settings().reranker_amp
+                except Exception:
+                    reranker_amp = False
+            if self._reranker is not None and reranker_amp:
+                self._reranker_autocast = self._autocast_dtype(self._reranker)
+
+    @staticmethod
+    def _load_reranker(backend: Optional[str] = None) -> Optional["CrossEncoder"]:
+        """
+        Load the cross-encoder on the configured backend.
+
+        ONNX Runtime / OpenVINO give fused (optionally int8) CPU kernels;
+        if the backend cannot be loaded, fall back to PyTorch.
+        """
+        onnx_file = None
+        if backend is None:
             try:
-                self._reranker = CrossEncoder(
-                    "BAAI/bge-reranker-base",
-                    max_length=512,
-                )
-                logger.info("Cross-encoder reranker loaded (BAAI/bge-reranker-base)")
+                from core.config.settings import get_settings
+                settings = get_settings()
+                backend = settings.reranker_backend
+                onnx_file = settings.reranker_onnx_file
+            except Exception:
+                backend = "torch"
+
+        if backend != "torch":
+            kwargs = {"backend": backend}
+            if onnx_file:
+                kwargs["model_kwargs"] = {"file_name": onnx_file}
+            try:
+                reranker = CrossEncoder(RERANKER_MODEL, max_length=RERANKER_MAX_LENGTH, **kwargs)
+                logger.info(f"Cross-encoder reranker loaded ({RERANKER_MODEL}, {backend})")
+                return reranker
             except Exception as e:
-                logger.warning(f"Reranker not available: {e}")
+                logger.warning(f"Reranker {backend} backend unavailable: {e}, using torch")
+
+        try:
+            reranker = CrossEncoder(RERANKER_MODEL, max_length=RERANKER_MAX_LENGTH)
+            logger.info(f"Cross-encoder reranker loaded ({RERANKER_MODEL})")
+            return reranker
+        except Exception as e:
+            logger.warning(f"Reranker not available: {e}")
+            return None
+
+    @staticmethod
+    def _autocast_dtype(reranker: "CrossEncoder") -> Optional[Tuple[str, Any]]:
+        """
+        Pick a reduced-precision autocast for the cross-encoder, if worthwhile.
+
+        fp16 on CUDA, bf16 on CPUs with native AVX-512 BF16; scores match FP32
+        to within rerank-order noise. Returns None for ONNX/OpenVINO models and
+        for CPUs that would only emulate bf16 (slower than FP32).
+        """
+        try:
+            import torch
+
+            model = reranker.model
+            if not isinstance(model, torch.nn.Module):
+                return None
+            device = next(model.parameters()).device.type
+            if device == "cuda":
+                amp = (device, torch.float16)
+            elif device == "cpu" and getattr(torch.cpu, "_is_avx512_bf16_supported", lambda: False)():
+                amp = (device, torch.bfloat16)
+            else:
+                return None
+            logger.info(f"Reranker autocast enabled ({amp[0]}, {amp[1]})")
+            return amp
+        except Exception as e:
+            logger.warning(f"Reranker autocast unavailable: {e}")
+            return None
 
     @staticmethod
     def _enrich_text_for_embedding(
@@ -74,10 +169,58 @@ class SemanticSearchService:
             return " | ".join(parts) + "\n" + content
         return content
 
+    @staticmethod
+    def _chunk_metadata(chunk: DocumentChunk) -> Dict[str, Any]:
+        """Build Pinecone metadata for a chunk, dropping None values (Pinecone rejects null)."""
+        metadata = {
+            "chunk_index": chunk.chunk_index,
+            "content": chunk.content,
+            "has_code": chunk.has_code,
+            "has_equations": chunk.has_equations,
+            "char_count": chunk.char_count,
+            "word_count": chunk.word_count,
+        }
+        if chunk.page_number is not None:
+            metadata["page_number"] = chunk.page_number
+        if chunk.section_title is not None:
+            metadata["section_title"] = chunk.section_title
+        return metadata
+
+    @staticmethod
+    def chunk_from_match(
+        match: Dict[str, Any],
+        document_id: str,
+        chunk_index: int,
+        user_id: str,
+    ) -> DocumentChunk:
+        """
+        Rebuild a chunk from a Pinecone match's metadata.
+
+        Counts recorded at ingestion are reused; they are only recomputed
+        from the (possibly truncated) stored content for older vectors.
+        """
+        metadata = match["metadata"]
+        content = metadata.get("content", "")
+        word_count = metadata.get("word_count")
+        return DocumentChunk(
+            document_id=document_id,
+            user_id=user_id,
+            chunk_index=chunk_index,
+            content=content,
+            page_number=metadata.get("page_number"),
+            section_title=metadata.get("section_title"),
+            char_count=metadata.get("char_count", len(content)),
+            word_count=len(content.split()) if word_count is None else word_count,
+            has_code=metadata.get("has_code", False),
+            has_equations=metadata.get("has_equations", False)
+        )
+
     def index_document(
         self,
         document: Document,
-        chunks: List[DocumentChunk]
+        chunks: List[DocumentChunk],
+        embed_batch_size: int = 256,
+        upsert_batch_size: int = 100
     ) -> Tuple[bool, str]:
         """
         Index a document's chunks for semantic search.
@@ -86,83 +229,132 @@ class SemanticSearchService:
         with the document title and section before being embedded, so the
         embedding captures document-level context.
 
+        Chunks are embedded ``embed_batch_size`` at a time (one provider
+        request per batch) and each batch is upserted on a background
+        thread while the next one is being embedded.
+
         Args:
             document: Document object
             chunks: List of document chunks
+            embed_batch_size: Texts per embedding request
+            upsert_batch_size: Vectors per Pinecone upsert request
 
         Returns:
             Tuple of (success, message)
         """
-        try:
-            logger.info(f"Indexing document {document.id} with {len(chunks)} chunks")
-
-            # Build enriched texts for embedding (raw content stored separately)
-            texts = [
-                self._enrich_text_for_embedding(
-                    chunk.content,
-                    document_title=document.title,
-                    section_title=chunk.section_title,
-                )
-                for chunk in chunks
-            ]
-
-            # Generate embeddings from enriched text
-            logger.info("Generating contextual embeddings...")
-            embeddings = self.embedding_service.generate_embeddings_batch(texts)
-
-            if len(embeddings) != len(chunks):
-                return False, "Failed to generate embeddings for all chunks"
-
-            # Prepare chunk data for indexing
-            chunk_data = []
-            for i, chunk in enumerate(chunks):
-                # Build metadata, filtering out None values (Pinecone doesn't accept null)
-                metadata = {
-                    "chunk_index": chunk.chunk_index,
-                    "content": chunk.content,
-                    "has_code": chunk.has_code,
-                    "has_equations": chunk.has_equations
-                }
-                
-                # Add optional fields only if they have values
-                if chunk.page_number is not None:
-                    metadata["page_number"] = chunk.page_number
-                if chunk.section_title is not None:
-                    metadata["section_title"] = chunk.section_title
-                
-                chunk_data.append(metadata)
-
-            # Index in Pinecone
-            logger.info("Indexing in vector database...")
-            success = self.pinecone_manager.index_document_chunks(
-                document_id=document.id,
-                user_id=document.user_id,
-                chunks=chunk_data,
-                embeddings=embeddings
-            )
+        return self.index_document_pages(
+            document,
+            (chunks[i:i + embed_batch_size] for i in range(0, len(chunks), embed_batch_size)),
+            embed_batch_size=embed_batch_size,
+            upsert_batch_size=upsert_batch_size,
+        )
 
-            if success:
+    def index_document_pages(
+        self,
+        document: Document,
+        pages: Iterable[List[DocumentChunk]],
+        embed_batch_size: int = 256,
+        upsert_batch_size: int = 100
+    ) -> Tuple[bool, str]:
+        """
+        Index a document from a stream of chunk pages.
+
+        Fetching, embedding and upserting run as a three-stage pipeline:
+        the next page is pulled on one thread while the current batch is
+        embedded and the previous batch is upserted on another, so at most
+        a few pages are held in memory regardless of document size.  After
+        each upserted batch, ``chunks_indexed`` on the document is advanced
+        so progress is visible (and a partial run is recoverable).
+
+        Args:
+            document: Document object
+            pages: Iterable of chunk lists, e.g. ``ChunkRepository.iter_document_chunks``
+            embed_batch_size: Texts per embedding request
+            upsert_batch_size: Vectors per Pinecone upsert request
+
+        Returns:
+            Tuple of (success, message)
+        """
+        try:
+            logger.info(f"Indexing document {document.id}")
+            page_iter = iter(pages)
+            indexed = 0
+            pending: Optional[Tuple[Future, List[DocumentChunk]]] = None
+
+            def finish(upsert: Future, batch: List[DocumentChunk]) -> bool:
+                nonlocal indexed
+                if not upsert.result():
+                    return False
                 # Update chunks with vector information
-                for i, chunk in enumerate(chunks):
-                    vec_id = f"{document.id}_{chunk.chunk_index}"
+                for chunk in batch:
                     self.chunk_repo.update_chunk_vectors(
                         chunk_id=chunk.id,
-                        vector_id=vec_id,
+                        vector_id=f"{document.id}_{chunk.chunk_index}",
                         embedding_model=self.embedding_service.model_name
                     )
+                indexed += len(batch)
+                self.doc_repo.update_document(document.id, {"chunks_indexed": indexed})
+                return True
+
+            with ThreadPoolExecutor(max_workers=1) as fetch_executor, \
+                    ThreadPoolExecutor(max_workers=1) as upsert_executor:
+                next_page = fetch_executor.submit(next, page_iter, None)
+                while True:
+                    page = next_page.result()
+                    if page is None:
+                        break
+                    next_page = fetch_executor.submit(next, page_iter, None)
+
+                    for start in range(0, len(page), embed_batch_size):
+                        batch = page[start:start + embed_batch_size]
+
+                        # Build enriched texts for embedding (raw content stored separately)
+                        texts = [
+                            self._enrich_text_for_embedding(
+                                chunk.content,
+                                document_title=document.title,
+                                section_title=chunk.section_title,
+                            )
+                            for chunk in batch
+                        ]
+                        embeddings = self.embedding_service.generate_embeddings_batch(
+                            texts, batch_size=embed_batch_size
+                        )
+                        if len(embeddings) != len(batch):
+                            return False, "Failed to generate embeddings for all chunks"
+
+                        # Previous batch's upsert overlapped with this batch's embedding
+                        if pending is not None and not finish(*pending):
+                            return False, "Failed to index vectors"
+
+                        pending = (
+                            upsert_executor.submit(
+                                self.pinecone_manager.index_document_chunks,
+                                document_id=document.id,
+                                user_id=document.user_id,
+                                chunks=[self._chunk_metadata(chunk) for chunk in batch],
+                                embeddings=embeddings,
+                                batch_size=upsert_batch_size,
+                            ),
+                            batch,
+                        )
+
+                if pending is not None and not finish(*pending):
+                    return False, "Failed to index vectors"
+
+            if not indexed:
+                return False, "Failed to index vectors"
 
-                # Update document status
-                self.doc_repo.update_document(
-                    document.id,
-                    {
-                        "vector_namespace": f"user_{document.user_id}",
-                        "embedding_model": self.embedding_service.model_name
-                    }
-                )
+            # Update document status
+            self.doc_repo.update_document(
+                document.id,
+                {
+                    "vector_namespace": f"user_{document.user_id}",
+                    "embedding_model": self.embedding_service.model_name
+                }
+            )
 
-                return True, f"Successfully indexed {len(chunks)} chunks"
-            else:
-                return False, "Failed to index vectors"
+            return True, f"Successfully indexed {indexed} chunks"
 
         except Exception as e:
             logger.error(f"Failed to index document: {e}")
@@ -176,7 +368,8 @@ class SemanticSearchService:
         filter_document_id: Optional[str] = None,
         filter_has_code: Optional[bool] = None,
         filter_has_equations: Optional[bool] = None,
-        score_threshold: float = 0.2  # Lowered from 0.5 for better recall
+        score_threshold: float = 0.2,  # Lowered from 0.5 for better recall
+        query_embedding: Optional[List[float]] = None,
     ) -> List[DocumentSearchResult]:
         """
         Perform semantic search over user's documents.
@@ -189,13 +382,15 @@ class SemanticSearchService:
             filter_has_code: Filter chunks with code
             filter_has_equations: Filter chunks with equations
             score_threshold: Minimum similarity score
+            query_embedding: Precomputed query vector; skips embedding ``query``
 
         Returns:
             List of search results
         """
         try:
             # Generate query embedding
-            query_embedding = self.embedding_service.generate_embedding(query)
+            if query_embedding is None:
+                query_embedding = self.embedding_service.generate_embedding(query)
 
             # Build metadata filter
             metadata_filter = {}
@@ -219,6 +414,8 @@ class SemanticSearchService:
             
             logger.info(f"Processing {len(pinecone_results)} Pinecone results")
             
+            # Parse chunk IDs to get document and chunk index
+            hits = []
             for i, result in enumerate(pinecone_results):
                 logger.info(f"Result {i}: id={result.get('id')}, score={result.get('score')}")
                 
@@ -226,33 +423,20 @@ class SemanticSearchService:
                     logger.debug(f"Skipping result {i}: score {result.get('score')} below threshold {score_threshold}")
                     continue
 
-                # Parse chunk ID to get document and chunk index
                 vec_id = result["id"]
-                parts = vec_id.split("_")
-                if len(parts) >= 2:
-                    document_id = "_".join(parts[:-1])
-                    chunk_index = int(parts[-1])
-                else:
-                    continue
+                document_id, sep, index = vec_id.rpartition("_")
+                if sep:
+                    hits.append((i, result, document_id, int(index)))
 
-                # Get document
-                document = self.doc_repo.get_document(document_id)
+            # Fetch all referenced documents in one round trip
+            documents = self.doc_repo.get_documents({h[2] for h in hits})
+
+            for i, result, document_id, chunk_index in hits:
+                document = documents.get(document_id)
                 if not document:
                     continue
 
-                # Create chunk from metadata
-                chunk = DocumentChunk(
-                    document_id=document_id,
-                    user_id=user_id,
-                    chunk_index=chunk_index,
-                    content=result["metadata"].get("content", ""),
-                    page_number=result["metadata"].get("page_number"),
-                    section_title=result["metadata"].get("section_title"),
-                    char_count=len(result["metadata"].get("content", "")),
-                    word_count=len(result["metadata"].get("content", "").split()),
-                    has_code=result["metadata"].get("has_code", False),
-                    has_equations=result["metadata"].get("has_equations", False)
-                )
+                chunk = self.chunk_from_match(result, document_id, chunk_index, user_id)
 
                 search_result = DocumentSearchResult(
                     chunk=chunk,
@@ -310,9 +494,9 @@ class SemanticSearchService:
 
         # Cross-encoder reranking when available
         if self._reranker:
-            reranked = self._rerank_with_cross_encoder(query, initial_results)
+            reranked = self._rerank_with_cross_encoder(query, initial_results, top_k=rerank_top_k)
         else:
-            reranked = self._rerank_results(query, initial_results)
+            reranked = self._rerank_results(query, initial_results, top_k=rerank_top_k)
 
         # Filter by min score if configured (improves context precision)
         min_score = self._get_reranker_min_score()
@@ -340,9 +524,9 @@ class SemanticSearchService:
             return results[:top_k]
 
         if self._reranker:
-            reranked = self._rerank_with_cross_encoder(query, results)
+            reranked = self._rerank_with_cross_encoder(query, results, top_k=top_k)
         else:
-            reranked = self._rerank_results(query, results)
+            reranked = self._rerank_results(query, results, top_k=top_k)
 
         # Filter by min score if configured (improves context precision)
         min_score = self._get_reranker_min_score()
@@ -360,30 +544,73 @@ class SemanticSearchService:
         except Exception:
             return None
 
+    @staticmethod
+    def _select_ranked(
+        results: List[DocumentSearchResult],
+        top_k: Optional[int] = None,
+    ) -> List[DocumentSearchResult]:
+        """
+        Order results by score (descending, stable) and assign ranks.
+
+        With ``top_k``, only the best ``top_k`` are selected (O(N log K)
+        heap selection) and ranked; the rest are dropped.
+        """
+        if top_k is None or top_k >= len(results):
+            ranked = sorted(results, key=lambda x: x.score, reverse=True)
+        else:
+            ranked = heapq.nlargest(top_k, results, key=lambda x: x.score)
+        for i, result in enumerate(ranked):
+            result.rank = i + 1
+        return ranked
+
     def _rerank_with_cross_encoder(
         self,
         query: str,
         results: List[DocumentSearchResult],
+        top_k: Optional[int] = None,
     ) -> List[DocumentSearchResult]:
-        """Rerank using cross-encoder model."""
-        pairs = [[query, r.chunk.content[:512]] for r in results]
-        scores = self._reranker.predict(pairs)
+        """Rerank using cross-encoder model, keeping the best ``top_k`` if given."""
+        # Score longest passages first so each batch pads to similar lengths
+        order = sorted(
+            range(len(results)),
+            key=lambda i: len(results[i].chunk.content),
+            reverse=True,
+        )
+        pairs = [[query, results[i].chunk.content[:RERANKER_MAX_PASSAGE_CHARS]] for i in order]
+        if self._reranker_autocast is None:
+            scores = self._reranker.predict(
+                pairs,
+                batch_size=self.reranker_batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+        else:
+            import torch
+
+            device, dtype = self._reranker_autocast
+            with torch.inference_mode(), torch.autocast(device, dtype=dtype):
+                scores = self._reranker.predict(
+                    pairs,
+                    batch_size=self.reranker_batch_size,
+                    show_progress_bar=False,
+                    convert_to_tensor=True,
+                )
+            # Half-precision logits have no NumPy dtype; upcast before converting
+            scores = scores.float().cpu().numpy()
 
-        for result, score in zip(results, scores):
-            result.score = float(score)
+        for i, score in zip(order, scores):
+            results[i].score = float(score)
 
-        results.sort(key=lambda x: x.score, reverse=True)
-        for i, result in enumerate(results):
-            result.rank = i + 1
-        return results
+        return self._select_ranked(results, top_k)
 
     def _rerank_results(
         self,
         query: str,
-        results: List[DocumentSearchResult]
+        results: List[DocumentSearchResult],
+        top_k: Optional[int] = None,
     ) -> List[DocumentSearchResult]:
         """
-        Fallback reranking based on keyword overlap.
+        Fallback reranking based on keyword overlap, keeping the best ``top_k`` if given.
         """
         query_terms = set(query.lower().split())
 
@@ -398,10 +625,7 @@ class SemanticSearchService:
                 if query_terms & title_terms:
                     result.score = min(1.0, result.score + 0.1)
 
-        results.sort(key=lambda x: x.score, reverse=True)
-        for i, result in enumerate(results):
-            result.rank = i + 1
-        return results
+        return self._select_ranked(results, top_k)
 
     def find_similar_chunks(
         self,
@@ -427,6 +651,7 @@ class SemanticSearchService:
         results = self.search(
             query="",  # Empty query since we're using chunk embedding
             user_id=user_id,
+            query_embedding=chunk_embedding,
             top_k=top_k + 1  # Get extra since original chunk might be included
         )
 
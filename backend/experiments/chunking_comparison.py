@@ -14,13 +14,25 @@ Requires:
 """
 
 import argparse
+import functools
 import json
 import logging
+import math
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Any
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -40,28 +52,90 @@ STRATEGIES = [
     {"name": "semantic", "size": 1000, "overlap": 200, "strategy": "semantic"},
 ]
 
+# Result table columns, shared by the header and every strategy row
+HEADER_FMT = "{:<12} {:>6} {:>8} {:>7} {:>6} {:>5} {:>5}"
+ROW_FMT = (
+    "{name:<12} {size:>6} {overlap:>8} {num_chunks:>7} {avg_size:>6.0f} "
+    "{min_size:>5} {max_size:>5}"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_chunker(size: int, overlap: int, strategy: str) -> DocumentChunker:
+    """One chunker per configuration (building its splitters loads the tokenizer)."""
+    return DocumentChunker(chunk_size=size, chunk_overlap=overlap, strategy=strategy)
+
 
 def analyze_chunking(text: str, strategy: Dict) -> Dict[str, Any]:
     """Chunk text with given strategy and return statistics."""
-    chunker = DocumentChunker(
-        chunk_size=strategy["size"],
-        chunk_overlap=strategy["overlap"],
-        strategy=strategy["strategy"],
-    )
+    chunker = _get_chunker(strategy["size"], strategy["overlap"], strategy["strategy"])
     chunks = chunker.chunk_document(
         text=text,
         document_id="experiment",
         user_id="experiment",
     )
-    sizes = [c.char_count for c in chunks]
+    if not chunks:
+        return {"num_chunks": 0, "avg_size": 0, "min_size": 0, "max_size": 0}
+    sizes = np.fromiter((c.char_count for c in chunks), dtype=np.int32, count=len(chunks))
     return {
         "num_chunks": len(chunks),
-        "avg_size": round(sum(sizes) / len(sizes), 1) if sizes else 0,
-        "min_size": min(sizes) if sizes else 0,
-        "max_size": max(sizes) if sizes else 0,
+        "avg_size": round(float(sizes.mean()), 1),
+        "min_size": int(sizes.min()),
+        "max_size": int(sizes.max()),
+    }
+
+
+def analytic_chunking_stats(text_length: int, strategy: Dict) -> Dict[str, Any]:
+    """
+    Estimate chunk statistics from text length alone, without chunking.
+
+    Models a fixed sliding window of ``size`` characters advancing by
+    ``size - overlap``, so n = ceil((N - size) / stride) + 1 and only the
+    last chunk is short. Real chunkers cut at separators and produce
+    somewhat more, smaller chunks; use this for quick size/overlap sweeps.
+    """
+    size = strategy["size"]
+    stride = max(1, size - strategy["overlap"])
+    if text_length <= 0:
+        return {"num_chunks": 0, "avg_size": 0, "min_size": 0, "max_size": 0}
+    if text_length <= size:
+        return {"num_chunks": 1, "avg_size": float(text_length),
+                "min_size": text_length, "max_size": text_length}
+    num_chunks = math.ceil((text_length - size) / stride) + 1
+    last = text_length - (num_chunks - 1) * stride
+    return {
+        "num_chunks": num_chunks,
+        "avg_size": round((size * (num_chunks - 1) + last) / num_chunks, 1),
+        "min_size": min(size, last),
+        "max_size": size,
     }
 
 
+def analyze_chunking_batch(
+    text: str,
+    strategies: List[Dict],
+    max_workers: int = 1,
+    analytic: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Chunking statistics for several strategies over the same text, keyed by name.
+
+    Runs in-process by default, reusing the cached chunkers. With
+    ``max_workers`` > 1, strategies run in separate processes; each one
+    rebuilds its chunker and tokenizer, so this only pays off for large
+    texts. With ``analytic``, statistics are estimated from the text
+    length instead.
+    """
+    if analytic:
+        return {s["name"]: analytic_chunking_stats(len(text), s) for s in strategies}
+    workers = min(len(strategies), max_workers)
+    if workers <= 1:
+        return {s["name"]: analyze_chunking(text, s) for s in strategies}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        stats = executor.map(analyze_chunking, repeat(text), strategies)
+        return {s["name"]: result for s, result in zip(strategies, stats)}
+
+
 def run_retrieval_evaluation(
     user_id: str,
     limit: int = 10,
@@ -81,24 +155,30 @@ def run_experiment(
     sample_text: str = None,
     user_id: str = None,
     limit: int = 10,
+    analytic: bool = False,
+    workers: int = 1,
 ) -> Dict[str, Any]:
     """
     Run chunking comparison.
 
     If sample_text is provided: analyzes chunk statistics only.
     If user_id is provided: also runs retrieval evaluation.
+    If analytic: estimates chunk statistics instead of running the chunker.
+    With workers > 1: chunks strategies in that many processes.
     """
     results = {}
 
     if sample_text is None:
-        sample_text = _default_sample_text()
+        sample_text = _DEFAULT_SAMPLE_TEXT
 
+    logger.info(f"Testing strategies: {', '.join(s['name'] for s in STRATEGIES)}")
+    all_stats = analyze_chunking_batch(
+        sample_text, STRATEGIES, max_workers=workers, analytic=analytic
+    )
     for strategy in STRATEGIES:
-        logger.info(f"Testing strategy: {strategy['name']}")
-        stats = analyze_chunking(sample_text, strategy)
         results[strategy["name"]] = {
             "config": strategy,
-            "chunking_stats": stats,
+            "chunking_stats": all_stats[strategy["name"]],
         }
 
     if user_id:
@@ -116,19 +196,17 @@ def format_results(results: Dict) -> str:
         "CHUNKING STRATEGY COMPARISON",
         "=" * 70,
         "",
-        f"{'Strategy':<12} {'Size':>6} {'Overlap':>8} {'Chunks':>7} {'Avg':>6} {'Min':>5} {'Max':>5}",
+        HEADER_FMT.format("Strategy", "Size", "Overlap", "Chunks", "Avg", "Min", "Max"),
         "-" * 70,
     ]
     for name in ["small", "current", "large", "semantic"]:
         if name not in results:
             continue
-        cfg = results[name]["config"]
-        stats = results[name]["chunking_stats"]
-        lines.append(
-            f"{name:<12} {cfg['size']:>6} {cfg['overlap']:>8} "
-            f"{stats['num_chunks']:>7} {stats['avg_size']:>6.0f} "
-            f"{stats['min_size']:>5} {stats['max_size']:>5}"
-        )
+        lines.append(ROW_FMT.format_map({
+            **results[name]["config"],
+            **results[name]["chunking_stats"],
+            "name": name,
+        }))
 
     if "retrieval_evaluation" in results:
         metrics = results["retrieval_evaluation"]
@@ -143,9 +221,21 @@ def format_results(results: Dict) -> str:
     return "\n".join(lines)
 
 
-def _default_sample_text() -> str:
-    """Sample ML text for chunking analysis when no user data."""
-    return """
+def save_results(results: Dict, out_path: Path) -> None:
+    """Write raw results as indented JSON (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        out_path.write_bytes(orjson.dumps(
+            results,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        ))
+        return
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+
+
+# Sample ML text for chunking analysis when no user data
+_DEFAULT_SAMPLE_TEXT = """
 Principal Component Analysis (PCA) is a dimensionality reduction technique.
 It finds the directions of maximum variance in high-dimensional data and
 projects it onto a lower-dimensional subspace.
@@ -194,13 +284,25 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Chunking strategy comparison")
     parser.add_argument("--user-id", help="User ID for retrieval evaluation")
     parser.add_argument("--limit", type=int, default=10, help="Number of test queries")
+    parser.add_argument(
+        "--analytic",
+        action="store_true",
+        help="Estimate chunk stats from text length (sliding-window model) instead of chunking",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Chunk strategies in this many processes (worth it only for large texts)",
+    )
     args = parser.parse_args()
 
-    results = run_experiment(user_id=args.user_id, limit=args.limit)
+    results = run_experiment(
+        user_id=args.user_id, limit=args.limit, analytic=args.analytic, workers=args.workers
+    )
     print(format_results(results))
     print()
 
     out_path = Path(__file__).parent / "chunking_results.json"
-    with open(out_path, "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    save_results(results, out_path)
     print(f"Raw results saved to {out_path}")
@@ -7,11 +7,13 @@ runs the RAG pipeline for each question, computes RAGAS metrics, and saves
 results to MongoDB.
 
 Usage:
-    python run_academe_eval.py [--user-id USER_ID] [--limit N] [--no-save]
+    python run_academe_eval.py [--user-id USER_ID] [--limit N] [--no-save] [--no-cache]
 """
 import argparse
+import hashlib
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -27,6 +29,12 @@ from core.models import UserProfile, LearningLevel, LearningGoal, ExplanationSty
 from core.evaluation.metrics_tracker import MetricsTracker
 from bson import ObjectId
 
+# RAG answers/contexts are cached on disk so re-running RAGAS (e.g. while tuning
+# metrics) does not repeat retrieval and LLM calls. Bump the version whenever the
+# retrieval or generation pipeline changes so stale answers are not replayed.
+RAG_EVAL_CACHE_VERSION = 1
+RAG_EVAL_CACHE_DIR = Path(__file__).parent / ".cache" / "rag_eval"
+
 
 def load_eval_dataset(dataset_path: Path) -> dict:
     """Load the academe evaluation dataset from JSON."""
@@ -84,6 +92,15 @@ def _print_per_chunk_verdicts(per_query: list[dict]) -> None:
         print(f"[DEBUG] Per-chunk verdicts failed: {e}")
 
 
+def _rag_cache_path(question: str, user_id: str, config: dict) -> Path:
+    """Cache file for one question under a given user and pipeline config."""
+    key = json.dumps(
+        {"version": RAG_EVAL_CACHE_VERSION, "question": question, "user_id": user_id, **config},
+        sort_keys=True,
+    )
+    return RAG_EVAL_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
 if TYPE_CHECKING:
     from core.documents import DocumentManager
 
@@ -146,10 +163,20 @@ def run_evaluation(
     expected_docs_filter: list[str] | None = None,
     use_self_rag: bool = True,
     use_decomposition: bool = True,
+    use_cache: bool = True,
+    concurrency: int = 4,
+    ragas_workers: int = 16,
 ) -> dict:
     """
     Run full RAGAS evaluation.
 
+    With use_cache, RAG answers for unchanged (question, user, config) inputs
+    are replayed from RAG_EVAL_CACHE_DIR; fresh answers are always written back.
+    Replayed answers are flagged per question and counted in ``cache_hits``
+    in the metadata and the saved MongoDB run config.
+    Up to `concurrency` questions are sent through the pipeline at once, and
+    RAGAS scores up to `ragas_workers` (sample, metric) jobs concurrently.
+
     Returns:
         Dict with ragas_scores, per_question results, and metadata.
     """
@@ -214,12 +241,19 @@ def run_evaluation(
         use_query_decomposition=use_decomposition,
     )
 
-    # Run RAG for each question
-    samples_data = []
-    for i, q in enumerate(questions, 1):
-        question = q["question"]
-        print(f"[{i}/{len(questions)}] {question[:60]}...")
-
+    cache_config = {
+        "top_k": top_k,
+        "use_reranking": use_reranking,
+        "use_self_rag": use_self_rag,
+        "use_decomposition": use_decomposition,
+    }
+
+    def answer_question(question: str) -> tuple[str, list[str], str | None, bool]:
+        """Answer, contexts, a status line to print (if any) and whether it was replayed."""
+        cache_path = _rag_cache_path(question, user_id, cache_config)
+        if use_cache and cache_path.exists():
+            cached = json.loads(cache_path.read_text())
+            return cached["answer"], cached["contexts"], "(cached)", True
         try:
             answer, sources = rag.query_with_context(
                 query=question,
@@ -227,32 +261,51 @@ def run_evaluation(
                 top_k=top_k,
                 use_reranking=use_reranking,
             )
-            contexts = [s.chunk.content for s in sources] if sources else ["No context retrieved"]
         except Exception as e:
-            print(f"    ❌ Error: {e}")
-            answer = f"Error: {e}"
-            contexts = ["Error"]
-
-        samples_data.append({
-            "id": q.get("id", f"Q{i:03d}"),
-            "question": question,
-            "answer": answer,
-            "contexts": contexts,
-            "ground_truth": q.get("ground_truth", ""),
-            "query_type": q.get("query_type", "unknown"),
-            "difficulty": q.get("difficulty", "unknown"),
-            "hard_case": q.get("hard_case", "none"),
-        })
-        print(f"    ✓ {len(answer)} chars, {len(contexts)} chunks")
-
-        # Debug: print first factual question's answer and context for inspection
-        if debug and i == 1 and q.get("query_type") == "factual":
-            print()
-            print("    [DEBUG] Sample answer (first 300 chars):")
-            print(f"    {answer[:300]}...")
-            print("    [DEBUG] First context chunk (first 200 chars):")
-            print(f"    {contexts[0][:200] if contexts else 'None'}...")
-            print()
+            return f"Error: {e}", ["Error"], f"❌ Error: {e}", False
+        contexts = [s.chunk.content for s in sources] if sources else ["No context retrieved"]
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"answer": answer, "contexts": contexts}))
+        return answer, contexts, None, False
+
+    # Run RAG for all questions; each one mostly waits on embedding/LLM calls,
+    # so a few run concurrently (results still come back in dataset order)
+    samples_data = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        answered = executor.map(answer_question, [q["question"] for q in questions])
+        for i, (q, (answer, contexts, note, replayed)) in enumerate(zip(questions, answered), 1):
+            question = q["question"]
+            print(f"[{i}/{len(questions)}] {question[:60]}...")
+            if note:
+                print(f"    {note}")
+
+            samples_data.append({
+                "id": q.get("id", f"Q{i:03d}"),
+                "question": question,
+                "answer": answer,
+                "contexts": contexts,
+                "ground_truth": q.get("ground_truth", ""),
+                "query_type": q.get("query_type", "unknown"),
+                "difficulty": q.get("difficulty", "unknown"),
+                "hard_case": q.get("hard_case", "none"),
+                "cached": replayed,
+            })
+            print(f"    ✓ {len(answer)} chars, {len(contexts)} chunks")
+
+            # Debug: print first factual question's answer and context for inspection
+            if debug and i == 1 and q.get("query_type") == "factual":
+                print()
+                print("    [DEBUG] Sample answer (first 300 chars):")
+                print(f"    {answer[:300]}...")
+                print("    [DEBUG] First context chunk (first 200 chars):")
+                print(f"    {contexts[0][:200] if contexts else 'None'}...")
+                print()
+
+    # Replayed answers came from an earlier pipeline run; record how many so a
+    # saved run isn't mistaken for a fresh measurement of the current code
+    cache_hits = sum(s["cached"] for s in samples_data)
+    if cache_hits:
+        print(f"\n{cache_hits}/{len(samples_data)} answers replayed from {RAG_EVAL_CACHE_DIR}")
 
     # Run RAGAS
     print()
@@ -261,6 +314,7 @@ def run_evaluation(
     try:
         from ragas import evaluate, EvaluationDataset, SingleTurnSample
         from ragas.metrics import Faithfulness, ResponseRelevancy, ContextPrecision, ContextRecall
+        from ragas.run_config import RunConfig
 
         samples = [
             SingleTurnSample(
@@ -274,7 +328,13 @@ def run_evaluation(
         dataset = EvaluationDataset(samples=samples)
         metrics = [Faithfulness(), ResponseRelevancy(), ContextPrecision(), ContextRecall()]
 
-        results = evaluate(dataset=dataset, metrics=metrics)
+        # Every (sample, metric) pair is an independent LLM job; RAGAS retries
+        # rate-limited calls with backoff, so workers only need to fit the quota
+        results = evaluate(
+            dataset=dataset,
+            metrics=metrics,
+            run_config=RunConfig(max_workers=ragas_workers),
+        )
         df = results.to_pandas()
 
         # Extract metric columns (exclude content columns)
@@ -302,6 +362,7 @@ def run_evaluation(
                 "user_id": user_id,
                 "top_k": top_k,
                 "use_reranking": use_reranking,
+                "cache_hits": cache_hits,
             },
         }
 
@@ -320,6 +381,7 @@ def run_evaluation(
                     "num_questions": len(questions),
                     "top_k": top_k,
                     "use_reranking": use_reranking,
+                    "cache_hits": cache_hits,
                 },
             )
             print(f"\n✅ Results saved to MongoDB (run: {run_name})")
@@ -440,6 +502,23 @@ def main():
         action="store_true",
         help="Disable query decomposition",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Questions answered in parallel (default: 4; 1 = sequential)",
+    )
+    parser.add_argument(
+        "--ragas-workers",
+        type=int,
+        default=16,
+        help="Concurrent RAGAS metric LLM calls (default: 16; lower if rate-limited)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run the RAG pipeline for every question instead of replaying cached answers",
+    )
     args = parser.parse_args()
 
     init_database()
@@ -468,6 +547,9 @@ def main():
         expected_docs_filter=expected_docs_filter,
         use_self_rag=not args.no_self_rag,
         use_decomposition=not args.no_decomposition,
+        use_cache=not args.no_cache,
+        concurrency=args.concurrency,
+        ragas_workers=args.ragas_workers,
     )
 
     print_results(result)
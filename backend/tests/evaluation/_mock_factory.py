@@ -0,0 +1,43 @@
+"""Shared mock search results for evaluation tests."""
+
+import functools
+
+from core.models.document import DocumentChunk, Document, DocumentSearchResult, DocumentStatus, DocumentType
+
+
+@functools.lru_cache(maxsize=None)
+def mock_document(doc_id: str) -> Document:
+    """One validated Document per doc_id, shared by every mock result."""
+    doc = Document(
+        user_id="test",
+        filename="test.pdf",
+        original_filename="test.pdf",
+        file_path="/tmp/test.pdf",
+        file_size=1000,
+        file_hash="abc",
+        document_type=DocumentType.PDF,
+        processing_status=DocumentStatus.READY,
+    )
+    doc.id = doc_id
+    return doc
+
+
+@functools.lru_cache(maxsize=256)
+def make_result(doc_id: str, idx: int, content: str, score: float) -> DocumentSearchResult:
+    """
+    Mock DocumentSearchResult, cached per argument tuple.
+
+    Fields are known-valid, so the models are built without re-validation.
+    Results are shared between callers: tests must only read them.
+    """
+    chunk = DocumentChunk.model_construct(
+        document_id=doc_id,
+        user_id="test",
+        chunk_index=idx,
+        content=content,
+        char_count=len(content),
+        word_count=len(content.split()),
+    )
+    return DocumentSearchResult.model_construct(
+        chunk=chunk, document=mock_document(doc_id), score=score, rank=idx + 1
+    )
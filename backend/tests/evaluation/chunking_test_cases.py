@@ -9,11 +9,14 @@ When relevant_chunk_ids is absent, RetrievalEvaluator uses content overlap with
 ground_truth to judge relevance (precision@k, MRR only).
 """
 
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import Any, Mapping, Tuple
 
 # Test cases for ML concept retrieval
-# Add relevant_chunk_ids when you have a seeded test document
-CHUNKING_TEST_CASES: List[Dict[str, Any]] = [
+# Add relevant_chunk_ids when you have a seeded test document.
+# Read-only so a consumer can't mutate a case another test relies on;
+# use dict(case) for a mutable copy.
+CHUNKING_TEST_CASES: Tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(case) for case in [
     {
         "query": "What is PCA?",
         "ground_truth": "Principal Component Analysis is a dimensionality reduction technique that finds the axes of maximum variance in the data. It uses eigenvectors of the covariance matrix.",
@@ -75,4 +78,4 @@ CHUNKING_TEST_CASES: List[Dict[str, Any]] = [
         "topic": "feature_engineering",
         "document_id": "ml_textbook_001",
     },
-]
+])
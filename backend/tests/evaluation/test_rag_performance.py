@@ -12,35 +12,40 @@ Mark with @pytest.mark.evaluation so they can be skipped in CI without infra.
 
 import time
 import pytest
-from unittest.mock import MagicMock, patch
 
 from core.evaluation.retrieval_evaluator import RetrievalEvaluator
 from core.evaluation.test_data import TEST_QUESTIONS, create_test_dataset
-from core.models.document import DocumentChunk, Document, DocumentSearchResult, DocumentStatus, DocumentType
-
-
-def _make_mock_result(doc_id, idx, content, score):
-    """Helper to create a mock DocumentSearchResult."""
-    doc = Document(
-        user_id="test",
-        filename="test.pdf",
-        original_filename="test.pdf",
-        file_path="/tmp/test.pdf",
-        file_size=1000,
-        file_hash="abc",
-        document_type=DocumentType.PDF,
-        processing_status=DocumentStatus.READY,
-    )
-    doc.id = doc_id
-    chunk = DocumentChunk(
-        document_id=doc_id,
-        user_id="test",
-        chunk_index=idx,
-        content=content,
-        char_count=len(content),
-        word_count=len(content.split()),
-    )
-    return DocumentSearchResult(chunk=chunk, document=doc, score=score, rank=idx + 1)
+
+from ._mock_factory import make_result as _make_mock_result
+
+# Ground truth by question text, for fake searches keyed on the query
+_GROUND_TRUTH_BY_QUESTION = {q["question"]: q.get("ground_truth", "") for q in TEST_QUESTIONS}
+
+
+@pytest.fixture(scope="session")
+def eval_dataset():
+    """create_test_dataset(limit=...) built once per limit for the whole session."""
+    datasets = {}
+
+    def get(limit):
+        if limit not in datasets:
+            datasets[limit] = create_test_dataset(limit=limit)
+        return datasets[limit]
+
+    return get
+
+
+class _FakeSearch:
+    """Search service stand-in; plain method calls keep mock overhead out of latency numbers."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def search(self, *args, **kwargs):
+        return self._fn(*args, **kwargs)
+
+    def search_with_reranking(self, *args, **kwargs):
+        return self._fn(*args, **kwargs)
 
 
 @pytest.mark.evaluation
@@ -50,16 +55,9 @@ class TestRetrievalBaseline:
     @pytest.fixture
     def mock_search(self):
         """Mock search that returns content overlapping with ground truth."""
-        service = MagicMock()
-
         def fake_search(query, user_id, top_k=10, **kwargs):
             # Include ground-truth-like terms so content-overlap relevance works
-            from core.evaluation.test_data import TEST_QUESTIONS
-            gt = ""
-            for q in TEST_QUESTIONS:
-                if q["question"] == query:
-                    gt = q.get("ground_truth", "")
-                    break
+            gt = _GROUND_TRUTH_BY_QUESTION.get(query, "")
             # First result contains ground truth excerpt → relevant
             relevant_content = gt[:200] if gt else f"Explanation of {query}"
             results = [
@@ -69,16 +67,14 @@ class TestRetrievalBaseline:
             ]
             return results[:top_k]
 
-        service.search.side_effect = fake_search
-        service.search_with_reranking.side_effect = fake_search
-        return service
+        return _FakeSearch(fake_search)
 
-    def test_mrr_above_threshold(self, mock_search):
+    def test_mrr_above_threshold(self, mock_search, eval_dataset):
         """MRR should not drop below 0.5."""
         evaluator = RetrievalEvaluator(search_service=mock_search)
         result = evaluator.evaluate(
             user_id="test",
-            test_queries=create_test_dataset(limit=5),
+            test_queries=eval_dataset(5),
             k_values=[5],
             use_reranking=False,
         )
@@ -86,12 +82,12 @@ class TestRetrievalBaseline:
             f"MRR {result['metrics']['mrr']:.3f} below 0.5 threshold"
         )
 
-    def test_precision_at_5_above_threshold(self, mock_search):
+    def test_precision_at_5_above_threshold(self, mock_search, eval_dataset):
         """Precision@5 should not drop below 0.2."""
         evaluator = RetrievalEvaluator(search_service=mock_search)
         result = evaluator.evaluate(
             user_id="test",
-            test_queries=create_test_dataset(limit=5),
+            test_queries=eval_dataset(5),
             k_values=[5],
             use_reranking=False,
         )
@@ -104,16 +100,14 @@ class TestRetrievalBaseline:
 class TestSearchLatency:
     """Ensure search latency stays within bounds."""
 
-    def test_mock_search_latency(self):
+    def test_mock_search_latency(self, eval_dataset):
         """Mock search should complete in <100ms per query."""
-        service = MagicMock()
-        service.search.return_value = [
-            _make_mock_result("doc1", 0, "Test content", 0.9),
-        ]
+        results = [_make_mock_result("doc1", 0, "Test content", 0.9)]
+        service = _FakeSearch(lambda *args, **kwargs: results)
         evaluator = RetrievalEvaluator(search_service=service)
         result = evaluator.evaluate(
             user_id="test",
-            test_queries=create_test_dataset(limit=3),
+            test_queries=eval_dataset(3),
             k_values=[5],
             use_reranking=False,
         )
@@ -126,13 +120,12 @@ class TestSearchLatency:
 class TestEvaluationOutput:
     """Verify evaluator returns expected structure."""
 
-    def test_output_structure(self):
-        service = MagicMock()
-        service.search.return_value = []
+    def test_output_structure(self, eval_dataset):
+        service = _FakeSearch(lambda *args, **kwargs: [])
         evaluator = RetrievalEvaluator(search_service=service)
         result = evaluator.evaluate(
             user_id="test",
-            test_queries=create_test_dataset(limit=2),
+            test_queries=eval_dataset(2),
             k_values=[5, 10],
             use_reranking=False,
         )
@@ -9,7 +9,8 @@ from core.evaluation.retrieval_evaluator import (
     _content_overlap_score,
     _is_relevant_by_content,
 )
-from core.models.document import DocumentChunk, Document, DocumentSearchResult, DocumentStatus, DocumentType
+
+from ._mock_factory import make_result
 
 
 @pytest.fixture
@@ -22,29 +23,6 @@ def mock_search_service():
 @pytest.fixture
 def sample_results():
     """Sample DocumentSearchResult list for testing."""
-    doc = Document(
-        user_id="test",
-        filename="test.pdf",
-        original_filename="test.pdf",
-        file_path="/tmp/test.pdf",
-        file_size=1000,
-        file_hash="abc",
-        document_type=DocumentType.PDF,
-        processing_status=DocumentStatus.READY,
-    )
-    doc.id = "doc1"
-
-    def make_result(doc_id: str, chunk_idx: int, content: str, score: float):
-        chunk = DocumentChunk(
-            document_id=doc_id,
-            user_id="test",
-            chunk_index=chunk_idx,
-            content=content,
-            char_count=len(content),
-            word_count=len(content.split()),
-        )
-        return DocumentSearchResult(chunk=chunk, document=doc, score=score, rank=chunk_idx + 1)
-
     return [
         make_result("doc1", 0, "PCA finds principal components via eigenvectors", 0.9),
         make_result("doc1", 1, "Eigenvectors represent directions of max variance", 0.85),
@@ -116,3 +94,21 @@ class TestRetrievalEvaluator:
         assert "mrr" in metrics
         assert 0 <= metrics["precision@2"] <= 1
         assert 0 <= metrics["mrr"] <= 1
+
+    def test_evaluate_concurrent_matches_sequential(self, mock_search_service, sample_results):
+        mock_search_service.search.return_value = sample_results
+        queries = [
+            {"question": "What is PCA?", "ground_truth": "PCA uses eigenvectors for dimensionality reduction"},
+            {"question": "What is cooking?", "ground_truth": "Unrelated content about cooking"},
+            {"question": "Eigenvectors?", "ground_truth": "Eigenvectors represent directions of max variance"},
+        ]
+        evaluator = RetrievalEvaluator(search_service=mock_search_service)
+
+        sequential = evaluator.evaluate("test", test_queries=queries, k_values=[2, 4], use_reranking=False)
+        concurrent = evaluator.evaluate(
+            "test", test_queries=queries, k_values=[2, 4], use_reranking=False, max_workers=3
+        )
+
+        assert concurrent["per_query"] == sequential["per_query"]
+        assert concurrent["metrics"]["mrr"] == sequential["metrics"]["mrr"]
+        assert concurrent["metrics"]["precision@2"] == sequential["metrics"]["precision@2"]
@@ -2,6 +2,11 @@
 Shared test fixtures for agent tests.
 
 Provides common mocks and sample data for testing agents.
+
+User profiles, the memory context and the LLM-setup helper are session-scoped
+and shared by every test: treat them as read-only (use ``model_copy`` /
+``copy.deepcopy`` to vary them). Mocks stay function-scoped since tests
+assert on their calls.
 """
 
 import pytest
@@ -9,7 +14,7 @@ from unittest.mock import Mock, MagicMock
 from core.models import UserProfile, LearningLevel, ExplanationStyle, LearningGoal
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user():
     """Sample user profile for testing."""
     return UserProfile(
@@ -26,7 +31,7 @@ def sample_user():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def beginner_user():
     """Beginner-level user profile."""
     return UserProfile(
@@ -43,7 +48,7 @@ def beginner_user():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def advanced_user():
     """Advanced-level user profile."""
     return UserProfile(
@@ -109,7 +114,7 @@ def mock_document_manager_with_docs():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_memory_context():
     """Sample memory context for testing."""
     return {
@@ -147,7 +152,7 @@ def mock_llm_code_response():
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def setup_mock_llm():
     """
     Helper fixture to setup LLM mock chain.
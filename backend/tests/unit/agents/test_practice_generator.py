@@ -106,7 +106,9 @@ class TestPracticeGeneratorQuestionGeneration:
         """Should use general knowledge when user prefers it."""
         # Arrange
         mock_rag_pipeline.query_with_context.return_value = ("", [])
-        sample_user.rag_fallback_preference = RAGFallbackPreference.PREFER_GENERAL
+        user = sample_user.model_copy(
+            update={"rag_fallback_preference": RAGFallbackPreference.PREFER_GENERAL}
+        )
         
         # Mock LLM
         mock_llm = Mock()
@@ -131,7 +133,7 @@ class TestPracticeGeneratorQuestionGeneration:
         # Act
         result = generator.generate_practice_set(
             topic="Neural Networks",
-            user=sample_user,
+            user=user,
             num_questions=3
         )
         
@@ -264,6 +264,37 @@ class TestGetLLM:
                 # Should still work (lowercase internally)
                 mock_llm.assert_called_once()
 
+    def test_get_openai_llm_passes_max_retries(self):
+        """Test that max_retries reaches the client only when given."""
+        from core.config.llm_config import get_openai_llm
+
+        with patch('core.config.llm_config.get_settings') as mock_get:
+            mock_get.return_value = MagicMock(openai_api_key="test-key")
+            with patch('langchain_openai.ChatOpenAI') as mock_llm:
+                get_openai_llm(max_retries=0)
+                assert mock_llm.call_args[1]['max_retries'] == 0
+
+                get_openai_llm()
+                assert 'max_retries' not in mock_llm.call_args[1]
+
+
+class TestSharedHTTPClient:
+    """Test the pooled HTTP client used for OpenAI calls."""
+
+    def test_client_reused_within_process(self):
+        from core.config.llm_config import get_http_client
+
+        assert get_http_client() is get_http_client()
+
+    def test_client_rebuilt_after_fork(self):
+        import core.config.llm_config as llm_config
+
+        first = llm_config.get_http_client()
+        with patch("core.config.llm_config.os.getpid", return_value=-1):
+            second = llm_config.get_http_client()
+        assert second is not first
+        llm_config._http_client = None
+
 
 class TestConfigModule:
     """Test config module exports."""
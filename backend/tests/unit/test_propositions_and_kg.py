@@ -137,7 +137,11 @@ class TestPropositionRepository(unittest.TestCase):
     def setUp(self):
         self.mock_db = Mock()
         self.mock_collection = Mock()
-        self.mock_db.get_database.return_value = {"propositions": self.mock_collection}
+        self.mock_chunks = Mock()
+        self.mock_db.get_database.return_value = {
+            "propositions": self.mock_collection,
+            "chunks": self.mock_chunks,
+        }
         self.repo = PropositionRepository(db=self.mock_db)
 
     def test_store_propositions(self):
@@ -150,9 +154,85 @@ class TestPropositionRepository(unittest.TestCase):
         self.assertEqual(count, 2)
         self.mock_collection.insert_many.assert_called_once()
 
+    def test_store_propositions_uses_unordered_inserts(self):
+        props = [Proposition("Fact A.", "doc1", "u1", 0, "chunk text", 0)]
+        self.mock_collection.insert_many.return_value = Mock(inserted_ids=["id1"])
+        self.repo.store_propositions(props)
+        _, kwargs = self.mock_collection.insert_many.call_args
+        self.assertFalse(kwargs["ordered"])
+
+    def test_store_unacknowledged_skips_validation_bypass(self):
+        write_collection = Mock()
+        write_collection.insert_many.return_value = Mock(inserted_ids=["id1"])
+        self.mock_collection.with_options.return_value = write_collection
+        repo = PropositionRepository(db=self.mock_db, unacknowledged_writes=True)
+
+        props = [Proposition("Fact A.", "doc1", "u1", 0, "chunk text", 0)]
+        self.assertEqual(repo.store_propositions(props), 1)
+
+        write_concern = self.mock_collection.with_options.call_args.kwargs["write_concern"]
+        self.assertEqual(write_concern.document, {"w": 0})
+        _, kwargs = write_collection.insert_many.call_args
+        self.assertFalse(kwargs["ordered"])
+        self.assertNotIn("bypass_document_validation", kwargs)
+
+    def test_store_large_batch_is_split(self):
+        props = [
+            Proposition(f"Fact {i}.", "doc1", "u1", 0, "chunk text", i)
+            for i in range(2500)
+        ]
+        self.mock_collection.insert_many.side_effect = (
+            lambda docs, **kw: Mock(inserted_ids=list(range(len(docs))))
+        )
+        count = self.repo.store_propositions(props)
+        self.assertEqual(count, 2500)
+        self.assertEqual(self.mock_collection.insert_many.call_count, 3)
+
     def test_store_empty_returns_zero(self):
         self.assertEqual(self.repo.store_propositions([]), 0)
 
+    def test_get_document_proposition_dicts_streams_raw_docs(self):
+        rows = [
+            Proposition("Fact A.", "doc1", "u1", 0, "chunk text", 0).to_dict(),
+            Proposition("Fact B.", "doc1", "u1", 0, "chunk text", 1).to_dict(),
+        ]
+        cursor = self.mock_collection.find.return_value.sort.return_value
+        cursor.batch_size.return_value = iter(rows)
+        result = list(self.repo.get_document_proposition_dicts("doc1"))
+        self.assertEqual(result, rows)
+        _, projection = self.mock_collection.find.call_args[0]
+        self.assertEqual(projection, {"_id": 0})
+
+    def test_get_document_propositions_builds_objects(self):
+        rows = [
+            PropositionRepository._to_storage_dict(
+                Proposition("Fact A.", "doc1", "u1", 0, "chunk text", 0)
+            ),
+            PropositionRepository._to_storage_dict(
+                Proposition("Fact B.", "doc1", "u1", 0, "chunk text", 1)
+            ),
+        ]
+        cursor = self.mock_collection.find.return_value.sort.return_value
+        cursor.batch_size.return_value = iter(rows)
+        self.mock_chunks.find.return_value = [
+            {"document_id": "doc1", "chunk_index": 0, "content": "chunk text"},
+        ]
+        props = self.repo.get_document_propositions("doc1")
+        self.assertEqual(len(props), 2)
+        self.assertIsInstance(props[0], Proposition)
+        self.assertEqual(props[0].text, "Fact A.")
+        self.assertEqual(props[1].source_chunk_content, "chunk text")
+        # One batched chunk lookup for all propositions
+        self.mock_chunks.find.assert_called_once()
+
+    def test_stored_propositions_omit_chunk_content(self):
+        props = [Proposition("Fact A.", "doc1", "u1", 3, "long chunk text", 0)]
+        self.mock_collection.insert_many.return_value = Mock(inserted_ids=["id1"])
+        self.repo.store_propositions(props)
+        (docs,), _ = self.mock_collection.insert_many.call_args
+        self.assertNotIn("source_chunk_content", docs[0])
+        self.assertEqual(docs[0]["source_chunk_index"], 3)
+
     def test_delete_document_propositions(self):
         self.mock_collection.delete_many.return_value = Mock(deleted_count=5)
         count = self.repo.delete_document_propositions("doc1")
@@ -12,6 +12,7 @@ Covers:
 """
 
 import time
+import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
@@ -79,6 +80,56 @@ class TestSemanticResponseCache:
             cache.put("u1", f"q{i}", [float(i), 0.0, 0.0], f"a{i}", [])
         assert cache.size <= 3
 
+    def test_eviction_is_lru(self):
+        from core.rag.response_cache import SemanticResponseCache
+        cache = SemanticResponseCache(
+            similarity_threshold=0.99, max_entries=2, ttl_seconds=0,
+        )
+        cache.put("u1", "q0", [1.0, 0.0, 0.0], "a0", [])
+        cache.put("u1", "q1", [0.0, 1.0, 0.0], "a1", [])
+        # Touch q0 so q1 becomes the least recently used entry
+        assert cache.get("u1", "q0", [1.0, 0.0, 0.0]) is not None
+        cache.put("u1", "q2", [0.0, 0.0, 1.0], "a2", [])
+        assert cache.get("u1", "q0", [1.0, 0.0, 0.0]) is not None
+        assert cache.get("u1", "q1", [0.0, 1.0, 0.0]) is None
+
+    def test_cosine_similarity(self):
+        from core.rag.response_cache import SemanticResponseCache
+        cos = SemanticResponseCache._cosine_similarity
+        assert cos([1.0, 0.0], [2.0, 0.0]) == pytest.approx(1.0)
+        assert cos([1.0, 0.0], [0.0, 1.0]) == pytest.approx(0.0)
+        assert cos([1.0, 1.0], [1.0, 0.0]) == pytest.approx(0.7071, abs=1e-4)
+        assert cos([0.0, 0.0], [1.0, 0.0]) == 0.0
+
+    def test_entries_store_float32_embeddings(self):
+        import numpy as np
+        from core.rag.response_cache import SemanticResponseCache
+        cache = SemanticResponseCache()
+        cache.put("u1", "q", [1.0, 0.0, 0.0], "a", [])
+        entry = next(iter(cache._entries["u1"].values()))
+        assert entry.embedding.dtype == np.float32
+        with pytest.raises(AttributeError):
+            entry.answer = "changed"
+
+    def test_dimension_change_invalidates_cache(self):
+        from core.rag.response_cache import SemanticResponseCache
+        cache = SemanticResponseCache(similarity_threshold=0.99)
+        cache.put("u1", "q", [1.0, 0.0, 0.0], "a", [])
+        cache.put("u2", "q", [1.0, 0.0, 0.0], "a", [])
+        assert cache.get("u1", "q", [1.0, 0.0]) is None
+        assert cache.size == 0
+
+    def test_model_change_invalidates_cache(self):
+        from core.rag.response_cache import SemanticResponseCache
+        cache = SemanticResponseCache(similarity_threshold=0.99)
+        emb = [1.0, 0.0, 0.0]
+        cache.put("u1", "q", emb, "a", [], model_id="model-a")
+        assert cache.get("u1", "q", emb, model_id="model-a") is not None
+        assert cache.get("u1", "q", emb) is not None
+        cache.put("u1", "q2", emb, "a2", [], model_id="model-b")
+        assert cache.size == 1
+        assert cache.get("u1", "q2", emb, model_id="model-b")[0] == "a2"
+
     def test_invalidate(self):
         from core.rag.response_cache import SemanticResponseCache
         cache = SemanticResponseCache()
@@ -122,6 +173,25 @@ class TestSelfRAG:
         v = VerificationResult(sufficient=True)
         assert "sufficient=True" in repr(v)
 
+    def test_verification_result_is_immutable_and_hashable(self):
+        import dataclasses
+        from core.rag.self_rag import VerificationResult
+
+        v = VerificationResult(sufficient=False, reason="x", reformulated_query="q")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            v.sufficient = True
+        assert v == VerificationResult(False, "x", "q")
+        assert len({v, VerificationResult(False, "x", "q")}) == 1
+
+    def test_parse_verdict_fills_query_per_call(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        a = RetrievalVerifier._parse_verdict("INSUFFICIENT: off topic", "query a")
+        b = RetrievalVerifier._parse_verdict("INSUFFICIENT: off topic", "query b")
+        assert (a.reformulated_query, b.reformulated_query) == ("query a", "query b")
+        assert RetrievalVerifier._parse_verdict("SUFFICIENT", "x") is \
+            RetrievalVerifier._parse_verdict("SUFFICIENT", "y")
+
     def test_verifier_returns_sufficient_on_good_context(self):
         from core.rag.self_rag import RetrievalVerifier, VerificationResult
 
@@ -177,6 +247,390 @@ class TestSelfRAG:
         assert len(results) > 0
         assert search_fn.call_count >= 2
 
+    def test_speculative_search_reused_when_reformulation_matches(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier, VerificationResult
+
+        verifier = Mock(spec=RetrievalVerifier)
+        verifier.verify.side_effect = [
+            VerificationResult(sufficient=False, reformulated_query="PCA dimensionality reduction"),
+            VerificationResult(sufficient=True),
+        ]
+        controller = SelfRAGController(verifier=verifier, max_retries=2, speculative=True)
+
+        queries = []
+        def search_fn(query, **kwargs):
+            queries.append(query)
+            return [_make_result(content=query)]
+
+        results = controller.search_with_verification(
+            "What is PCA dimensionality reduction?", search_fn,
+        )
+        assert results[0].chunk.content == "pca dimensionality reduction"
+        # Original search + one speculative prefetch per verify round
+        assert queries[:2] == [
+            "What is PCA dimensionality reduction?", "pca dimensionality reduction",
+        ]
+
+    def test_speculative_search_discarded_when_reformulation_differs(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier, VerificationResult
+
+        verifier = Mock(spec=RetrievalVerifier)
+        verifier.verify.side_effect = [
+            VerificationResult(sufficient=False, reformulated_query="eigenvectors of covariance"),
+            VerificationResult(sufficient=True),
+        ]
+        controller = SelfRAGController(verifier=verifier, max_retries=1, speculative=True)
+
+        results = controller.search_with_verification(
+            "What is PCA?", lambda query, **kw: [_make_result(content=query)],
+        )
+        assert results[0].chunk.content == "eigenvectors of covariance"
+
+    def test_verify_batch_single_llm_call(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content=(
+            '[{"id": 0, "verdict": "SUFFICIENT"},'
+            ' {"id": 1, "verdict": "REFORMULATE", "reformulated": "better q"},'
+            ' {"id": 2, "verdict": "INSUFFICIENT", "reason": "off topic"}]'
+        ))
+        verifier = RetrievalVerifier(llm=mock_llm)
+        verdicts = verifier.verify_batch([
+            ("q0", [_make_result()]),
+            ("q1", [_make_result()]),
+            ("q2", [_make_result()]),
+            ("q3", []),
+        ])
+        assert mock_llm.invoke.call_count == 1
+        assert verdicts[0].sufficient
+        assert verdicts[1].reformulated_query == "better q"
+        assert verdicts[2].reason == "off topic"
+        assert verdicts[3].reason == "too_few_results"
+
+    def test_verify_batch_falls_back_per_item_on_bad_json(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = [
+            Mock(content="not json"),
+            Mock(content="SUFFICIENT"),
+            Mock(content="REFORMULATE: retry me"),
+        ]
+        verifier = RetrievalVerifier(llm=mock_llm)
+        verdicts = verifier.verify_batch([
+            ("q0", [_make_result()]),
+            ("q1", [_make_result()]),
+        ])
+        assert verdicts[0].sufficient
+        assert verdicts[1].reformulated_query == "retry me"
+
+    def test_verify_batch_runs_local_gates_once_per_item(self):
+        from core.rag.self_rag import RetrievalVerifier
+        from core.vectors import EmbeddingService
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = [
+            Mock(content='[{"id": 1, "verdict": "SUFFICIENT"}]'),
+            Mock(content="INSUFFICIENT: nope"),
+        ]
+        verifier = RetrievalVerifier(
+            llm=mock_llm, absolute_scores=True,
+            embedding_service=EmbeddingService(provider="mock"),
+        )
+        verdicts = verifier.verify_batch([
+            ("what is pca", [_make_result(content="what is pca", score=0.6)]),
+            ("q1", [_make_result(content="lecture logistics", score=0.6)]),
+            ("q2", [_make_result(content="exam schedule", score=0.6)]),
+        ])
+
+        assert verdicts[0].reason == "embedding_similarity"
+        assert verdicts[1].sufficient
+        assert verdicts[2].reason == "nope"
+        # The item missing from the batch reply is judged alone, not re-gated
+        assert mock_llm.invoke.call_count == 2
+        assert verifier.prefilter_stats == {"llm": 3}
+        assert verifier.cache.misses == 3
+
+    def test_verifier_sends_static_system_prefix(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="SUFFICIENT")
+        verifier = RetrievalVerifier(llm=mock_llm)
+        verifier.verify("What is PCA?", [_make_result(content="pca text")])
+        verifier.verify("What is SVD?", [_make_result(content="svd text")])
+
+        first, second = (c.args[0] for c in mock_llm.invoke.call_args_list)
+        assert first[0].type == "system"
+        assert first[0].content == second[0].content
+        assert "What is PCA?" in first[1].content
+        assert "What is PCA?" not in first[0].content
+
+    def test_verifier_cache_skips_repeat_judgment(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="REFORMULATE: better query")
+        verifier = RetrievalVerifier(llm=mock_llm)
+        results = [_make_result(chunk_idx=0), _make_result(chunk_idx=1)]
+
+        first = verifier.verify("What is PCA?", results)
+        second = verifier.verify("  what is   pca? ", list(reversed(results)))
+        assert mock_llm.invoke.call_count == 1
+        assert second.reformulated_query == first.reformulated_query == "better query"
+
+        verifier.verify("What is PCA?", [_make_result(chunk_idx=2)])
+        assert mock_llm.invoke.call_count == 2
+
+    def test_verifier_cache_near_duplicate_query(self):
+        from core.rag.self_rag import VerifierCache, VerificationResult
+
+        vectors = {"explain derivatives": [1.0, 0.0], "explain derivative": [0.99, 0.01],
+                   "explain integrals": [0.0, 1.0]}
+        cache = VerifierCache(embed_fn=lambda q: vectors[q])
+        results = [_make_result()]
+        cache.put("explain derivatives", results, VerificationResult(sufficient=True))
+
+        assert cache.get("explain derivative", results).sufficient
+        assert cache.get("explain integrals", results) is None
+        assert cache.get("explain derivative", [_make_result(chunk_idx=3)]) is None
+
+    def test_verifier_does_not_cache_failures(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = [RuntimeError("timeout"), Mock(content="INSUFFICIENT: off topic")]
+        verifier = RetrievalVerifier(llm=mock_llm)
+        assert verifier.verify("q", [_make_result()]).sufficient
+        assert not verifier.verify("q", [_make_result()]).sufficient
+
+    def test_rate_limit_tracker_pauses_near_exhaustion(self):
+        from core.rag.self_rag import RateLimitTracker
+
+        tracker = RateLimitTracker(min_tokens=5000)
+        with patch("core.rag.self_rag.time.sleep") as mock_sleep:
+            tracker.record({"x-ratelimit-remaining-tokens": "90000",
+                            "x-ratelimit-reset-tokens": "1s"})
+            tracker.wait()
+            mock_sleep.assert_not_called()
+
+            tracker.record({"x-ratelimit-remaining-tokens": "100",
+                            "x-ratelimit-reset-tokens": "0m20s"})
+            tracker.wait()
+            assert 15 < mock_sleep.call_args[0][0] <= 20
+
+    def test_verifier_retries_rate_limit_before_judging(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        class FakeRateLimit(Exception):
+            status_code = 429
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = [FakeRateLimit("slow down"), Mock(content="INSUFFICIENT: off topic")]
+        verifier = RetrievalVerifier(llm=mock_llm, use_cache=False)
+        from core.rag.self_rag import RateLimitTracker
+        with patch("core.rag.self_rag.time.sleep"), \
+                patch("core.rag.self_rag._rate_limiter", RateLimitTracker()):
+            result = verifier.verify("q", [_make_result()])
+        assert mock_llm.invoke.call_count == 2
+        assert not result.sufficient
+
+    def test_verifier_int8_early_exit_skips_llm(self):
+        from core.rag.self_rag import RetrievalVerifier
+        from core.vectors import EmbeddingService
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="INSUFFICIENT: nope")
+        verifier = RetrievalVerifier(
+            llm=mock_llm, use_cache=False,
+            embedding_service=EmbeddingService(provider="mock"),
+        )
+
+        matched = verifier.verify("what is pca", [_make_result(content="what is pca", score=0.6)])
+        assert matched.sufficient and matched.reason == "embedding_similarity"
+        mock_llm.invoke.assert_not_called()
+
+        verifier.verify("what is pca", [_make_result(content="unrelated lecture logistics", score=0.6)])
+        assert mock_llm.invoke.call_count == 1
+
+    def test_verifier_prefilter_settles_clear_cases_locally(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="SUFFICIENT")
+        verifier = RetrievalVerifier(llm=mock_llm, use_cache=False, absolute_scores=True)
+
+        good = verifier.verify(
+            "what is pca", [_make_result(content="PCA is what reduces dimensions", score=0.9)]
+        )
+        assert good.sufficient and good.reason == "prefilter"
+
+        bad = verifier.verify(
+            "what is pca", [_make_result(content="lecture logistics", score=0.2)]
+        )
+        assert not bad.sufficient and bad.reason == "low_scores"
+        assert bad.reformulated_query == "what is pca"
+        mock_llm.invoke.assert_not_called()
+
+        verifier.verify("what is pca", [_make_result(content="lecture logistics", score=0.6)])
+        assert mock_llm.invoke.call_count == 1
+        assert verifier.prefilter_stats == {"accept": 1, "reject": 1, "llm": 1}
+
+    def test_verifier_prefilter_skips_relative_scores_and_empty_results(self):
+        from core.rag.self_rag import RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="SUFFICIENT")
+
+        # Hybrid scores are normalized per query: a top score of 1.0 says nothing
+        verifier = RetrievalVerifier(llm=mock_llm, use_cache=False)
+        verifier.verify("what is pca", [_make_result(content="PCA is what reduces dimensions", score=1.0)])
+        assert mock_llm.invoke.call_count == 1
+        assert not verifier.prefilter_stats
+
+        verifier = RetrievalVerifier(llm=mock_llm, use_cache=False, absolute_scores=True)
+        assert verifier._prefilter("what is pca", []) is None
+        assert verifier.verify("what is pca", [], min_results=0).sufficient
+
+    def test_context_preview_respects_total_budget(self):
+        from core.rag.self_rag import RetrievalVerifier, PREVIEW_BUDGET_CHARS
+
+        results = [_make_result(chunk_idx=i, content="x" * 2000) for i in range(5)]
+        preview = RetrievalVerifier._context_preview(results)
+        assert len(preview.replace("\n", "")) == PREVIEW_BUDGET_CHARS
+        assert RetrievalVerifier._context_preview([_make_result(content="short")]) == "short"
+
+    def test_context_preview_compression_falls_back_to_extracts(self):
+        from core.rag.self_rag import RetrievalVerifier, PREVIEW_EXTRACT_CHARS
+
+        content = "A" * 300 + "B" * 300
+        with patch("core.rag.self_rag._get_summarizer", return_value=None):
+            preview = RetrievalVerifier._context_preview(
+                [_make_result(content=content)], compress=True
+            )
+        assert preview == "A" * PREVIEW_EXTRACT_CHARS + " ... " + "B" * PREVIEW_EXTRACT_CHARS
+
+        summarizer = Mock(return_value=[{"summary_text": "s1"}, {"summary_text": "s2"}])
+        with patch("core.rag.self_rag._get_summarizer", return_value=summarizer):
+            preview = RetrievalVerifier._context_preview(
+                [_make_result(chunk_idx=i, content=content) for i in range(2)], compress=True
+            )
+        assert preview == "s1\ns2"
+        summarizer.assert_called_once()
+
+    def test_fan_out_searches_reformulations_in_one_round(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content=json.dumps({
+            "sufficient": False, "reason": "off topic",
+            "reformulations": ["pca variance", "principal components", "pca variance"],
+        }))
+        controller = SelfRAGController(
+            verifier=RetrievalVerifier(llm=mock_llm, use_cache=False), fan_out=3
+        )
+
+        # Scores in the pre-filter's ambiguous band, so the judge is consulted
+        def search_fn(query, **kwargs):
+            if query == "principal components":
+                return [_make_result(chunk_idx=i, content=query, score=0.6) for i in range(3)]
+            return [_make_result(chunk_idx=0, content=query, score=0.6)]
+
+        results = controller.search_with_verification("What is PCA?", search_fn)
+        assert mock_llm.invoke.call_count == 1
+        assert results[0].chunk.content == "principal components"
+
+    def test_fan_out_prefilter_settles_clear_cases_without_judge(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier
+
+        mock_llm = Mock()
+        verifier = RetrievalVerifier(llm=mock_llm, use_cache=False, absolute_scores=True)
+        controller = SelfRAGController(verifier=verifier, fan_out=3)
+
+        good = [_make_result(content="PCA is what reduces dimensions", score=0.9)]
+        search_fn = Mock(return_value=good)
+        assert controller.search_with_verification("what is pca", search_fn) == good
+
+        bad = [_make_result(content="lecture logistics", score=0.2)]
+        search_fn = Mock(return_value=bad)
+        assert controller.search_with_verification("what is pca", search_fn) == bad
+        assert search_fn.call_count == 1
+
+        mock_llm.invoke.assert_not_called()
+        assert verifier.prefilter_stats == {"accept": 1, "reject": 1}
+
+    def test_fan_out_keeps_results_when_sufficient(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content='{"sufficient": true, "reformulations": []}')
+        controller = SelfRAGController(
+            verifier=RetrievalVerifier(llm=mock_llm, use_cache=False), fan_out=3
+        )
+        search_fn = Mock(return_value=[_make_result()])
+
+        controller.search_with_verification("What is PCA?", search_fn)
+        assert search_fn.call_count == 1
+
+    @patch("core.rag.pipeline.ChunkRepository")
+    @patch("core.rag.pipeline.DocumentManager")
+    @patch("core.rag.pipeline.SemanticSearchService")
+    def test_pipeline_fan_out_is_opt_in(self, MockSS, MockDM, MockCR):
+        from core.rag.pipeline import RAGPipeline
+
+        flags = dict(
+            search_service=MockSS(),
+            document_manager=MockDM(),
+            use_hybrid_search=False,
+            use_query_rewriting=False,
+            use_query_decomposition=False,
+            use_response_cache=False,
+            use_propositions=False,
+            use_knowledge_graph=False,
+        )
+        assert RAGPipeline(**flags).self_rag.fan_out == 0
+        assert RAGPipeline(**flags, self_rag_fan_out=3).self_rag.fan_out == 3
+
+    @patch("core.rag.pipeline.ChunkRepository")
+    @patch("core.rag.pipeline.DocumentManager")
+    @patch("core.rag.pipeline.SemanticSearchService")
+    def test_pipeline_prefilters_only_absolute_scores(self, MockSS, MockDM, MockCR):
+        from core.rag.pipeline import RAGPipeline
+
+        flags = dict(
+            search_service=MockSS(),
+            document_manager=MockDM(),
+            use_query_rewriting=False,
+            use_query_decomposition=False,
+            use_response_cache=False,
+            use_propositions=False,
+            use_knowledge_graph=False,
+        )
+        vector = RAGPipeline(**flags, use_hybrid_search=False)
+        hybrid = RAGPipeline(**flags, use_hybrid_search=True)
+        assert vector.self_rag.verifier.absolute_scores
+        assert not hybrid.self_rag.verifier.absolute_scores
+
+    def test_controller_batch_search(self):
+        from core.rag.self_rag import SelfRAGController, RetrievalVerifier, VerificationResult
+
+        verifier = Mock(spec=RetrievalVerifier)
+        verifier.verify_batch.side_effect = [
+            [VerificationResult(sufficient=True),
+             VerificationResult(sufficient=False, reformulated_query="q1 better")],
+            [VerificationResult(sufficient=True)],
+        ]
+        controller = SelfRAGController(verifier=verifier, max_retries=2)
+
+        def search_fn(query, **kwargs):
+            return [_make_result(content=query)]
+
+        results = controller.search_batch_with_verification(["q0", "q1"], search_fn)
+        assert results[0][0].chunk.content == "q0"
+        assert results[1][0].chunk.content == "q1 better"
+        assert verifier.verify_batch.call_count == 2
+
 
 # ---------------------------------------------------------------------------
 # 3. Query Decomposition
@@ -243,6 +697,78 @@ class TestQueryDecomposition:
         doc1_result = next(r for r in results if r.chunk.document_id == "doc1")
         assert doc1_result.score == 0.95
 
+    def test_retrieve_with_decomposition_keeps_top_k_by_score(self):
+        from core.rag.query_decomposer import QueryDecomposer, retrieve_with_decomposition
+
+        decomposer = Mock(spec=QueryDecomposer)
+        decomposer.decompose.return_value = ["q", "sub one", "sub two"]
+
+        batches = iter([
+            [_make_result("doc1", 0, score=0.4), _make_result("doc1", 1, score=0.9)],
+            [_make_result("doc2", 0, score=0.7), _make_result("doc1", 0, score=0.8)],
+            [_make_result("doc3", 0, score=0.1)],
+        ])
+        results = retrieve_with_decomposition(
+            "q", search_fn=lambda **kw: next(batches), decomposer=decomposer, top_k=3,
+        )
+        assert [r.score for r in results] == [0.9, 0.8, 0.7]
+        assert [r.rank for r in results] == [1, 2, 3]
+
+    def test_simple_verdict_is_memoized(self):
+        from core.rag.query_decomposer import QueryDecomposer
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="SIMPLE")
+        decomposer = QueryDecomposer(llm=mock_llm)
+
+        assert decomposer.decompose("What is PCA?") == ["What is PCA?"]
+        assert decomposer.decompose("what is pca?") == ["what is pca?"]
+        assert mock_llm.invoke.call_count == 1
+
+    @pytest.mark.parametrize("query", [
+        "PCA vs. t-SNE?",
+        "How does PCA differ from t-SNE",
+    ])
+    def test_short_comparison_queries_reach_llm(self, query):
+        from core.rag.query_decomposer import QueryDecomposer
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(
+            content="1. What is PCA and how does it work?\n"
+                    "2. What is t-SNE and how does it work?"
+        )
+        decomposer = QueryDecomposer(llm=mock_llm)
+
+        assert len(decomposer.decompose(query)) == 3
+        mock_llm.invoke.assert_called_once()
+
+    def test_decomposition_is_memoized(self):
+        from core.rag.query_decomposer import QueryDecomposer
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(
+            content="1. What is PCA and how does it work?\n"
+                    "2. What is t-SNE and how does it work?"
+        )
+        decomposer = QueryDecomposer(llm=mock_llm)
+
+        first = decomposer.decompose("Compare PCA and t-SNE")
+        second = decomposer.decompose("  compare PCA and t-SNE ")
+        assert mock_llm.invoke.call_count == 1
+        assert second[0] == "  compare PCA and t-SNE "
+        assert second[1:] == first[1:]
+
+    def test_decomposition_cache_is_bounded(self):
+        from core.rag.query_decomposer import QueryDecomposer
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content="SIMPLE")
+        decomposer = QueryDecomposer(llm=mock_llm, cache_size=2)
+
+        for topic in ("PCA", "SVD", "LDA"):
+            decomposer.decompose(f"Compare {topic} and k-means")
+        assert len(decomposer._cache) == 2
+
 
 # ---------------------------------------------------------------------------
 # 4. Retrieval Feedback
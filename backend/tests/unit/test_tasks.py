@@ -0,0 +1,417 @@
+"""
+Tests for Celery background tasks.
+
+Covers:
+- Worker lifecycle: cheap post-fork reset, preparation before the first task,
+  ACADEME_SKIP_WARMUP
+- enqueue_memory_update: queueing, flush scheduling, fallback without Redis
+- flush_user_memory_batch: drain order, grouping, keep-for-retry, resume on retry
+- ContextManager.update_context_batch: single save, progress tracked after save
+"""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from celery.exceptions import Retry
+
+from core import tasks
+from core.memory.context_manager import ContextManager
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis list/string commands the tasks use."""
+
+    def __init__(self):
+        self.lists = {}
+        self.strings = {}
+        self.expiries = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def lrange(self, key, start, end):
+        items = self.lists.get(key, [])
+        return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def lmove(self, src, dst, wherefrom, whereto):
+        items = self.lists.get(src)
+        if not items:
+            return None
+        value = items.pop(0 if wherefrom == "LEFT" else -1)
+        target = self.lists.setdefault(dst, [])
+        if whereto == "RIGHT":
+            target.append(value)
+        else:
+            target.insert(0, value)
+        return value
+
+    def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        for i in range(len(items) - 1, -1, -1) if count < 0 else range(len(items)):
+            if items[i] == value:
+                del items[i]
+                return 1
+        return 0
+
+    def delete(self, key):
+        existed = key in self.lists or key in self.strings
+        self.lists.pop(key, None)
+        self.strings.pop(key, None)
+        return int(existed)
+
+    def expire(self, key, seconds):
+        self.expiries[key] = seconds
+        return True
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute()."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((getattr(self._redis, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [fn(*args, **kwargs) for fn, args, kwargs in self._calls]
+
+
+def _item(conversation_id, query):
+    return json.dumps({
+        "conversation_id": conversation_id,
+        "interaction": {"query": query},
+    })
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch.object(tasks, "_get_redis", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def context_manager():
+    manager = MagicMock()
+    manager.update_context_batch.return_value = True
+    with patch.dict(tasks._services, {"context_manager": manager}):
+        yield manager
+
+
+@pytest.fixture
+def flush_request():
+    """Run the bound flush task with a fixed task ID, as a worker would."""
+    task = tasks.flush_user_memory_batch
+    task.push_request(id="task-1", retries=0)
+    yield task
+    task.pop_request()
+
+
+QUEUE_KEY = tasks.MEMORY_QUEUE_KEY_TPL.format(user_id="u1")
+PROCESSING_KEY = tasks.MEMORY_PROCESSING_KEY_TPL.format(user_id="u1", task_id="task-1")
+
+
+# ===================================================================
+# Worker lifecycle
+# ===================================================================
+
+class TestWorkerLifecycle:
+
+    @pytest.fixture(autouse=True)
+    def isolated_worker_state(self):
+        with patch.dict(tasks._services, clear=True), \
+                patch.object(tasks, "_redis_client", None):
+            yield
+
+    @pytest.fixture
+    def factories(self):
+        built = {name: MagicMock() for name in tasks._SERVICE_FACTORIES}
+        with patch.dict(tasks._SERVICE_FACTORIES, built), \
+                patch("core.database.init_database"):
+            yield built
+
+    def test_process_init_resets_inherited_state_then_prepares(self):
+        tasks._services["search_service"] = MagicMock()
+        tasks._redis_client = MagicMock()
+
+        seen = {}
+
+        def record_state():
+            seen.update(services=dict(tasks._services), redis=tasks._redis_client)
+
+        with patch.object(tasks, "init_worker_services", side_effect=record_state) as init:
+            tasks.prepare_worker_process()
+
+        init.assert_called_once()
+        assert seen == {"services": {}, "redis": None}
+
+    def test_memory_worker_builds_only_memory_services(self, factories, monkeypatch):
+        monkeypatch.delenv("ACADEME_SKIP_WARMUP", raising=False)
+        tasks.init_worker_services(queues=["memory", "default"])
+
+        assert set(tasks._services) == {"context_manager", "progress_repo"}
+        factories["search_service"].assert_not_called()
+
+    def test_documents_worker_warms_local_embeddings(self, factories, monkeypatch):
+        monkeypatch.delenv("ACADEME_SKIP_WARMUP", raising=False)
+        embeddings = factories["search_service"].return_value.embedding_service
+        embeddings.provider = "sentence-transformers"
+
+        tasks.init_worker_services(queues=["documents"])
+
+        assert set(tasks._services) == {"doc_manager", "doc_repo", "chunk_repo", "search_service"}
+        embeddings.generate_embedding.assert_called_once_with("warmup")
+
+    def test_remote_provider_is_not_warmed(self, factories, monkeypatch):
+        monkeypatch.delenv("ACADEME_SKIP_WARMUP", raising=False)
+        embeddings = factories["search_service"].return_value.embedding_service
+        embeddings.provider = "gemini"
+
+        tasks.init_worker_services(queues=["documents"])
+
+        embeddings.generate_embedding.assert_not_called()
+
+    def test_defaults_to_consumed_queues(self, factories):
+        with patch.object(tasks, "_consumed_queues", return_value=["memory"]):
+            tasks.init_worker_services()
+
+        assert set(tasks._services) == {"context_manager", "progress_repo"}
+
+    def test_skip_warmup_env_var(self, monkeypatch):
+        monkeypatch.setenv("ACADEME_SKIP_WARMUP", "1")
+        with patch.object(tasks, "_service") as service:
+            tasks._warmup_worker()
+
+        service.assert_not_called()
+
+    def test_warmup_failure_is_not_fatal(self, monkeypatch):
+        monkeypatch.delenv("ACADEME_SKIP_WARMUP", raising=False)
+        with patch.object(tasks, "_service", side_effect=RuntimeError("offline")):
+            tasks._warmup_worker()
+
+    @pytest.mark.parametrize("pool_module,expected_calls", [
+        ("celery.concurrency.prefork", 0),
+        ("celery.concurrency.solo", 1),
+    ])
+    def test_worker_ready_prepares_only_non_forking_pools(self, pool_module, expected_calls):
+        pool = type("Pool", (), {"__module__": pool_module})()
+        with patch.object(tasks, "init_worker_services") as init:
+            tasks.warmup_non_forking_worker(sender=MagicMock(pool=pool))
+
+        assert init.call_count == expected_calls
+
+
+# ===================================================================
+# enqueue_memory_update
+# ===================================================================
+
+class TestEnqueueMemoryUpdate:
+
+    def test_first_item_schedules_flush(self, fake_redis):
+        with patch.object(tasks.flush_user_memory_batch, "apply_async") as apply_async:
+            apply_async.return_value = MagicMock(id="flush-1")
+            task_id = tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+
+        assert task_id == "flush-1"
+        assert apply_async.call_args.kwargs["args"] == ["u1"]
+        assert fake_redis.lists[QUEUE_KEY] == [_item("c1", "q1")]
+
+    def test_later_items_join_pending_flush(self, fake_redis):
+        with patch.object(tasks.flush_user_memory_batch, "apply_async") as apply_async:
+            apply_async.return_value = MagicMock(id="flush-1")
+            tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+            second = tasks.enqueue_memory_update("u1", "c1", {"query": "q2"})
+
+        assert second is None
+        assert apply_async.call_count == 1
+        assert len(fake_redis.lists[QUEUE_KEY]) == 2
+
+    def test_falls_back_to_single_task_without_redis(self):
+        with patch.object(tasks, "_get_redis", side_effect=ConnectionError("down")), \
+                patch.object(tasks.update_memory_task, "delay") as delay:
+            delay.return_value = MagicMock(id="single-1")
+            task_id = tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+
+        assert task_id == "single-1"
+        delay.assert_called_once_with(
+            user_id="u1", conversation_id="c1", interaction={"query": "q1"}
+        )
+
+    def test_schedule_failure_takes_item_back_before_fallback(self, fake_redis):
+        with patch.object(tasks.flush_user_memory_batch, "apply_async",
+                          side_effect=ConnectionError("broker down")), \
+                patch.object(tasks.update_memory_task, "delay") as delay:
+            delay.return_value = MagicMock(id="single-1")
+            task_id = tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+
+        assert task_id == "single-1"
+        assert fake_redis.lists[QUEUE_KEY] == []
+
+    def test_schedule_failure_leaves_claimed_item_queued(self, fake_redis):
+        def flush_claims_item(*args, **kwargs):
+            # A running flush took the item before we could take it back
+            fake_redis.lists[QUEUE_KEY].clear()
+            raise ConnectionError("broker down")
+
+        with patch.object(tasks.flush_user_memory_batch, "apply_async",
+                          side_effect=flush_claims_item), \
+                patch.object(tasks.update_memory_task, "delay") as delay:
+            task_id = tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+
+        assert task_id is None
+        delay.assert_not_called()
+
+    def test_lock_failure_without_lrem_leaves_item_queued(self, fake_redis):
+        with patch.object(fake_redis, "set", side_effect=ConnectionError("down")), \
+                patch.object(fake_redis, "lrem", side_effect=ConnectionError("down")), \
+                patch.object(tasks.update_memory_task, "delay") as delay:
+            task_id = tasks.enqueue_memory_update("u1", "c1", {"query": "q1"})
+
+        assert task_id is None
+        delay.assert_not_called()
+        assert fake_redis.lists[QUEUE_KEY] == [_item("c1", "q1")]
+
+
+# ===================================================================
+# flush_user_memory_batch
+# ===================================================================
+
+class TestFlushUserMemoryBatch:
+
+    def test_drains_queue_in_order_grouped_by_conversation(
+        self, fake_redis, context_manager, flush_request
+    ):
+        fake_redis.rpush(
+            QUEUE_KEY, _item("c1", "q1"), _item("c2", "q2"), _item("c1", "q3")
+        )
+
+        result = flush_request.run("u1")
+
+        assert result["status"] == "success"
+        assert result["applied"] == 3
+        calls = [c.args for c in context_manager.update_context_batch.call_args_list]
+        assert calls == [
+            ("u1", "c1", [{"query": "q1"}, {"query": "q3"}]),
+            ("u1", "c2", [{"query": "q2"}]),
+        ]
+        assert not fake_redis.lists.get(QUEUE_KEY)
+        assert not fake_redis.lists.get(PROCESSING_KEY)
+
+    def test_drains_more_than_one_batch(self, fake_redis, context_manager, flush_request):
+        total = tasks.MEMORY_BATCH_MAX + 5
+        fake_redis.rpush(QUEUE_KEY, *(_item("c1", f"q{i}") for i in range(total)))
+
+        result = flush_request.run("u1")
+
+        assert result["applied"] == total
+        batches = context_manager.update_context_batch.call_args_list
+        assert [len(c.args[2]) for c in batches] == [tasks.MEMORY_BATCH_MAX, 5]
+        assert [i["query"] for c in batches for i in c.args[2]] == [
+            f"q{i}" for i in range(total)
+        ]
+
+    def test_failed_group_is_kept_for_retry(self, fake_redis, context_manager, flush_request):
+        fake_redis.rpush(QUEUE_KEY, _item("c1", "q1"), _item("c2", "q2"))
+        context_manager.update_context_batch.side_effect = (
+            lambda user_id, conversation_id, interactions: conversation_id == "c1"
+        )
+
+        with patch.object(flush_request, "retry", side_effect=Retry()) as retry:
+            with pytest.raises(Retry):
+                flush_request.run("u1")
+
+        retry.assert_called_once()
+        # Only the failed conversation is kept; c1's side effects already ran
+        assert fake_redis.lists[PROCESSING_KEY] == [_item("c2", "q2")]
+        assert not fake_redis.lists.get(QUEUE_KEY)
+
+    def test_retry_resumes_from_processing_list(
+        self, fake_redis, context_manager, flush_request
+    ):
+        fake_redis.rpush(PROCESSING_KEY, _item("c2", "q2"))
+        fake_redis.rpush(QUEUE_KEY, _item("c1", "q3"))
+
+        result = flush_request.run("u1")
+
+        assert result["applied"] == 2
+        calls = [c.args[1:] for c in context_manager.update_context_batch.call_args_list]
+        assert calls == [("c2", [{"query": "q2"}]), ("c1", [{"query": "q3"}])]
+        assert not fake_redis.lists.get(PROCESSING_KEY)
+
+    def test_malformed_item_is_dropped(self, fake_redis, context_manager, flush_request):
+        fake_redis.rpush(QUEUE_KEY, "not json", _item("c1", "q1"))
+
+        result = flush_request.run("u1")
+
+        assert result["applied"] == 1
+        assert not fake_redis.lists.get(PROCESSING_KEY)
+
+    def test_crash_leaves_items_claimed(self, fake_redis, context_manager, flush_request):
+        fake_redis.rpush(QUEUE_KEY, _item("c1", "q1"))
+        context_manager.update_context_batch.side_effect = RuntimeError("worker died")
+
+        with pytest.raises(RuntimeError):
+            flush_request.run("u1")
+
+        assert fake_redis.lists[PROCESSING_KEY] == [_item("c1", "q1")]
+
+
+# ===================================================================
+# ContextManager.update_context_batch
+# ===================================================================
+
+class TestUpdateContextBatch:
+
+    def _manager(self):
+        progress_repo = MagicMock()
+        progress_repo.get_memory_context.return_value = None
+        progress_repo.update_memory_context.return_value = True
+        return ContextManager(progress_repo=progress_repo, conversation_repo=MagicMock())
+
+    def test_saves_once_and_tracks_concepts(self):
+        manager = self._manager()
+        ok = manager.update_context_batch("u1", "c1", [
+            {"query": "q1", "concepts": ["pca"]},
+            {"query": "q2", "concepts": ["svd", "pca"]},
+        ])
+
+        assert ok is True
+        repo = manager.progress_repo
+        repo.update_memory_context.assert_called_once()
+        updates = repo.update_memory_context.call_args.kwargs["updates"]
+        assert updates["question_sequence"] == ["q1", "q2"]
+        concepts = [c.kwargs["concept"] for c in repo.track_concept_interaction.call_args_list]
+        assert concepts == ["pca", "svd", "pca"]
+
+    def test_failed_save_tracks_nothing(self):
+        manager = self._manager()
+        manager.progress_repo.update_memory_context.return_value = False
+
+        ok = manager.update_context_batch("u1", "c1", [{"query": "q1", "concepts": ["pca"]}])
+
+        assert ok is False
+        manager.progress_repo.track_concept_interaction.assert_not_called()
+
+    def test_tracking_error_still_reports_saved_context(self):
+        manager = self._manager()
+        manager.progress_repo.track_concept_interaction.side_effect = RuntimeError("db")
+
+        ok = manager.update_context_batch("u1", "c1", [{"concepts": ["pca"]}])
+
+        assert ok is True
@@ -132,6 +132,264 @@ class TestEmbeddingService:
         if len(results) >= 2:
             assert results[0][1] >= results[1][1]
 
+    def test_calculate_similarity_batch_matches_pairwise(self):
+        """Test the batched cosine matrix against pairwise similarity."""
+        service = EmbeddingService(provider="mock")
+        rng = np.random.default_rng(1)
+        queries = rng.normal(size=(3, 16))
+        docs = np.vstack([rng.normal(size=(4, 16)), np.zeros((1, 16))])
+
+        sims = service.calculate_similarity_batch(queries, docs)
+        assert sims.shape == (3, 5) and sims.dtype == np.float32
+        expected = [[service.calculate_similarity(q, d) for d in docs] for q in queries]
+        assert np.allclose(sims, expected, atol=1e-5)
+
+    def test_find_similar_matches_pairwise_ranking(self):
+        """Test vectorized find_similar against pairwise cosine similarity."""
+        service = EmbeddingService(provider="mock")
+        rng = np.random.default_rng(0)
+        query = rng.normal(size=64).tolist()
+        candidates = rng.normal(size=(20, 64)).tolist()
+        candidates.append([0.0] * 64)
+
+        pairwise = sorted(
+            ((i, service.calculate_similarity(query, c)) for i, c in enumerate(candidates)),
+            key=lambda x: x[1], reverse=True,
+        )
+        results = service.find_similar(query, candidates, top_k=5)
+        assert [i for i, _ in results] == [i for i, _ in pairwise[:5]]
+        assert np.allclose([s for _, s in results], [s for _, s in pairwise[:5]], atol=1e-5)
+
+        threshold = pairwise[2][1] - 1e-4
+        assert len(service.find_similar(query, candidates, top_k=10, threshold=threshold)) == 3
+        assert service.find_similar(query, [], top_k=5) == []
+
+    def test_find_similar_accepts_prepared_index(self):
+        """Test that a prepared corpus gives the same results as the raw list."""
+        service = EmbeddingService(provider="mock")
+        rng = np.random.default_rng(2)
+        candidates = rng.normal(size=(30, 32)).tolist()
+        index = service.build_index(candidates)
+
+        assert len(index) == 30 and index.matrix.dtype == np.float32
+        for query in rng.normal(size=(3, 32)).tolist():
+            assert service.find_similar(query, index, top_k=4) == \
+                service.find_similar(query, candidates, top_k=4)
+
+    def test_embed_int8_approximates_cosine(self):
+        """Test that int8 similarity tracks float cosine similarity."""
+        service = EmbeddingService(provider="mock")
+        texts = ["alpha", "beta", "gamma"]
+        q, q_scales = service.embed_int8(["alpha"])
+        m, m_scales = service.embed_int8(texts)
+
+        assert q.dtype == np.int8 and m.dtype == np.int8
+        approx = service.int8_similarity(q[0], q_scales[0], m, m_scales)
+        exact = [
+            service.calculate_similarity(service.generate_embedding("alpha"), service.generate_embedding(t))
+            for t in texts
+        ]
+        assert np.allclose(approx, exact, atol=0.02)
+
+    def test_embedding_cache_keys_are_ints_scoped_by_model(self):
+        """Test long-text cache keys are 64-bit ints that differ across models."""
+        a = EmbeddingService(provider="mock", model_name="model-a")
+        b = EmbeddingService(provider="mock", model_name="model-b")
+        text = "hello " * 50
+
+        key = a._get_cache_key(text)
+        assert isinstance(key, int) and 0 <= key < 2**64
+        assert key == a._get_cache_key(text)
+        assert key != b._get_cache_key(text)
+
+        a.generate_embedding(text)
+        assert key in a.cache
+
+    def test_short_text_cache_keys_skip_hashing(self):
+        """Test short texts are keyed by the model-scoped string itself."""
+        a = EmbeddingService(provider="mock", model_name="model-a")
+        b = EmbeddingService(provider="mock", model_name="model-b")
+
+        assert a._get_cache_key("what is AI") == "model-a:what is AI"
+        assert a._get_cache_key("what is AI") != b._get_cache_key("what is AI")
+
+        a.generate_embedding("what is AI")
+        assert "model-a:what is AI" in a.cache
+
+    def test_embedding_cache_evicts_least_recently_used(self):
+        """Test the embedding cache stays within cache_maxsize."""
+        service = EmbeddingService(provider="mock", cache_maxsize=2)
+        service.generate_embedding("a")
+        service.generate_embedding("b")
+        service.generate_embedding("a")  # Refresh "a"
+        service.generate_embedding("c")  # Evicts "b"
+
+        assert len(service.cache) == 2
+        assert service._get_cache_key("a") in service.cache
+        assert service._get_cache_key("b") not in service.cache
+
+    def test_embedding_cache_stores_float32_arrays(self):
+        """Test cached embeddings are compact float32 arrays, returned as lists."""
+        service = EmbeddingService(provider="mock")
+        first = service.generate_embedding("hello")
+        cached = service.cache[service._get_cache_key("hello")]
+
+        assert isinstance(cached, np.ndarray) and cached.dtype == np.float32
+        assert isinstance(first, list) and first == cached.tolist()
+        assert service.generate_embedding("hello") == first
+
+    def test_generate_embedding_does_not_hold_lock_during_provider_call(self):
+        """Test concurrent cache misses reach the provider in parallel."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        service = EmbeddingService(provider="mock")
+        barrier = threading.Barrier(2, timeout=5)
+        original = service._generate_mock_embedding
+
+        def slow_embedding(text):
+            barrier.wait()  # Deadlocks if calls are serialized
+            return original(text)
+
+        service._generate_mock_embedding = slow_embedding
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(service.generate_embedding, ["a", "b"]))
+
+        assert len(results) == 2 and len(service.cache) == 2
+
+    def test_concurrent_misses_for_same_text_share_one_provider_call(self):
+        """Test single-flight: duplicate in-flight texts hit the provider once."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        service = EmbeddingService(provider="mock")
+        release = threading.Event()
+        original = service._generate_mock_embedding
+        provider = Mock(side_effect=lambda text: release.wait(5) and original(text))
+        service._generate_mock_embedding = provider
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(service.generate_embedding, "same") for _ in range(4)]
+            while not service._inflight:
+                pass
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert provider.call_count == 1
+        assert all(r == results[0] for r in results)
+        assert not service._inflight
+
+    def test_micro_batch_coalesces_concurrent_remote_calls(self):
+        """Test that concurrent single-text OpenAI calls share batch requests."""
+        service = EmbeddingService(provider="mock", cache_embeddings=False)
+        service.provider = "openai"
+        service.micro_batch_size = 8
+        service.micro_batch_interval = 0.05
+        client = Mock()
+        client.embeddings.create.side_effect = lambda input, model: Mock(
+            data=[Mock(embedding=[float(len(text))] * 4) for text in input]
+        )
+        service._openai_client = client
+        service._start_micro_batcher()
+
+        texts = ["a" * n for n in range(1, 9)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(service.generate_embedding, texts))
+
+        assert results == [[float(n)] * 4 for n in range(1, 9)]
+        assert client.embeddings.create.call_count < len(texts)
+
+    def test_micro_batch_short_provider_response_does_not_hang(self):
+        """Test that a batch reply missing vectors falls back to per-text calls."""
+        service = EmbeddingService(provider="mock", cache_embeddings=False)
+        service.provider = "openai"
+        service.micro_batch_size = 4
+        service.micro_batch_interval = 0.05
+
+        def create(input, model):
+            if isinstance(input, list):
+                return Mock(data=[Mock(embedding=[float(len(t))] * 4) for t in input[:-1]])
+            return Mock(data=[Mock(embedding=[float(len(input))] * 4)])
+
+        client = Mock()
+        client.embeddings.create.side_effect = create
+        service._openai_client = client
+        service._start_micro_batcher()
+
+        # Queue directly so a regression times out instead of blocking callers
+        futures = []
+        for n in range(1, 5):
+            futures.append(concurrent.futures.Future())
+            service._batch_queue.put(("a" * n, futures[-1]))
+        results = [f.result(timeout=5) for f in futures]
+
+        assert results == [[float(n)] * 4 for n in range(1, 5)]
+
+    def test_disk_cache_serves_embeddings_across_instances(self, tmp_path):
+        """Test that a second service reads persisted embeddings from SQLite."""
+        path = str(tmp_path / "embeddings.sqlite")
+        first = EmbeddingService(provider="mock")
+        first._open_disk_cache(path)
+        expected = first.generate_embedding("persisted text")
+
+        second = EmbeddingService(provider="mock")
+        second._open_disk_cache(path)
+        second._generate_mock_embedding = Mock(side_effect=AssertionError("provider called"))
+
+        assert second.generate_embedding("persisted text") == expected
+
+    def test_agenerate_embedding_matches_sync(self):
+        """Test the async variant returns the sync path's cached vector."""
+        import asyncio
+
+        service = EmbeddingService(provider="mock")
+
+        assert asyncio.run(service.agenerate_embedding("async text")) == \
+            service.generate_embedding("async text")
+        assert len(service.cache) == 1
+
+    def test_agenerate_embedding_uses_async_openai_client(self):
+        """Test OpenAI async embeddings go through the async client and cache."""
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        service = EmbeddingService(provider="mock")
+        service.provider = "openai"
+        client = Mock()
+        client.embeddings.create = AsyncMock(
+            return_value=Mock(data=[Mock(embedding=[0.5, 0.25])])
+        )
+        service._async_openai_client = client
+
+        async def embed_concurrently():
+            return await asyncio.gather(
+                *(service.agenerate_embedding("same") for _ in range(3))
+            )
+
+        results = asyncio.run(embed_concurrently())
+
+        assert results == [[0.5, 0.25]] * 3
+        assert client.embeddings.create.await_count == 1
+        assert service.generate_embedding("same") == [0.5, 0.25]
+
+    def test_onnx_backend_falls_back_to_torch(self):
+        """Test that an unavailable ONNX backend falls back to PyTorch."""
+        model = Mock()
+        model.get_sentence_embedding_dimension.return_value = 384
+
+        def load(name, backend=None):
+            if backend:
+                raise ImportError("optimum not installed")
+            return model
+
+        with patch("core.vectors.embeddings.SENTENCE_TRANSFORMERS_AVAILABLE", True), \
+                patch("core.vectors.embeddings.SentenceTransformer", side_effect=load, create=True):
+            service = EmbeddingService(provider="sentence-transformers", backend="onnx")
+
+        assert service.model is model
+        assert service.backend == "torch"
+        assert service.embedding_dim == 384
+
     def test_get_model_info(self):
         """Test getting model information."""
         service = EmbeddingService(provider="mock", model_name="test-model")
@@ -190,6 +448,25 @@ class TestEmbeddingService:
                 assert isinstance(embeddings, list)
                 assert all(isinstance(emb, list) and len(emb) == 768 for emb in embeddings)
 
+    @pytest.mark.parametrize("env,setting,expected", [
+        ({"OMP_NUM_THREADS": "1"}, 6, None),
+        ({"MKL_NUM_THREADS": "2"}, None, None),
+        ({}, 6, 6),
+        ({"WEB_CONCURRENCY": "2"}, None, 4),
+        ({}, None, 8),
+    ])
+    def test_torch_thread_count(self, monkeypatch, env, setting, expected):
+        from core.vectors import embeddings
+
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "WEB_CONCURRENCY"):
+            monkeypatch.delenv(var, raising=False)
+        for var, value in env.items():
+            monkeypatch.setenv(var, value)
+        settings = Mock(embedding_torch_threads=setting)
+        with patch("core.config.settings.get_settings", return_value=settings), \
+                patch("os.cpu_count", return_value=8):
+            assert embeddings._torch_thread_count() == expected
+
 
 class TestHybridEmbeddingService:
     """Test HybridEmbeddingService."""
@@ -219,6 +496,38 @@ class TestHybridEmbeddingService:
         # Should concatenate both embeddings
         assert len(embedding) == 768 * 2  # Two mock models concatenated
 
+    def test_hybrid_embedding_applies_weights_in_order(self):
+        """Test each sub-embedding is scaled by its weight and kept in order."""
+        models = [
+            {"provider": "mock", "model_name": "model1"},
+            {"provider": "mock", "model_name": "model2"}
+        ]
+        service = HybridEmbeddingService(models, weights=[2.0, 0.5])
+        service.services[0].generate_embedding = Mock(return_value=[1.0, -1.0])
+        service.services[1].generate_embedding = Mock(return_value=[4.0])
+
+        assert service.generate_embedding("test") == [2.0, -2.0, 2.0]
+
+    def test_hybrid_embedding_queries_models_concurrently(self):
+        """Test sub-models run in parallel rather than back to back."""
+        import threading
+
+        models = [
+            {"provider": "mock", "model_name": "model1"},
+            {"provider": "mock", "model_name": "model2"}
+        ]
+        service = HybridEmbeddingService(models)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_embedding(text):
+            barrier.wait()  # Deadlocks unless both calls are in flight
+            return [1.0]
+
+        for sub in service.services:
+            sub.generate_embedding = slow_embedding
+
+        assert len(service.generate_embedding("test")) == 2
+
 
 class TestCreateEmbeddingService:
     """Test embedding service factory."""
@@ -279,6 +588,75 @@ class TestSemanticSearchService:
         assert service.chunk_repo is not None
         assert service.doc_repo is not None
 
+    def test_cross_encoder_rerank_batches_length_sorted_pairs(self, search_service):
+        """Test reranking scores longest-first batches and maps scores back."""
+        from types import SimpleNamespace
+
+        contents = ["short", "a much longer passage", "mid text"]
+        results = [
+            SimpleNamespace(chunk=SimpleNamespace(content=c), score=0.0, rank=0)
+            for c in contents
+        ]
+        predict = Mock(side_effect=lambda pairs, **kw: np.array([len(p[1]) for p in pairs]))
+        search_service._reranker = Mock(predict=predict)
+
+        reranked = search_service._rerank_with_cross_encoder("query", results)
+
+        pairs = predict.call_args.args[0]
+        assert [p[1] for p in pairs] == ["a much longer passage", "mid text", "short"]
+        assert predict.call_args.kwargs["batch_size"] == search_service.reranker_batch_size
+        assert [r.chunk.content for r in reranked] == ["a much longer passage", "mid text", "short"]
+        assert [r.score for r in reranked] == [21.0, 8.0, 5.0]
+        assert [r.rank for r in reranked] == [1, 2, 3]
+
+    def test_search_fetches_documents_in_one_batch(self, search_service):
+        """Test search resolves all hit documents with a single repository call."""
+        from core.models import Document, DocumentType
+
+        doc = Document(
+            id="doc_a",
+            user_id="user123",
+            filename="test.pdf",
+            original_filename="test.pdf",
+            file_path="/path/test.pdf",
+            file_size=1024,
+            file_hash="hash123",
+            document_type=DocumentType.PDF
+        )
+        search_service.pinecone_manager = Mock(search_similar_chunks=Mock(return_value=[
+            {"id": "doc_a_0", "score": 0.9, "metadata": {"content": "first chunk", "word_count": 7}},
+            {"id": "doc_a_1", "score": 0.8, "metadata": {"content": "second chunk"}},
+            {"id": "doc_b_0", "score": 0.7, "metadata": {"content": "missing doc"}},
+            {"id": "doc_c_0", "score": 0.1, "metadata": {"content": "below threshold"}},
+        ]))
+        search_service.doc_repo.get_documents = Mock(return_value={"doc_a": doc})
+
+        results = search_service.search("query", "user123")
+
+        search_service.doc_repo.get_documents.assert_called_once_with({"doc_a", "doc_b"})
+        assert [(r.chunk.chunk_index, r.chunk.content) for r in results] == [
+            (0, "first chunk"), (1, "second chunk")
+        ]
+        # Stored count is reused; older vectors without one fall back to splitting
+        assert [r.chunk.word_count for r in results] == [7, 2]
+
+    def test_find_similar_chunks_searches_with_chunk_embedding(self, search_service):
+        """Test the reference chunk's embedding, not an empty query, drives the search."""
+        from core.models import DocumentChunk
+
+        chunk = DocumentChunk(
+            document_id="doc_a", user_id="user123", chunk_index=0,
+            content="eigenvalues of a matrix", char_count=23, word_count=4
+        )
+        search_service.pinecone_manager = Mock(search_similar_chunks=Mock(return_value=[]))
+        expected = search_service.embedding_service.generate_embedding(chunk.content)
+
+        search_service.find_similar_chunks(chunk, "user123", top_k=3)
+
+        kwargs = search_service.pinecone_manager.search_similar_chunks.call_args.kwargs
+        assert kwargs["query_embedding"] == expected
+        assert kwargs["top_k"] == 4
+
     def test_index_document_generates_embeddings(self, search_service):
         """Test that indexing generates embeddings for all chunks."""
         from core.models import Document, DocumentChunk, DocumentType
@@ -316,6 +694,252 @@ class TestSemanticSearchService:
         # Should call update for each chunk
         assert search_service.chunk_repo.update_chunk_vectors.call_count == 3
 
+    def test_index_document_embeds_and_upserts_in_batches(self, search_service):
+        """Test that large documents are embedded and upserted batch by batch."""
+        from core.models import Document, DocumentChunk, DocumentType
+
+        doc = Document(
+            id="doc123",
+            user_id="user123",
+            filename="test.pdf",
+            original_filename="test.pdf",
+            file_path="/path/test.pdf",
+            file_size=1024,
+            file_hash="hash123",
+            document_type=DocumentType.PDF
+        )
+        chunks = [
+            DocumentChunk(
+                id=f"chunk{i}",
+                document_id="doc123",
+                user_id="user123",
+                chunk_index=i,
+                content=f"Content {i}",
+                char_count=100,
+                word_count=20
+            )
+            for i in range(5)
+        ]
+
+        search_service.embedding_service.generate_embeddings_batch = Mock(
+            side_effect=lambda texts, batch_size: [[0.1] * 4 for _ in texts]
+        )
+        search_service.pinecone_manager.index_document_chunks = Mock(return_value=True)
+
+        success, _ = search_service.index_document(
+            doc, chunks, embed_batch_size=2, upsert_batch_size=50
+        )
+
+        assert success is True
+        assert search_service.embedding_service.generate_embeddings_batch.call_count == 3
+        calls = search_service.pinecone_manager.index_document_chunks.call_args_list
+        assert [len(c.kwargs["chunks"]) for c in calls] == [2, 2, 1]
+        assert all(c.kwargs["batch_size"] == 50 for c in calls)
+        assert search_service.chunk_repo.update_chunk_vectors.call_count == 5
+
+
+    def test_index_document_pages_streams_and_reports_progress(self, search_service):
+        """Test that paged indexing upserts each page and advances chunks_indexed."""
+        from core.models import Document, DocumentChunk, DocumentType
+
+        doc = Document(
+            id="doc123",
+            user_id="user123",
+            filename="test.pdf",
+            original_filename="test.pdf",
+            file_path="/path/test.pdf",
+            file_size=1024,
+            file_hash="hash123",
+            document_type=DocumentType.PDF
+        )
+
+        def pages():
+            for start in (0, 3):
+                yield [
+                    DocumentChunk(
+                        id=f"chunk{i}",
+                        document_id="doc123",
+                        user_id="user123",
+                        chunk_index=i,
+                        content=f"Content {i}",
+                        char_count=100,
+                        word_count=20
+                    )
+                    for i in range(start, start + 3)
+                ]
+
+        search_service.pinecone_manager.index_document_chunks = Mock(return_value=True)
+
+        success, message = search_service.index_document_pages(doc, pages())
+
+        assert success is True
+        assert "6 chunks" in message
+        assert search_service.pinecone_manager.index_document_chunks.call_count == 2
+        progress = [
+            c.args[1]["chunks_indexed"]
+            for c in search_service.doc_repo.update_document.call_args_list
+            if "chunks_indexed" in c.args[1]
+        ]
+        assert progress == [3, 6]
+
+    def test_index_document_pages_empty_stream_fails(self, search_service):
+        from core.models import Document, DocumentType
+
+        doc = Document(
+            id="doc123", user_id="user123", filename="t.pdf",
+            original_filename="t.pdf", file_path="/p/t.pdf", file_size=1,
+            file_hash="h", document_type=DocumentType.PDF
+        )
+        success, _ = search_service.index_document_pages(doc, iter([]))
+        assert success is False
+
+
+class TestPineconeClientUpsert:
+    """Test PineconeClient upsert paths (index mocked)."""
+
+    @pytest.fixture
+    def client(self):
+        from core.vectors import PineconeClient
+
+        client = PineconeClient(api_key=None)
+        client.mock_mode = False
+        client.index = Mock()
+        return client
+
+    def test_grpc_upsert_sends_batches_concurrently(self, client):
+        client.use_grpc = True
+        future = Mock()
+        future.result.return_value = Mock(upserted_count=2)
+        client.index.upsert.return_value = future
+
+        vectors = [(f"v{i}", [0.1, 0.2], {"chunk_index": i}) for i in range(5)]
+        result = client.upsert_vectors(vectors, namespace="user_u1", batch_size=2)
+
+        assert client.index.upsert.call_count == 3
+        assert all(c.kwargs["async_req"] for c in client.index.upsert.call_args_list)
+        assert result == {"upserted_count": 6}
+
+    def test_rest_upsert_reads_dict_response(self, client):
+        client.use_grpc = False
+        client.index.upsert.return_value = {"upsertedCount": 2}
+
+        vectors = [(f"v{i}", [0.1, 0.2], {}) for i in range(2)]
+        assert client.upsert_vectors(vectors, namespace="ns")["upserted_count"] == 2
+
+
+class TestBM25Index:
+    """Test the NumPy BM25 index used by HybridSearchService."""
+
+    def test_scores_match_reference_formula(self):
+        import math
+        from core.vectors.hybrid_search import BM25Index, BM25_K1, BM25_B
+
+        corpus = [
+            ["pca", "reduces", "dimensions"],
+            ["eigenvalue", "of", "the", "covariance", "matrix", "pca"],
+            ["gradient", "descent", "descent"],
+        ]
+        index = BM25Index(corpus, ["a_0", "a_1", "b_0"])
+        query = ["pca", "descent", "unknown"]
+
+        avgdl = sum(len(d) for d in corpus) / len(corpus)
+        expected = []
+        for doc in corpus:
+            score = 0.0
+            for term in query:
+                df = sum(term in d for d in corpus)
+                if not df:
+                    continue
+                idf = math.log((len(corpus) - df + 0.5) / (df + 0.5) + 1)
+                tf = doc.count(term)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avgdl)
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            expected.append(score)
+
+        assert np.allclose(index.get_scores(query), expected, atol=1e-5)
+
+    def test_ascii_tokenize_fast_path_matches_regex(self):
+        """Test the ASCII translate path yields the same tokens as the regex path."""
+        import re
+        from core.vectors.hybrid_search import _tokenize
+
+        for text in [
+            "PCA-based x_1 = 3.14;\tGradient\nDESCENT (k=10)",
+            "".join(chr(c) for c in range(128)),
+            "  ...  ",
+        ]:
+            assert _tokenize(text) == (re.findall(r"\w+", text.lower()) or [""])
+        assert _tokenize("Déjà vu, naïve!") == ["déjà", "vu", "naïve"]
+
+    def test_hybrid_search_reuses_persisted_index(self, tmp_path):
+        """Test a second service loads the BM25 index from disk, and invalidation clears it."""
+        from types import SimpleNamespace
+        from core.vectors import hybrid_search
+
+        chunks = [
+            SimpleNamespace(id=f"c{i}", document_id="doc", chunk_index=i, content=text)
+            for i, text in enumerate(["pca reduces dimensions", "gradient descent steps"])
+        ]
+        chunk_repo = Mock(
+            get_user_chunks=Mock(return_value=chunks),
+            get_user_chunk_keys=Mock(
+                return_value=[(c.id, c.document_id, c.chunk_index) for c in chunks]
+            ),
+        )
+
+        def make_service():
+            return HybridSearchService(
+                vector_search=Mock(), chunk_repo=chunk_repo, doc_repo=Mock(),
+                bm25_cache_dir=str(tmp_path),
+            )
+
+        built, positions = make_service()._get_bm25_scores("user1", "pca")
+        assert chunk_repo.get_user_chunks.call_count == 1
+        with patch.object(hybrid_search, "_tokenize", wraps=hybrid_search._tokenize) as tokenize:
+            service = make_service()
+            loaded, loaded_positions = service._get_bm25_scores("user1", "pca")
+            assert tokenize.call_count == 0  # Corpus loaded from disk, query tokens memoized
+        # The warm load checks the signature from keys only, without chunk content
+        assert chunk_repo.get_user_chunks.call_count == 1
+        assert chunk_repo.get_user_chunk_keys.call_count == 2
+
+        assert np.array_equal(loaded, built) and loaded_positions == positions
+        assert built[positions["doc_0"]] > 0 and built[positions["doc_1"]] == 0
+        service.invalidate_user_index("user1")
+        assert not list(tmp_path.iterdir())
+
+    def test_hybrid_search_fuses_vector_and_bm25_scores(self):
+        """Test fused ranking, including results missing from the BM25 index."""
+        from types import SimpleNamespace
+
+        chunks = [
+            SimpleNamespace(id=f"c{i}", document_id="doc", chunk_index=i, content=text)
+            for i, text in enumerate(["pca pca pca", "unrelated words", "pca once here"])
+        ]
+
+        def result(chunk_index, score):
+            chunk = SimpleNamespace(document_id="doc", chunk_index=chunk_index)
+            return SimpleNamespace(chunk=chunk, score=score, rank=0)
+
+        vector_search = Mock()
+        vector_search.search.return_value = [
+            result(1, 0.9), result(0, 0.8), result(2, 0.7), result(9, 0.6),
+        ]
+        service = HybridSearchService(
+            vector_search=vector_search,
+            chunk_repo=Mock(get_user_chunks=Mock(return_value=chunks)),
+            doc_repo=Mock(),
+            weight_bm25=0.5,
+            weight_vector=0.5,
+        )
+        service.bm25_cache_dir = None
+
+        results = service.hybrid_search("pca", "user1", top_k=3)
+
+        assert [r.chunk.chunk_index for r in results] == [0, 2, 1]
+        assert [r.rank for r in results] == [1, 2, 3]
+        assert results[0].score == pytest.approx(0.5 * 0.8 / 0.9 + 0.5)
+
 
 class TestModuleExports:
     """Test module exports."""